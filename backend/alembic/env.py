@@ -0,0 +1,52 @@
+"""
+Environnement Alembic: chaîne de migrations du schéma PostgreSQL.
+
+L'URL de connexion est celle de l'application (settings.DATABASE_URL). Les révisions
+reprennent les scripts de database/migrations (idempotents), de sorte qu'une base
+créée par database/init.sql peut être mise à niveau avec `alembic upgrade head`.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.core.config import settings
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+if not config.get_main_option("sqlalchemy.url"):
+    # Échapper les % (interpolation configparser) d'un mot de passe encodé
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
+# Schéma géré en SQL, pas de métadonnées SQLAlchemy pour l'autogénération
+target_metadata = None
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,102 @@
+"""Schéma de base (users, clients, meetings, meeting_speakers)
+
+Revision ID: 0000
+Revises:
+Create Date: 2025-09-05 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+UPGRADE_SQL = r"""
+-- Extensions utiles
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS "pg_stat_statements";
+
+-- Création des tables
+-- Table users
+CREATE TABLE IF NOT EXISTS users (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    email VARCHAR(255) UNIQUE NOT NULL,
+    hashed_password TEXT,
+    full_name VARCHAR(255),
+    profile_picture_url TEXT,
+    oauth_provider VARCHAR(50),
+    oauth_id VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Index pour les utilisateurs
+CREATE INDEX IF NOT EXISTS idx_user_email ON users(email);
+CREATE INDEX IF NOT EXISTS idx_user_oauth ON users(oauth_provider, oauth_id);
+
+-- Table clients
+CREATE TABLE IF NOT EXISTS clients (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    name VARCHAR(255) NOT NULL,
+    summary_template TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Index pour les clients
+CREATE INDEX IF NOT EXISTS idx_client_user ON clients(user_id);
+
+-- Table meetings
+CREATE TABLE IF NOT EXISTS meetings (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    client_id UUID REFERENCES clients(id) ON DELETE SET NULL,
+    title VARCHAR(255) NOT NULL,
+    file_url TEXT NOT NULL,
+    transcript_text TEXT,
+    transcript_status VARCHAR(50) DEFAULT 'pending',
+    summary_text TEXT,
+    summary_status VARCHAR(50) DEFAULT NULL,
+    duration_seconds INTEGER,
+    speakers_count INTEGER,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Index pour les meetings
+CREATE INDEX IF NOT EXISTS idx_meeting_user ON meetings(user_id);
+CREATE INDEX IF NOT EXISTS idx_meeting_client ON meetings(client_id);
+CREATE INDEX IF NOT EXISTS idx_meeting_status ON meetings(transcript_status);
+
+-- Table meeting_speakers pour les noms personnalisés des locuteurs
+CREATE TABLE IF NOT EXISTS meeting_speakers (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    speaker_id VARCHAR(50) NOT NULL,
+    custom_name VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE(meeting_id, speaker_id)
+);
+
+-- Index pour les speakers
+CREATE INDEX IF NOT EXISTS idx_speaker_meeting ON meeting_speakers(meeting_id);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    # Tables du schéma de base, dans l'ordre inverse des clés étrangères. Les extensions
+    # sont conservées: elles peuvent servir à d'autres bases du serveur.
+    op.execute(
+        """
+        DROP TABLE IF EXISTS meeting_speakers;
+        DROP TABLE IF EXISTS meetings;
+        DROP TABLE IF EXISTS clients;
+        DROP TABLE IF EXISTS users;
+        """
+    )
@@ -0,0 +1,42 @@
+"""Transcription structurée: une ligne par utterance pour la pagination et le streaming
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-19 08:23:51
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = '0000'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/001_meeting_utterances.sql
+UPGRADE_SQL = r"""
+-- Transcription structurée: une ligne par utterance pour la pagination et le streaming
+CREATE TABLE IF NOT EXISTS meeting_utterances (
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    speaker VARCHAR(50) NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    start_ms INTEGER,
+    end_ms INTEGER,
+    PRIMARY KEY (meeting_id, idx)
+);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TABLE IF EXISTS meeting_utterances;
+        """
+    )
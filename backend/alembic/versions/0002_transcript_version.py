@@ -0,0 +1,34 @@
+"""Version de la transcription pour l'édition concurrente par utterances (PATCH /meetings/{id}/transcript)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 08:25:13
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/002_transcript_version.sql
+UPGRADE_SQL = r"""
+-- Version de la transcription pour l'édition concurrente par utterances (PATCH /meetings/{id}/transcript)
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_version INTEGER NOT NULL DEFAULT 0;
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE meetings DROP COLUMN IF EXISTS transcript_version;
+        """
+    )
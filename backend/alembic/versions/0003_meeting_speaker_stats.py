@@ -0,0 +1,45 @@
+"""Statistiques de parole par locuteur, calculées une fois à la fin de la transcription
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 08:26:06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/003_meeting_speaker_stats.sql
+UPGRADE_SQL = r"""
+-- Statistiques de parole par locuteur, calculées une fois à la fin de la transcription
+CREATE TABLE IF NOT EXISTS meeting_speaker_stats (
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    speaker VARCHAR(255) NOT NULL,
+    talk_time_ms BIGINT NOT NULL DEFAULT 0,
+    talk_share REAL NOT NULL DEFAULT 0,
+    turns INTEGER NOT NULL DEFAULT 0,
+    avg_turn_ms REAL NOT NULL DEFAULT 0,
+    interruptions INTEGER NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    words_per_minute REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (meeting_id, speaker)
+);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TABLE IF EXISTS meeting_speaker_stats;
+        """
+    )
@@ -0,0 +1,38 @@
+"""Bail (lease) sur les réunions en cours de traitement: un seul worker/script à la fois
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 08:31:51
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/004_meeting_leases.sql
+UPGRADE_SQL = r"""
+-- Bail (lease) sur les réunions en cours de traitement: un seul worker/script à la fois
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255);
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+CREATE INDEX IF NOT EXISTS idx_meeting_status_lease ON meetings(transcript_status, lease_expires_at);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP INDEX IF EXISTS idx_meeting_status_lease;
+        ALTER TABLE meetings DROP COLUMN IF EXISTS lease_expires_at;
+        ALTER TABLE meetings DROP COLUMN IF EXISTS lease_owner;
+        """
+    )
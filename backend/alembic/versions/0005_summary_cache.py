@@ -0,0 +1,41 @@
+"""Cache des comptes rendus: empreinte SHA-256 de (prompt résolu avec la transcription, modèle, température)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 08:36:02
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/005_summary_cache.sql
+UPGRADE_SQL = r"""
+-- Cache des comptes rendus: empreinte SHA-256 de (prompt résolu avec la transcription, modèle, température)
+CREATE TABLE IF NOT EXISTS summary_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    summary_text TEXT NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_hit_at TIMESTAMP WITH TIME ZONE
+);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TABLE IF EXISTS summary_cache;
+        """
+    )
@@ -0,0 +1,53 @@
+"""File d'attente durable des générations de comptes rendus
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 08:37:55
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/006_summary_jobs.sql
+UPGRADE_SQL = r"""
+-- File d'attente durable des générations de comptes rendus
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    client_id UUID,
+    template_type VARCHAR(50),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    lease_owner VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+-- Une seule génération active par réunion
+CREATE UNIQUE INDEX IF NOT EXISTS idx_summary_jobs_active_meeting ON summary_jobs(meeting_id) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_ready ON summary_jobs(status, run_after);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP TABLE IF EXISTS summary_jobs;
+        """
+    )
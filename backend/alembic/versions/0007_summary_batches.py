@@ -0,0 +1,50 @@
+"""Régénérations de comptes rendus en masse (ex: après la modification d'un template client)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 08:45:11
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/007_summary_batches.sql
+UPGRADE_SQL = r"""
+-- Régénérations de comptes rendus en masse (ex: après la modification d'un template client)
+CREATE TABLE IF NOT EXISTS summary_batches (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    filters JSONB NOT NULL DEFAULT '{}'::jsonb,
+    max_concurrency INTEGER NOT NULL DEFAULT 2,
+    rate_per_minute INTEGER,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    total INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS idx_summary_batches_user ON summary_batches(user_id, created_at DESC);
+
+ALTER TABLE summary_jobs ADD COLUMN IF NOT EXISTS batch_id UUID REFERENCES summary_batches(id) ON DELETE SET NULL;
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_batch ON summary_jobs(batch_id, status) WHERE batch_id IS NOT NULL;
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE summary_jobs DROP COLUMN IF EXISTS batch_id;
+        DROP TABLE IF EXISTS summary_batches;
+        """
+    )
@@ -0,0 +1,38 @@
+"""Libellés des locuteurs vus par le modèle lors de la génération du compte rendu
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 08:54:40
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/008_summary_speaker_labels.sql
+UPGRADE_SQL = r"""
+-- Libellés des locuteurs vus par le modèle lors de la génération du compte rendu
+-- ({identifiant: libellé}) et révision du texte stocké: un renommage est reporté
+-- dans summary_text sans régénération
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS summary_speaker_labels JSONB;
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS summary_revision INTEGER NOT NULL DEFAULT 0;
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE meetings DROP COLUMN IF EXISTS summary_revision;
+        ALTER TABLE meetings DROP COLUMN IF EXISTS summary_speaker_labels;
+        """
+    )
@@ -0,0 +1,34 @@
+"""Liste paginée des cartes de réunions: pagination par clé (created_at, id) par utilisateur
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 08:58:01
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/009_meeting_cards_index.sql
+UPGRADE_SQL = r"""
+-- Liste paginée des cartes de réunions: pagination par clé (created_at, id) par utilisateur
+CREATE INDEX IF NOT EXISTS idx_meeting_user_created ON meetings(user_id, created_at DESC, id DESC);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        DROP INDEX IF EXISTS idx_meeting_user_created;
+        """
+    )
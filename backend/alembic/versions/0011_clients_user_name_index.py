@@ -0,0 +1,36 @@
+"""Liste des clients d'un utilisateur triée par nom (GET /clients, servie par l'index)
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 09:06:52
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/011_clients_user_name_index.sql
+UPGRADE_SQL = r"""
+-- Liste des clients d'un utilisateur triée par nom (GET /clients, servie par l'index)
+CREATE INDEX IF NOT EXISTS idx_client_user_name ON clients(user_id, name);
+DROP INDEX IF EXISTS idx_client_user;
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_client_user ON clients(user_id);
+        DROP INDEX IF EXISTS idx_client_user_name;
+        """
+    )
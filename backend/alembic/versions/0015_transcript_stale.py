@@ -0,0 +1,37 @@
+"""Texte de transcription régénéré à la lecture après une édition par utterances
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 09:42:03
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0015'
+down_revision = '0014'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/015_transcript_stale.sql
+UPGRADE_SQL = r"""
+-- Texte de transcription régénéré à la lecture après une édition par utterances
+-- Une édition (PATCH /meetings/{id}/transcript) ne modifie que les utterances éditées et
+-- marque le texte stocké dans meeting_content comme périmé; il est reconstruit depuis les
+-- utterances à la lecture et réécrit à la prochaine lecture de la réunion.
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_stale BOOLEAN NOT NULL DEFAULT FALSE;
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE meetings DROP COLUMN IF EXISTS transcript_stale;
+        """
+    )
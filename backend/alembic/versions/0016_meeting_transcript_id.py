@@ -0,0 +1,37 @@
+"""Identifiant de la transcription chez le fournisseur (AssemblyAI)
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19 09:52:20
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0016'
+down_revision = '0015'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/016_meeting_transcript_id.sql
+UPGRADE_SQL = r"""
+-- Identifiant de la transcription chez le fournisseur (AssemblyAI)
+-- Enregistré au lancement de la transcription; les vérifications de fin de transcription
+-- (file d'attente, routes, vérificateur planifié) interrogent le fournisseur avec cet ID.
+-- Les bases créées avant son ajout au schéma l'ont peut-être déjà: ajout idempotent.
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_id VARCHAR(255);
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE meetings DROP COLUMN IF EXISTS transcript_id;
+        """
+    )
@@ -0,0 +1,36 @@
+"""Rapport de compaction de la transcription enregistré avec chaque génération de compte rendu
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19 09:54:17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0017'
+down_revision = '0016'
+branch_labels = None
+depends_on = None
+
+# Même contenu que database/migrations/017_summary_job_compaction.sql
+UPGRADE_SQL = r"""
+-- Rapport de compaction de la transcription enregistré avec chaque génération de compte rendu
+-- {utterances_before, utterances_after, tokens_before, tokens_after, reduction_pct}, écrit
+-- avec le compte rendu par la tâche qui le génère; agrégé par GET /admin/summary-queue.
+ALTER TABLE summary_jobs ADD COLUMN IF NOT EXISTS compaction JSONB;
+"""
+
+
+def upgrade() -> None:
+    op.execute(UPGRADE_SQL)
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE summary_jobs DROP COLUMN IF EXISTS compaction;
+        """
+    )
@@ -90,3 +90,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         
     except JWTError:
         raise credentials_exception
+
+
+async def get_current_admin(current_user: dict = Depends(get_current_user)):
+    """Utilisateur courant, s'il fait partie des administrateurs (ADMIN_EMAILS)"""
+    admins = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+    if (current_user.get("email") or "").lower() not in admins:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"message": "Accès réservé aux administrateurs", "type": "FORBIDDEN"},
+        )
+    return current_user
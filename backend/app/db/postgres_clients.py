@@ -0,0 +1,163 @@
+"""
+Clients (table `clients` PostgreSQL).
+
+La liste des clients d'un utilisateur est gardée en mémoire CLIENT_LIST_CACHE_TTL
+secondes; elle est invalidée localement à chaque création, modification ou suppression
+(les autres instances la rechargent à l'expiration). La modification ou la suppression
+d'un client invalide aussi son template de compte rendu pré-découpé.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from .postgres_database import get_db_connection
+from .postgres_meetings import _run
+from .query_registry import canonical_update
+
+logger = logging.getLogger(__name__)
+
+# Colonnes modifiables par update_client
+CLIENT_UPDATABLE_COLUMNS = frozenset({"name", "summary_template"})
+
+# user_id -> (expiration, clients triés par nom)
+_client_lists: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+_client_lists_lock = threading.Lock()
+
+
+def _parse_uuid(value: Any) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _client_from_row(row) -> Dict[str, Any]:
+    client = dict(row)
+    client["id"] = str(client["id"])
+    client["user_id"] = str(client["user_id"])
+    if client.get("created_at"):
+        client["created_at"] = client["created_at"].isoformat()
+    return client
+
+
+def invalidate_client_list(user_id: str) -> None:
+    with _client_lists_lock:
+        _client_lists.pop(str(user_id), None)
+
+
+def _client_changed(client_id: str, user_id: str) -> None:
+    from ..services.summary_templates import invalidate_client_template
+
+    invalidate_client_list(user_id)
+    invalidate_client_template(client_id)
+
+
+async def create_client_async(client_data: Dict[str, Any], user_id: str) -> Optional[Dict[str, Any]]:
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO clients (user_id, name, summary_template)
+            VALUES ($1, $2, $3)
+            RETURNING *
+            """,
+            uuid.UUID(user_id), client_data["name"], client_data.get("summary_template"),
+        )
+    invalidate_client_list(user_id)
+    logger.info(f"Client {row['id']} créé pour l'utilisateur {user_id}")
+    return _client_from_row(row)
+
+
+def create_client(client_data: Dict[str, Any], user_id: str) -> Optional[Dict[str, Any]]:
+    return _run(create_client_async(client_data, user_id))
+
+
+async def get_client_async(client_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Client de l'utilisateur (None si introuvable ou identifiant invalide)."""
+    client_uuid = _parse_uuid(client_id)
+    if client_uuid is None:
+        return None
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            "SELECT * FROM clients WHERE id = $1 AND user_id = $2",
+            client_uuid, uuid.UUID(user_id),
+        )
+    return _client_from_row(row) if row else None
+
+
+def get_client(client_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    return _run(get_client_async(client_id, user_id))
+
+
+async def get_clients_async(user_id: str) -> List[Dict[str, Any]]:
+    """Clients de l'utilisateur triés par nom (liste en cache CLIENT_LIST_CACHE_TTL secondes)."""
+    key = str(user_id)
+    now = time.monotonic()
+    with _client_lists_lock:
+        entry = _client_lists.get(key)
+    if entry and entry[0] > now:
+        return [dict(client) for client in entry[1]]
+
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            "SELECT * FROM clients WHERE user_id = $1 ORDER BY name ASC",
+            uuid.UUID(user_id),
+        )
+    clients = [_client_from_row(row) for row in rows]
+    if settings.CLIENT_LIST_CACHE_TTL > 0:
+        with _client_lists_lock:
+            _client_lists[key] = (now + settings.CLIENT_LIST_CACHE_TTL, clients)
+    return [dict(client) for client in clients]
+
+
+def get_clients(user_id: str) -> List[Dict[str, Any]]:
+    return _run(get_clients_async(user_id))
+
+
+async def update_client_async(client_id: str, user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Met à jour un client (nom non vide, template); None si le client est introuvable."""
+    update_data = {k: v for k, v in update_data.items() if k != "name" or v}
+    query, values, rejected = canonical_update(
+        "clients", CLIENT_UPDATABLE_COLUMNS, update_data, ["id", "user_id"], returning="*"
+    )
+    if rejected:
+        logger.warning(f"Colonnes ignorées lors de la mise à jour du client {client_id}: {', '.join(rejected)}")
+    if query is None:
+        # Rien à mettre à jour
+        return await get_client_async(client_id, user_id)
+    client_uuid = _parse_uuid(client_id)
+    if client_uuid is None:
+        return None
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(query, *values, client_uuid, uuid.UUID(user_id))
+    if not row:
+        return None
+    _client_changed(client_id, user_id)
+    return _client_from_row(row)
+
+
+def update_client(client_id: str, user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return _run(update_client_async(client_id, user_id, update_data))
+
+
+async def delete_client_async(client_id: str, user_id: str) -> bool:
+    """Supprime un client (les réunions associées sont conservées, sans client)."""
+    client_uuid = _parse_uuid(client_id)
+    if client_uuid is None:
+        return False
+    async with get_db_connection() as conn:
+        status = await conn.execute(
+            "DELETE FROM clients WHERE id = $1 AND user_id = $2",
+            client_uuid, uuid.UUID(user_id),
+        )
+    if status != "DELETE 1":
+        return False
+    _client_changed(client_id, user_id)
+    return True
+
+
+def delete_client(client_id: str, user_id: str) -> bool:
+    return _run(delete_client_async(client_id, user_id))
@@ -8,50 +8,84 @@ from typing import Optional, Dict, Any, List
 import redis.asyncio as redis
 from contextlib import asynccontextmanager
 import logging
+import weakref
 from ..core.config import settings
+from .query_registry import InstrumentedConnection, canonical_update
+from .sync_bridge import is_bridge_loop, run_sync
 
 logger = logging.getLogger(__name__)
 
-# Pool de connexions PostgreSQL
-_pool: Optional[asyncpg.Pool] = None
-_redis_client: Optional[redis.Redis] = None
+# Pools PostgreSQL et clients Redis par event loop: leurs connexions sont liées à la loop
+# qui les a créés (loop principale d'uvicorn, loop de fond du pont synchrone)
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncpg.Pool]" = weakref.WeakKeyDictionary()
+_redis_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis]" = weakref.WeakKeyDictionary()
+# Dernier échec de connexion à Redis par event loop (horloge monotone): pas de nouvel
+# essai avant REDIS_RETRY_SECONDS, le cache reste désactivé entre-temps
+_redis_unavailable: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, float]" = weakref.WeakKeyDictionary()
 
 async def get_postgres_pool() -> asyncpg.Pool:
-    """Obtenir le pool de connexions PostgreSQL"""
-    global _pool
-    if _pool is None:
+    """Obtenir le pool de connexions PostgreSQL de l'event loop courante"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        max_size = settings.DB_SYNC_POOL_SIZE if is_bridge_loop(loop) else settings.DB_POOL_SIZE
         try:
-            _pool = await asyncpg.create_pool(
+            pool = await asyncpg.create_pool(
                 settings.DATABASE_URL,
-                min_size=5,
-                max_size=settings.DB_POOL_SIZE,
-                command_timeout=settings.DB_POOL_TIMEOUT
+                min_size=min(5, max_size),
+                max_size=max_size,
+                command_timeout=settings.DB_POOL_TIMEOUT,
+                statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+                connection_class=InstrumentedConnection,
             )
             logger.info("✅ Pool PostgreSQL créé avec succès")
         except Exception as e:
             logger.error(f"❌ Erreur lors de la création du pool PostgreSQL: {e}")
             raise
-    return _pool
+        # Création concurrente sur la même loop: garder le premier pool
+        if loop in _pools:
+            await pool.close()
+        else:
+            _pools[loop] = pool
+    return _pools[loop]
 
-async def get_redis_client() -> redis.Redis:
-    """Obtenir le client Redis"""
-    global _redis_client
-    if _redis_client is None:
-        try:
-            _redis_client = redis.from_url(
-                settings.REDIS_URL,
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=20
-            )
-            # Test de connexion
-            await _redis_client.ping()
-            logger.info("✅ Client Redis connecté avec succès")
-        except Exception as e:
-            logger.error(f"❌ Erreur lors de la connexion à Redis: {e}")
-            # Fallback: pas de cache si Redis n'est pas disponible
-            _redis_client = None
-    return _redis_client
+async def get_redis_client() -> Optional[redis.Redis]:
+    """
+    Obtenir le client Redis de l'event loop courante (None si Redis est indisponible).
+    Après un échec de connexion, un nouvel essai a lieu au plus tôt REDIS_RETRY_SECONDS
+    plus tard: une coupure au démarrage ne désactive pas le cache jusqu'au redémarrage.
+    """
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is not None:
+        return client
+    failed_at = _redis_unavailable.get(loop)
+    if failed_at is not None and loop.time() - failed_at < settings.REDIS_RETRY_SECONDS:
+        return None
+    try:
+        client = redis.from_url(
+            settings.REDIS_URL,
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=20
+        )
+        # Test de connexion
+        await client.ping()
+        logger.info("✅ Client Redis connecté avec succès")
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la connexion à Redis (nouvel essai dans {settings.REDIS_RETRY_SECONDS}s): {e}")
+        # Fallback: pas de cache tant que Redis n'est pas disponible
+        _redis_unavailable[loop] = loop.time()
+        if client is not None:
+            await client.close()
+        return None
+    _redis_unavailable.pop(loop, None)
+    # Connexion concurrente sur la même loop: garder le premier client
+    if loop in _redis_clients:
+        await client.close()
+    else:
+        _redis_clients[loop] = client
+    return _redis_clients[loop]
 
 @asynccontextmanager
 async def get_db_connection():
@@ -224,29 +258,23 @@ async def get_user_by_oauth(oauth_provider: str, oauth_id: str) -> Optional[Dict
         logger.error(f"Erreur lors de la récupération de l'utilisateur OAuth: {e}")
         return None
 
+# Colonnes modifiables par update_user
+USER_UPDATABLE_COLUMNS = frozenset({
+    "email", "hashed_password", "full_name", "profile_picture_url", "oauth_provider", "oauth_id",
+})
+
 async def update_user(user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Mettre à jour les informations d'un utilisateur"""
     try:
         async with get_db_connection() as conn:
-            # Construire la requête de mise à jour dynamiquement
-            set_clauses = []
-            values = []
-            param_count = 1
-            
-            for key, value in update_data.items():
-                set_clauses.append(f"{key} = ${param_count}")
-                values.append(value)
-                param_count += 1
-            
-            query = f"""
-                UPDATE users 
-                SET {', '.join(set_clauses)}
-                WHERE id = ${param_count}
-                RETURNING *
-            """
-            values.append(uuid.UUID(user_id))
-            
-            result = await conn.fetchrow(query, *values)
+            query, values, rejected = canonical_update(
+                "users", USER_UPDATABLE_COLUMNS, update_data, ["id"], returning="*"
+            )
+            if rejected:
+                logger.warning(f"Colonnes ignorées lors de la mise à jour de l'utilisateur: {', '.join(rejected)}")
+            if query is None:
+                return None
+            result = await conn.fetchrow(query, *values, uuid.UUID(user_id))
             
             if result:
                 user_dict = dict(result)
@@ -270,17 +298,17 @@ async def update_user(user_id: str, update_data: Dict[str, Any]) -> Optional[Dic
         return None
 
 async def close_connections():
-    """Fermer toutes les connexions"""
-    global _pool, _redis_client
+    """Fermer les connexions de l'event loop courante"""
+    loop = asyncio.get_running_loop()
     
-    if _pool:
-        await _pool.close()
-        _pool = None
+    pool = _pools.pop(loop, None)
+    if pool:
+        await pool.close()
         logger.info("✅ Pool PostgreSQL fermé")
     
-    if _redis_client:
-        await _redis_client.close()
-        _redis_client = None
+    redis_client = _redis_clients.pop(loop, None)
+    if redis_client:
+        await redis_client.close()
         logger.info("✅ Client Redis fermé")
 
 # Fonctions de compatibilité avec l'ancien système SQLite
@@ -293,21 +321,11 @@ user_cache = {}
 
 def get_user_by_email_cached(email, max_age_seconds=60):
     """Version compatible avec l'ancien système"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(get_user_by_email(email))
-    finally:
-        loop.close()
+    return run_sync(get_user_by_email(email))
 
 def get_user_by_id_cached(user_id, max_age_seconds=300):
     """Version compatible avec l'ancien système"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(get_user_by_id(user_id))
-    finally:
-        loop.close()
+    return run_sync(get_user_by_id(user_id))
 
 def clear_user_cache():
     """Vider le cache utilisateur"""
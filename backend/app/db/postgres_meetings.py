@@ -1,20 +1,77 @@
-import asyncio
+import base64
+import json
+import logging
+import os
+import socket
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 
+from ..core.config import settings
 from .postgres_database import get_db_connection
+from .query_registry import canonical_update, named_query
+from .sync_bridge import run_sync
+from ..services.summary_speakers import current_speaker_labels, rewrite_summary_speakers, speaker_labels_for_transcript
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Colonnes de métadonnées d'une réunion (table meetings)
+MEETING_COLUMNS = (
+    "id, user_id, client_id, title, file_url, transcript_id, transcript_status, summary_status, "
+    "duration_seconds, speakers_count, transcript_version, transcript_stale, summary_speaker_labels, "
+    "summary_revision, lease_owner, lease_expires_at, created_at"
+)
+# Textes volumineux (table meeting_content), lus seulement avec include_content=True
+CONTENT_COLUMNS = ("transcript_text", "summary_text")
+# Empreinte (md5, calculée par la base) de chaque texte
+_CONTENT_HASHES = {"transcript_text": "transcript_hash", "summary_text": "summary_hash"}
+# Colonnes renvoyées pour un nom de locuteur
+SPEAKER_COLUMNS = "id, meeting_id, speaker_id, custom_name, created_at"
+# Les tables liées à une réunion portent sa date de création (meeting_created_at), clé de
+# partition quand les réunions sont partitionnées par mois (voir partition_meetings.py). Les
+# upserts visent les contraintes par leur nom, qui ne change pas avec le partitionnement
+# alors que leurs colonnes incluent alors la clé de partition.
+_CONTENT_KEY = "meeting_content_pkey"
+_SPEAKER_KEY = "meeting_speakers_meeting_id_speaker_id_key"
+
+
+# transcript_text reconstruit depuis les utterances et les noms personnalisés d'une réunion
+# (alias m), au format de format_transcript_text
+_TRANSCRIPT_RENDER_EXPR = r"""COALESCE((
+    SELECT string_agg(
+        COALESCE(
+            (SELECT ms.custom_name FROM meeting_speakers ms
+             WHERE ms.meeting_id = u.meeting_id AND ms.speaker_id IN (u.speaker, 'Speaker ' || u.speaker)
+             ORDER BY (ms.speaker_id = u.speaker) DESC
+             LIMIT 1),
+            CASE WHEN u.speaker ~ '^([A-Z]{1,2}|Unknown)$' THEN 'Speaker ' || u.speaker ELSE u.speaker END
+        ) || ': ' || u.text,
+        E'\n' ORDER BY u.idx)
+    FROM meeting_utterances u WHERE u.meeting_id = m.id
+), '')"""
+
+
+def meeting_select(include_content: bool = False) -> str:
+    """
+    SELECT d'une réunion (alias m), avec les textes de meeting_content (alias mc) si include_content.
+    Un texte de transcription périmé par une édition (transcript_stale) est reconstruit à la lecture.
+    """
+    columns = ", ".join(f"m.{column.strip()}" for column in MEETING_COLUMNS.split(","))
+    if not include_content:
+        return f"SELECT {columns} FROM meetings m"
+    content = ", ".join(
+        f"CASE WHEN m.transcript_stale THEN {_TRANSCRIPT_RENDER_EXPR} ELSE mc.transcript_text END AS transcript_text"
+        if column == "transcript_text" else f"mc.{column}"
+        for column in CONTENT_COLUMNS
+    )
+    return f"SELECT {columns}, {content} FROM meetings m LEFT JOIN meeting_content mc ON mc.meeting_id = m.id"
 
 
 def _run(coro):
-    """Run an async coroutine in a short-lived event loop, returning its result.
-    Keeps a sync API for existing call sites.
+    """Run an async coroutine on the shared background loop (see sync_bridge), returning its result.
+    Keeps a sync API for existing call sites running in threads.
     """
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    return run_sync(coro)
 
 
 def normalize_transcript_format(text: Optional[str]) -> Optional[str]:
@@ -39,7 +96,7 @@ async def create_meeting_async(meeting_data: Dict[str, Any], user_id: str) -> Op
             uuid.UUID(meeting_id), uuid.UUID(user_id), meeting_data.get("title"),
             meeting_data.get("file_url"), meeting_data.get("transcript_status", "pending"), created_at
         )
-        row = await conn.fetchrow("SELECT * FROM meetings WHERE id = $1", uuid.UUID(meeting_id))
+        row = await conn.fetchrow(f"{meeting_select()} WHERE m.id = $1", uuid.UUID(meeting_id))
         if row:
             result = dict(row)
             result["id"] = str(result["id"]) if result.get("id") else None
@@ -54,14 +111,18 @@ def create_meeting(meeting_data: Dict[str, Any], user_id: str) -> Optional[Dict[
     return _run(create_meeting_async(meeting_data, user_id))
 
 
-async def get_meeting_async(meeting_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+async def get_meeting_async(meeting_id: str, user_id: str, include_content: bool = True) -> Optional[Dict[str, Any]]:
+    """Réunion de l'utilisateur; sans transcript_text ni summary_text si include_content est False."""
     async with get_db_connection() as conn:
         row = await conn.fetchrow(
-            "SELECT * FROM meetings WHERE id = $1 AND user_id = $2",
+            f"{meeting_select(include_content)} WHERE m.id = $1 AND m.user_id = $2",
             uuid.UUID(meeting_id), uuid.UUID(user_id)
         )
         if not row:
             return None
+        if include_content and row["transcript_stale"]:
+            # Texte périmé par une édition: enregistrer la version reconstruite (recherche)
+            await conn.execute(_MATERIALIZE_TRANSCRIPT_SQL, uuid.UUID(meeting_id), row["transcript_version"])
         d = dict(row)
         d["id"] = str(d["id"]) if d.get("id") else None
         d["user_id"] = str(d["user_id"]) if d.get("user_id") else None
@@ -74,24 +135,29 @@ async def get_meeting_async(meeting_id: str, user_id: str) -> Optional[Dict[str,
         return d
 
 
-def get_meeting(meeting_id: str, user_id: str) -> Optional[Dict[str, Any]]:
-    return _run(get_meeting_async(meeting_id, user_id))
+def get_meeting(meeting_id: str, user_id: str, include_content: bool = True) -> Optional[Dict[str, Any]]:
+    return _run(get_meeting_async(meeting_id, user_id, include_content))
 
 
-async def get_meetings_by_user_async(user_id: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
+async def get_meetings_by_user_async(
+    user_id: str,
+    status: Optional[str] = None,
+    include_content: bool = False,
+) -> List[Dict[str, Any]]:
+    """Réunions de l'utilisateur, des plus récentes aux plus anciennes (textes si include_content)."""
     async with get_db_connection() as conn:
         if status:
             rows = await conn.fetch(
-                """
-                SELECT * FROM meetings
-                WHERE user_id = $1 AND transcript_status = $2
-                ORDER BY created_at DESC
+                f"""
+                {meeting_select(include_content)}
+                WHERE m.user_id = $1 AND m.transcript_status = $2
+                ORDER BY m.created_at DESC
                 """,
                 uuid.UUID(user_id), status,
             )
         else:
             rows = await conn.fetch(
-                "SELECT * FROM meetings WHERE user_id = $1 ORDER BY created_at DESC",
+                f"{meeting_select(include_content)} WHERE m.user_id = $1 ORDER BY m.created_at DESC",
                 uuid.UUID(user_id),
             )
         result: List[Dict[str, Any]] = []
@@ -108,8 +174,253 @@ async def get_meetings_by_user_async(user_id: str, status: Optional[str] = None)
         return result
 
 
-def get_meetings_by_user(user_id: str, status: Optional[str] = None) -> List[Dict[str, Any]]:
-    return _run(get_meetings_by_user_async(user_id, status))
+def get_meetings_by_user(user_id: str, status: Optional[str] = None, include_content: bool = False) -> List[Dict[str, Any]]:
+    return _run(get_meetings_by_user_async(user_id, status, include_content))
+
+
+def encode_meeting_cursor(created_at: datetime, meeting_id: uuid.UUID) -> str:
+    """Curseur opaque de pagination: position (created_at, id) de la dernière carte renvoyée."""
+    raw = f"{created_at.isoformat()}|{meeting_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_meeting_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Raises ValueError si le curseur est invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, meeting_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(meeting_id)
+    except Exception as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+
+
+# Requête de list_meeting_cards_async, reprise par check_query_plans.py
+MEETING_CARDS_SQL = named_query("meetings.cards", """
+SELECT m.id, m.title, m.transcript_status, m.summary_status, m.duration_seconds, m.speakers_count,
+       m.created_at, m.client_id, left(mc.transcript_text, $7) AS transcript_preview
+FROM meetings m
+LEFT JOIN meeting_content mc ON mc.meeting_id = m.id
+WHERE m.user_id = $1
+  AND ($2::text IS NULL OR m.transcript_status = $2)
+  AND ($3::uuid IS NULL OR m.client_id = $3)
+  AND ($4::timestamptz IS NULL OR (m.created_at, m.id) < ($4, $5::uuid))
+ORDER BY m.created_at DESC, m.id DESC
+LIMIT $6
+""")
+
+
+async def list_meeting_cards_async(
+    user_id: str,
+    status: Optional[str] = None,
+    client_id: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Page de cartes de réunions (tableau de bord), de la plus récente à la plus ancienne.
+
+    Seuls les champs d'affichage sont lus (sans transcription ni compte rendu complets,
+    avec un aperçu de MEETING_PREVIEW_CHARS caractères). La pagination se fait par clé
+    (created_at, id) pour un coût constant quelle que soit la page.
+
+    Returns:
+        {"items": [...], "next_cursor": curseur de la page suivante ou None}
+    Raises:
+        ValueError: curseur invalide
+    """
+    after_created_at, after_id = decode_meeting_cursor(cursor) if cursor else (None, None)
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            MEETING_CARDS_SQL,
+            uuid.UUID(user_id), status, uuid.UUID(client_id) if client_id else None,
+            after_created_at, after_id, limit + 1, settings.MEETING_PREVIEW_CHARS,
+        )
+    next_cursor = encode_meeting_cursor(rows[limit - 1]["created_at"], rows[limit - 1]["id"]) if len(rows) > limit else None
+    items = []
+    for r in rows[:limit]:
+        d = dict(r)
+        d["id"] = str(d["id"])
+        d["client_id"] = str(d["client_id"]) if d.get("client_id") else None
+        if d.get("created_at"):
+            d["created_at"] = d["created_at"].isoformat()
+        if d.get("transcript_preview"):
+            d["transcript_preview"] = normalize_transcript_format(d["transcript_preview"])
+        d["transcription_status"] = d.get("transcript_status", "pending")
+        items.append(d)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def encode_search_cursor(rank: float, meeting_id: uuid.UUID) -> str:
+    """Curseur opaque de pagination de la recherche: position (rang, id) du dernier résultat."""
+    raw = f"{rank!r}|{meeting_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, uuid.UUID]:
+    """Raises ValueError si le curseur est invalide."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        rank, meeting_id = raw.split("|", 1)
+        return float(rank), uuid.UUID(meeting_id)
+    except Exception as e:
+        raise ValueError(f"Curseur invalide: {cursor}") from e
+
+
+# Options des extraits: correspondances entre <mark></mark>, deux fragments au plus
+_SEARCH_HEADLINE_OPTIONS = (
+    'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, '
+    'MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+# Requête de search_meetings_async, reprise par check_query_plans.py. Les réunions trouvées
+# viennent de deux index: (user_id, search_vector) de meeting_content pour le compte rendu
+# et la transcription, (user_id, to_tsvector(title)) de meetings pour le titre. Les extraits
+# (ts_headline, coûteux) ne sont calculés que pour les lignes de la page.
+MEETING_SEARCH_SQL = named_query("meetings.search", """
+WITH q AS (
+    SELECT websearch_to_tsquery('french', $2) AS query
+), hits AS (
+    SELECT m.id,
+           ts_rank(
+               setweight(to_tsvector('french', coalesce(m.title, '')), 'A')
+                 || coalesce(mc.search_vector, ''::tsvector),
+               q.query, 1
+           ) AS rank
+    FROM meetings m
+    LEFT JOIN meeting_content mc ON mc.meeting_id = m.id
+    CROSS JOIN q
+    WHERE m.user_id = $1
+      AND m.id IN (
+          SELECT c.meeting_id FROM meeting_content c, q
+          WHERE c.user_id = $1 AND c.search_vector @@ q.query
+          UNION
+          SELECT t.id FROM meetings t, q
+          WHERE t.user_id = $1 AND to_tsvector('french', t.title) @@ q.query
+      )
+      AND ($3::uuid IS NULL OR m.client_id = $3)
+), page AS (
+    SELECT id, rank FROM hits
+    WHERE $4::real IS NULL OR (rank, id) < ($4::real, $5::uuid)
+    ORDER BY rank DESC, id DESC
+    LIMIT $6
+)
+SELECT m.id, m.title, m.client_id, m.transcript_status, m.summary_status,
+       m.duration_seconds, m.created_at, page.rank,
+       ts_headline('french', m.title, q.query, $8) AS title_headline,
+       ts_headline('french', coalesce(mc.summary_text, ''), q.query, $8) AS summary_headline,
+       ts_headline('french', left(coalesce(mc.transcript_text, ''), $7), q.query, $8) AS transcript_headline
+FROM page
+JOIN meetings m ON m.id = page.id
+LEFT JOIN meeting_content mc ON mc.meeting_id = m.id
+CROSS JOIN q
+ORDER BY page.rank DESC, page.id DESC
+""")
+
+
+async def search_meetings_async(
+    user_id: str,
+    query: str,
+    client_id: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Recherche plein texte dans les réunions de l'utilisateur (titre, compte rendu, transcription).
+
+    La requête suit la syntaxe websearch de PostgreSQL ("expression exacte", OR, -exclu).
+    Les résultats sont classés par pertinence (titre > compte rendu > transcription) et
+    paginés par clé (rang, id). Chaque résultat porte un extrait (`headline`) où les
+    termes trouvés sont entourés de <mark></mark>, pris dans le titre, le compte rendu
+    ou les MEETING_SEARCH_HEADLINE_CHARS premiers caractères de la transcription.
+
+    Returns:
+        {"items": [...], "next_cursor": curseur de la page suivante ou None}
+    Raises:
+        ValueError: curseur invalide
+    """
+    after_rank, after_id = decode_search_cursor(cursor) if cursor else (None, None)
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            MEETING_SEARCH_SQL,
+            uuid.UUID(user_id), query, uuid.UUID(client_id) if client_id else None,
+            after_rank, after_id, limit + 1,
+            settings.MEETING_SEARCH_HEADLINE_CHARS, _SEARCH_HEADLINE_OPTIONS,
+        )
+    next_cursor = encode_search_cursor(rows[limit - 1]["rank"], rows[limit - 1]["id"]) if len(rows) > limit else None
+    items = []
+    for r in rows[:limit]:
+        d = dict(r)
+        d["id"] = str(d["id"])
+        d["client_id"] = str(d["client_id"]) if d.get("client_id") else None
+        if d.get("created_at"):
+            d["created_at"] = d["created_at"].isoformat()
+        # Extrait le plus parlant: le premier champ contenant une correspondance
+        headlines = [
+            ("title", d.pop("title_headline")),
+            ("summary", d.pop("summary_headline")),
+            ("transcript", normalize_transcript_format(d.pop("transcript_headline"))),
+        ]
+        source, headline = next(
+            ((field, text) for field, text in headlines if text and "<mark>" in text),
+            ("transcript", headlines[2][1]),
+        )
+        d["headline"] = headline or ""
+        d["headline_source"] = source
+        d["transcription_status"] = d.get("transcript_status", "pending")
+        items.append(d)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# Colonnes modifiables par update_meeting (les baux, la version de la transcription et les
+# libellés du compte rendu ont leurs propres fonctions); les textes vont dans meeting_content
+MEETING_UPDATABLE_COLUMNS = frozenset({
+    "title", "client_id", "file_url", "transcript_id", "transcript_status",
+    "summary_status", "duration_seconds", "speakers_count",
+})
+
+
+def _content_upsert_query(columns: List[str]):
+    """Upsert des textes `columns` (triés) de meeting_content, sans réécriture si rien ne change."""
+    placeholders = ", ".join(f"${i}" for i in range(3, len(columns) + 3))
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns)
+    # Les empreintes sont des colonnes générées: comparer md5(EXCLUDED.x) à l'empreinte
+    # stockée évite de relire et de recomparer le texte détoasté
+    stored = ", ".join(f"meeting_content.{_CONTENT_HASHES[column]}" for column in columns)
+    incoming = ", ".join(f"md5(EXCLUDED.{column})" for column in columns)
+    sql = f"""
+        INSERT INTO meeting_content (meeting_id, meeting_created_at, user_id, {", ".join(columns)})
+        SELECT m.id, m.created_at, m.user_id, {placeholders} FROM meetings m WHERE m.id = $1 AND m.user_id = $2
+        ON CONFLICT ON CONSTRAINT {_CONTENT_KEY} DO UPDATE SET {assignments}, updated_at = NOW()
+        WHERE ROW({stored}) IS DISTINCT FROM ROW({incoming})
+    """
+    return named_query(f"meeting_content.upsert({','.join(columns)})", sql)
+
+
+async def store_meeting_content_async(meeting_id: str, user_id: str, content: Dict[str, Optional[str]], conn=None) -> bool:
+    """
+    Enregistre transcript_text et/ou summary_text d'une réunion dans meeting_content.
+
+    Un texte identique à celui stocké (même empreinte md5) n'est pas réécrit, ce qui
+    évite de recompresser et de réindexer un gros texte inchangé.
+
+    Returns:
+        False si la réunion n'appartient pas à l'utilisateur ou si rien n'a changé
+    """
+    columns = sorted(column for column in content if column in CONTENT_COLUMNS)
+    if not columns:
+        return False
+    query = _content_upsert_query(columns)
+    values = [content[column] for column in columns]
+    if conn is not None:
+        result = await conn.execute(query, uuid.UUID(meeting_id), uuid.UUID(user_id), *values)
+    else:
+        async with get_db_connection() as c:
+            result = await c.execute(query, uuid.UUID(meeting_id), uuid.UUID(user_id), *values)
+    return not result.endswith(" 0")
+
+
+def store_meeting_content(meeting_id: str, user_id: str, content: Dict[str, Optional[str]]) -> bool:
+    return _run(store_meeting_content_async(meeting_id, user_id, content))
 
 
 async def update_meeting_async(meeting_id: str, user_id: str, update_data: Dict[str, Any]) -> bool:
@@ -119,20 +430,24 @@ async def update_meeting_async(meeting_id: str, user_id: str, update_data: Dict[
     if update_data.get("transcript_text"):
         update_data["transcript_text"] = normalize_transcript_format(update_data["transcript_text"])  
 
+    content = {column: update_data[column] for column in CONTENT_COLUMNS if column in update_data}
+    metadata = {column: value for column, value in update_data.items() if column not in CONTENT_COLUMNS}
+    query, values, rejected = canonical_update(
+        "meetings", MEETING_UPDATABLE_COLUMNS, metadata, ["id", "user_id"]
+    )
+    if rejected:
+        logger.warning(f"Colonnes ignorées lors de la mise à jour de la réunion {meeting_id}: {', '.join(rejected)}")
+    if query is None and not content:
+        return False
     async with get_db_connection() as conn:
-        set_parts = []
-        values = []
-        idx = 1
-        for k, v in update_data.items():
-            set_parts.append(f"{k} = ${idx}")
-            values.append(v)
-            idx += 1
-        # where params
-        values.append(uuid.UUID(meeting_id))
-        values.append(uuid.UUID(user_id))
-        query = f"UPDATE meetings SET {', '.join(set_parts)} WHERE id = ${idx} AND user_id = ${idx+1}"
-        res = await conn.execute(query, *values)
-        return res and res.upper().startswith("UPDATE")
+        async with conn.transaction():
+            if query is not None:
+                res = await conn.execute(query, *values, uuid.UUID(meeting_id), uuid.UUID(user_id))
+                if not res.upper().startswith("UPDATE"):
+                    return False
+            if content:
+                await store_meeting_content_async(meeting_id, user_id, content, conn=conn)
+        return True
 
 
 def update_meeting(meeting_id: str, user_id: str, update_data: Dict[str, Any]) -> bool:
@@ -147,10 +462,13 @@ async def delete_meeting_async(meeting_id: str, user_id: str) -> Optional[str]:
         )
         if not row:
             return None
-        await conn.execute(
-            "DELETE FROM meetings WHERE id = $1 AND user_id = $2",
-            uuid.UUID(meeting_id), uuid.UUID(user_id)
-        )
+        async with conn.transaction():
+            # Pas de clé étrangère summary_jobs -> meetings une fois les réunions partitionnées
+            await conn.execute("DELETE FROM summary_jobs WHERE meeting_id = $1", uuid.UUID(meeting_id))
+            await conn.execute(
+                "DELETE FROM meetings WHERE id = $1 AND user_id = $2",
+                uuid.UUID(meeting_id), uuid.UUID(user_id)
+            )
         return row["file_url"]
 
 
@@ -159,108 +477,436 @@ def delete_meeting(meeting_id: str, user_id: str) -> Optional[str]:
 
 
 async def get_meeting_speakers_async(meeting_id: str, user_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Noms personnalisés des locuteurs (None si la réunion n'appartient pas à l'utilisateur)."""
     async with get_db_connection() as conn:
-        # verify meeting ownership
-        m = await conn.fetchrow(
-            "SELECT id FROM meetings WHERE id = $1 AND user_id = $2",
+        # Jointure externe: une ligne vide signale une réunion sans nom personnalisé
+        rows = await conn.fetch(
+            """
+            SELECT ms.id, ms.meeting_id, ms.speaker_id, ms.custom_name, ms.created_at
+            FROM meetings m
+            LEFT JOIN meeting_speakers ms ON ms.meeting_id = m.id
+            WHERE m.id = $1 AND m.user_id = $2
+            ORDER BY ms.speaker_id
+            """,
             uuid.UUID(meeting_id), uuid.UUID(user_id),
         )
-        if not m:
+        if not rows:
             return None
-        rows = await conn.fetch(
-            "SELECT * FROM meeting_speakers WHERE meeting_id = $1 ORDER BY speaker_id",
-            uuid.UUID(meeting_id),
-        )
-        return [dict(r) for r in rows] if rows else []
+        return [dict(r) for r in rows if r["id"] is not None]
 
 
 def get_meeting_speakers(meeting_id: str, user_id: str) -> Optional[List[Dict[str, Any]]]:
     return _run(get_meeting_speakers_async(meeting_id, user_id))
 
 
-async def get_pending_transcriptions_async(max_age_hours: int = 24) -> List[Dict[str, Any]]:
+async def get_pending_transcriptions_async(max_age_hours: int = 24, include_content: bool = False) -> List[Dict[str, Any]]:
     threshold = datetime.utcnow() - timedelta(hours=max_age_hours)
     async with get_db_connection() as conn:
         rows = await conn.fetch(
-            "SELECT * FROM meetings WHERE transcript_status = 'pending' AND created_at > $1",
+            f"{meeting_select(include_content)} WHERE m.transcript_status = 'pending' AND m.created_at > $1",
             threshold,
         )
         return [dict(r) for r in rows]
 
 
-def get_pending_transcriptions(max_age_hours: int = 24) -> List[Dict[str, Any]]:
-    return _run(get_pending_transcriptions_async(max_age_hours))
+def get_pending_transcriptions(max_age_hours: int = 24, include_content: bool = False) -> List[Dict[str, Any]]:
+    return _run(get_pending_transcriptions_async(max_age_hours, include_content))
 
 
-async def get_meetings_by_status_async(status: str, max_age_hours: int = 72) -> List[Dict[str, Any]]:
+async def get_meetings_by_status_async(status: str, max_age_hours: int = 72, include_content: bool = False) -> List[Dict[str, Any]]:
     threshold = datetime.utcnow() - timedelta(hours=max_age_hours)
     async with get_db_connection() as conn:
         rows = await conn.fetch(
-            """
-            SELECT * FROM meetings
-            WHERE transcript_status = $1 AND created_at > $2
-            ORDER BY created_at DESC
+            f"""
+            {meeting_select(include_content)}
+            WHERE m.transcript_status = $1 AND m.created_at > $2
+            ORDER BY m.created_at DESC
             """,
             status, threshold,
         )
         return [dict(r) for r in rows]
 
 
-def get_meetings_by_status(status: str, max_age_hours: int = 72) -> List[Dict[str, Any]]:
-    return _run(get_meetings_by_status_async(status, max_age_hours))
+def get_meetings_by_status(status: str, max_age_hours: int = 72, include_content: bool = False) -> List[Dict[str, Any]]:
+    return _run(get_meetings_by_status_async(status, max_age_hours, include_content))
+
 
+def default_lease_owner(name: str = "worker") -> str:
+    """Identifiant de détenteur de bail unique par processus (hôte:pid:nom)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{name}"
 
-async def set_meeting_speaker_async(meeting_id: str, user_id: str, speaker_id: str, custom_name: str) -> bool:
+
+async def claim_meetings_async(
+    owner: str,
+    statuses: Tuple[str, ...] = ("processing",),
+    lease_seconds: int = 60,
+    limit: int = 20,
+    max_age_hours: int = 72,
+    include_content: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Prend un bail sur des réunions à traiter dont aucun bail n'est en cours.
+
+    Les lignes déjà verrouillées par un autre processus sont ignorées (SKIP LOCKED) et
+    un bail expiré (détenteur arrêté ou planté) est repris automatiquement.
+    """
+    threshold = datetime.utcnow() - timedelta(hours=max_age_hours)
+    content = "".join(f", mc.{column}" for column in CONTENT_COLUMNS) if include_content else ""
+    join = "LEFT JOIN meeting_content mc ON mc.meeting_id = m.id" if include_content else ""
     async with get_db_connection() as conn:
-        # ensure meeting ownership
-        m = await conn.fetchrow(
-            "SELECT id FROM meetings WHERE id = $1 AND user_id = $2",
-            uuid.UUID(meeting_id), uuid.UUID(user_id)
+        rows = await conn.fetch(
+            f"""
+            WITH m AS (
+                UPDATE meetings
+                SET lease_owner = $1, lease_expires_at = NOW() + make_interval(secs => $2)
+                WHERE id IN (
+                    SELECT id FROM meetings
+                    WHERE transcript_status = ANY($3::text[])
+                      AND created_at > $4
+                      AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+                    ORDER BY created_at
+                    LIMIT $5
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING {MEETING_COLUMNS}
+            )
+            SELECT m.*{content} FROM m {join}
+            """,
+            owner, float(lease_seconds), list(statuses), threshold, limit,
         )
-        if not m:
-            return False
-        existing = await conn.fetchrow(
-            "SELECT id FROM meeting_speakers WHERE meeting_id = $1 AND speaker_id = $2",
-            uuid.UUID(meeting_id), speaker_id
+        return [dict(r) for r in rows]
+
+
+def claim_meetings(
+    owner: str,
+    statuses: Tuple[str, ...] = ("processing",),
+    lease_seconds: int = 60,
+    limit: int = 20,
+    max_age_hours: int = 72,
+    include_content: bool = False,
+) -> List[Dict[str, Any]]:
+    return _run(claim_meetings_async(owner, statuses, lease_seconds, limit, max_age_hours, include_content))
+
+
+async def claim_meeting_async(meeting_id: str, owner: str, lease_seconds: int = 60) -> bool:
+    """Prend le bail d'une réunion précise; False si un bail non expiré existe déjà."""
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            UPDATE meetings
+            SET lease_owner = $2, lease_expires_at = NOW() + make_interval(secs => $3)
+            WHERE id = $1 AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+            RETURNING id
+            """,
+            uuid.UUID(meeting_id), owner, float(lease_seconds),
         )
-        if existing:
-            await conn.execute(
-                "UPDATE meeting_speakers SET custom_name = $1 WHERE id = $2",
-                custom_name, existing["id"],
-            )
-            return True
-        entry_id = str(uuid.uuid4())
-        await conn.execute(
-            "INSERT INTO meeting_speakers (id, meeting_id, speaker_id, custom_name) VALUES ($1, $2, $3, $4)",
-            uuid.UUID(entry_id), uuid.UUID(meeting_id), speaker_id, custom_name,
+        return row is not None
+
+
+def claim_meeting(meeting_id: str, owner: str, lease_seconds: int = 60) -> bool:
+    return _run(claim_meeting_async(meeting_id, owner, lease_seconds))
+
+
+async def release_meeting_async(meeting_id: str, owner: str) -> bool:
+    """Libère le bail d'une réunion s'il appartient encore à `owner`."""
+    async with get_db_connection() as conn:
+        result = await conn.execute(
+            "UPDATE meetings SET lease_owner = NULL, lease_expires_at = NULL WHERE id = $1 AND lease_owner = $2",
+            uuid.UUID(meeting_id), owner,
         )
-        return True
+        return result.endswith("1")
+
 
+def release_meeting(meeting_id: str, owner: str) -> bool:
+    return _run(release_meeting_async(meeting_id, owner))
 
-def set_meeting_speaker(meeting_id: str, user_id: str, speaker_id: str, custom_name: str) -> bool:
+
+async def set_meeting_speaker_async(meeting_id: str, user_id: str, speaker_id: str, custom_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Crée ou remplace le nom personnalisé d'un locuteur en une seule requête.
+
+    Returns:
+        Le locuteur enregistré, ou None si la réunion n'appartient pas à l'utilisateur
+    """
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            f"""
+            INSERT INTO meeting_speakers (meeting_id, meeting_created_at, speaker_id, custom_name)
+            SELECT m.id, m.created_at, $3, $4 FROM meetings m WHERE m.id = $1 AND m.user_id = $2
+            ON CONFLICT ON CONSTRAINT {_SPEAKER_KEY} DO UPDATE SET custom_name = EXCLUDED.custom_name
+            RETURNING {SPEAKER_COLUMNS}
+            """,
+            uuid.UUID(meeting_id), uuid.UUID(user_id), speaker_id, custom_name,
+        )
+        return dict(row) if row else None
+
+
+def set_meeting_speaker(meeting_id: str, user_id: str, speaker_id: str, custom_name: str) -> Optional[Dict[str, Any]]:
     return _run(set_meeting_speaker_async(meeting_id, user_id, speaker_id, custom_name))
 
 
 async def delete_meeting_speaker_async(meeting_id: str, user_id: str, speaker_id: str) -> bool:
+    """Supprime le nom personnalisé d'un locuteur; False si la réunion n'appartient pas à l'utilisateur."""
     async with get_db_connection() as conn:
-        # verify meeting ownership
-        m = await conn.fetchrow(
-            "SELECT id FROM meetings WHERE id = $1 AND user_id = $2",
-            uuid.UUID(meeting_id), uuid.UUID(user_id)
-        )
-        if not m:
-            return False
-        await conn.execute(
-            "DELETE FROM meeting_speakers WHERE meeting_id = $1 AND speaker_id = $2",
-            uuid.UUID(meeting_id), speaker_id,
+        # La ligne de la réunion est renvoyée même si le locuteur n'avait pas de nom
+        owned = await conn.fetchval(
+            """
+            WITH deleted AS (
+                DELETE FROM meeting_speakers ms
+                USING meetings m
+                WHERE ms.meeting_id = m.id AND m.id = $1 AND m.user_id = $2 AND ms.speaker_id = $3
+            )
+            SELECT EXISTS (SELECT 1 FROM meetings WHERE id = $1 AND user_id = $2)
+            """,
+            uuid.UUID(meeting_id), uuid.UUID(user_id), speaker_id,
         )
-        return True
+        return bool(owned)
 
 
 def delete_meeting_speaker(meeting_id: str, user_id: str, speaker_id: str) -> bool:
     return _run(delete_meeting_speaker_async(meeting_id, user_id, speaker_id))
 
 
+async def update_meeting_speakers_async(
+    meeting_id: str,
+    user_id: str,
+    names: Dict[str, Optional[str]],
+    replace: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Applique un ensemble de noms personnalisés dans une seule transaction, puis régénère
+    une seule fois transcript_text à partir des utterances.
+
+    Args:
+        names: {identifiant: nom}; un nom vide ou None rétablit le libellé par défaut
+        replace: Si True, les locuteurs absents de `names` perdent aussi leur nom personnalisé
+
+    Returns:
+        None si la réunion n'appartient pas à l'utilisateur, sinon {"previous_names",
+        "speakers" (noms enregistrés), "transcript_version" (None si la transcription
+        n'est pas terminée)}
+    """
+    assigned = {speaker_id: name for speaker_id, name in names.items() if name}
+    cleared = [speaker_id for speaker_id, name in names.items() if not name]
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            # Propriété, verrou de la réunion (renommages sérialisés) et noms actuels
+            row = await conn.fetchrow(
+                """
+                SELECT m.created_at, m.transcript_status = 'completed' AS completed,
+                       COALESCE(mc.transcript_text, '') <> '' AS has_text,
+                       EXISTS (SELECT 1 FROM meeting_utterances u WHERE u.meeting_id = m.id) AS has_utterances,
+                       (SELECT COALESCE(json_object_agg(ms.speaker_id, ms.custom_name), '{}')
+                        FROM meeting_speakers ms WHERE ms.meeting_id = m.id) AS previous_names
+                FROM meetings m
+                LEFT JOIN meeting_content mc ON mc.meeting_id = m.id
+                WHERE m.id = $1 AND m.user_id = $2
+                FOR UPDATE OF m
+                """,
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+            )
+            if not row:
+                return None
+            previous_names = json.loads(row["previous_names"])
+
+            if row["completed"] and row["has_text"] and not row["has_utterances"]:
+                # Réunion antérieure au stockage structuré: découper le texte avec les anciens noms
+                legacy = await _get_legacy_utterances(conn, meeting_id)
+                await replace_meeting_utterances_async(meeting_id, legacy, conn=conn, bump_version=False)
+
+            rows = await conn.fetch(
+                f"""
+                WITH removed AS (
+                    DELETE FROM meeting_speakers
+                    WHERE meeting_id = $1
+                      AND (speaker_id = ANY($4::text[]) OR ($5 AND NOT speaker_id = ANY($2::text[])))
+                ),
+                upserted AS (
+                    INSERT INTO meeting_speakers (meeting_id, meeting_created_at, speaker_id, custom_name)
+                    SELECT $1, $6, s.speaker_id, s.custom_name FROM unnest($2::text[], $3::text[]) AS s(speaker_id, custom_name)
+                    ON CONFLICT ON CONSTRAINT {_SPEAKER_KEY} DO UPDATE SET custom_name = EXCLUDED.custom_name
+                    RETURNING {SPEAKER_COLUMNS}
+                )
+                SELECT * FROM upserted
+                UNION ALL
+                SELECT {SPEAKER_COLUMNS} FROM meeting_speakers ms
+                WHERE ms.meeting_id = $1
+                  AND NOT ms.speaker_id = ANY($2::text[]) AND NOT ms.speaker_id = ANY($4::text[]) AND NOT $5
+                ORDER BY speaker_id
+                """,
+                uuid.UUID(meeting_id), list(assigned), list(assigned.values()), cleared, replace, row["created_at"],
+            )
+
+            transcript_version = None
+            if row["completed"] and (row["has_text"] or row["has_utterances"]):
+                transcript_version = await conn.fetchval(_RENDER_TRANSCRIPT_SQL, uuid.UUID(meeting_id))
+    return {
+        "previous_names": previous_names,
+        "speakers": [dict(r) for r in rows],
+        "transcript_version": transcript_version,
+    }
+
+
+async def _sync_summary_speaker_labels(conn, meeting_id: str, user_id: str, previous_names: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    """Corps de sync_summary_speaker_labels_async, dans la transaction de l'appelant."""
+    row = await conn.fetchrow(
+        """
+        SELECT m.client_id, mc.transcript_text, mc.summary_text, m.summary_status,
+               m.summary_speaker_labels, m.summary_revision
+        FROM meetings m
+        LEFT JOIN meeting_content mc ON mc.meeting_id = m.id
+        WHERE m.id = $1 AND m.user_id = $2
+        FOR UPDATE OF m
+        """,
+        uuid.UUID(meeting_id), uuid.UUID(user_id),
+    )
+    if not row:
+        return None
+    template_type = await conn.fetchval(
+        """
+        SELECT template_type FROM summary_jobs
+        WHERE meeting_id = $1 AND status = 'done'
+        ORDER BY finished_at DESC
+        LIMIT 1
+        """,
+        uuid.UUID(meeting_id),
+    )
+    result = {
+        "outcome": "unchanged",
+        "client_id": str(row["client_id"]) if row["client_id"] else None,
+        "template_type": template_type,
+        "summary_revision": row["summary_revision"],
+    }
+    if not row["summary_text"]:
+        return result
+    if row["summary_status"] == "processing":
+        # Les libellés seront comparés à l'enregistrement du compte rendu en cours
+        result["outcome"] = "pending"
+        return result
+
+    if row["summary_speaker_labels"] is not None:
+        recorded = json.loads(row["summary_speaker_labels"])
+    elif previous_names is not None:
+        # Compte rendu antérieur à l'enregistrement des libellés: ceux de la transcription
+        recorded = speaker_labels_for_transcript(row["transcript_text"], previous_names)
+    else:
+        result["outcome"] = "unrecorded"
+        return result
+
+    names_rows = await conn.fetch(
+        "SELECT speaker_id, custom_name FROM meeting_speakers WHERE meeting_id = $1",
+        uuid.UUID(meeting_id),
+    )
+    current = current_speaker_labels(recorded, {r["speaker_id"]: r["custom_name"] for r in names_rows})
+    if current == recorded and row["summary_speaker_labels"] is not None:
+        return result
+    summary_text = rewrite_summary_speakers(row["summary_text"], recorded, current)
+    if summary_text is None:
+        result["outcome"] = "ambiguous"
+        return result
+    await store_meeting_content_async(meeting_id, user_id, {"summary_text": summary_text}, conn=conn)
+    result["summary_revision"] = await conn.fetchval(
+        """
+        UPDATE meetings SET
+            summary_speaker_labels = $2::jsonb,
+            summary_revision = summary_revision + 1
+        WHERE id = $1
+        RETURNING summary_revision
+        """,
+        uuid.UUID(meeting_id), json.dumps(current, ensure_ascii=False),
+    )
+    result["outcome"] = "rewritten" if summary_text != row["summary_text"] else "unchanged"
+    return result
+
+
+async def sync_summary_speaker_labels_async(meeting_id: str, user_id: str, previous_names: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Aligne le compte rendu stocké sur les noms personnalisés actuels des locuteurs.
+
+    Le texte est réécrit par substitution des libellés enregistrés à la génération
+    (summary_speaker_labels), sous verrou de ligne pour sérialiser les renommages.
+
+    Returns:
+        None si la réunion est introuvable, sinon {"outcome", "client_id", "template_type",
+        "summary_revision"} avec outcome parmi 'unchanged', 'rewritten', 'pending'
+        (génération en cours), 'unrecorded' (libellés inconnus) et 'ambiguous'
+        (substitution refusée, le compte rendu doit être régénéré)
+    """
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            return await _sync_summary_speaker_labels(conn, meeting_id, user_id, previous_names)
+
+
+async def store_meeting_summary_async(meeting_id: str, user_id: str, summary_text: str, speaker_labels: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Enregistre un compte rendu généré (statut 'completed', nouvelle révision) avec les
+    libellés de locuteurs vus par le modèle. Un renommage survenu pendant la génération
+    est reporté dans la même transaction.
+
+    Returns:
+        Résultat de la synchronisation des libellés (voir sync_summary_speaker_labels_async)
+    """
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                """
+                UPDATE meetings SET
+                    summary_status = 'completed',
+                    summary_speaker_labels = $3::jsonb,
+                    summary_revision = summary_revision + 1
+                WHERE id = $1 AND user_id = $2
+                """,
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+                json.dumps(speaker_labels, ensure_ascii=False) if speaker_labels is not None else None,
+            )
+            await store_meeting_content_async(meeting_id, user_id, {"summary_text": summary_text}, conn=conn)
+            return await _sync_summary_speaker_labels(conn, meeting_id, user_id)
+
+
+def store_meeting_summary(meeting_id: str, user_id: str, summary_text: str, speaker_labels: Optional[Dict[str, str]] = None) -> Optional[Dict[str, Any]]:
+    return _run(store_meeting_summary_async(meeting_id, user_id, summary_text, speaker_labels))
+
+
+async def get_indexable_meetings_async(user_id: str) -> Dict[str, int]:
+    """Réunions à transcription terminée de l'utilisateur {id: transcript_version} (index sémantique)."""
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            "SELECT id, transcript_version FROM meetings WHERE user_id = $1 AND transcript_status = 'completed'",
+            uuid.UUID(user_id),
+        )
+    return {str(r["id"]): r["transcript_version"] for r in rows}
+
+
+async def get_client_meeting_ids_async(user_id: str, client_id: str) -> List[str]:
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            "SELECT id FROM meetings WHERE user_id = $1 AND client_id = $2",
+            uuid.UUID(user_id), uuid.UUID(client_id),
+        )
+    return [str(r["id"]) for r in rows]
+
+
+async def get_meetings_brief_async(meeting_ids: List[str], user_id: str) -> Dict[str, Dict[str, Any]]:
+    """Titre, client et date des réunions de l'utilisateur parmi `meeting_ids` (les autres sont ignorées)."""
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT id, title, client_id, transcript_status, created_at FROM meetings
+            WHERE user_id = $1 AND id = ANY($2::uuid[])
+            """,
+            uuid.UUID(user_id), [uuid.UUID(m) for m in meeting_ids],
+        )
+    result: Dict[str, Dict[str, Any]] = {}
+    for r in rows:
+        d = dict(r)
+        d["id"] = str(d["id"])
+        d["client_id"] = str(d["client_id"]) if d.get("client_id") else None
+        if d.get("created_at"):
+            d["created_at"] = d["created_at"].isoformat()
+        result[d["id"]] = d
+    return result
+
+
 async def validate_meeting_ids_async(meeting_ids: List[str], user_id: str) -> List[str]:
     async with get_db_connection() as conn:
         rows = await conn.fetch(
@@ -274,3 +920,385 @@ def validate_meeting_ids(meeting_ids: List[str], user_id: str) -> List[str]:
     return _run(validate_meeting_ids_async(meeting_ids, user_id))
 
 
+def _utterance_from_row(row) -> Dict[str, Any]:
+    return {
+        "speaker": row["speaker"],
+        "text": row["text"],
+        "start": row["start_ms"],
+        "end": row["end_ms"],
+    }
+
+
+_SPEAKER_STATS_COLUMNS = [
+    "meeting_id", "speaker", "talk_time_ms", "talk_share", "turns",
+    "avg_turn_ms", "interruptions", "words", "words_per_minute",
+]
+
+
+async def _replace_speaker_stats(conn, meeting_id: str, meeting_created_at: datetime, utterances: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    from ..services.speaker_stats import compute_speaker_stats
+    stats = compute_speaker_stats(utterances)
+    await conn.execute("DELETE FROM meeting_speaker_stats WHERE meeting_id = $1", uuid.UUID(meeting_id))
+    if stats:
+        await conn.copy_records_to_table(
+            "meeting_speaker_stats",
+            records=[
+                (uuid.UUID(meeting_id), *[s[c] for c in _SPEAKER_STATS_COLUMNS[1:]], meeting_created_at)
+                for s in stats
+            ],
+            columns=_SPEAKER_STATS_COLUMNS + ["meeting_created_at"],
+        )
+    return stats
+
+
+async def replace_meeting_utterances_async(meeting_id: str, utterances: List[Dict[str, Any]], conn=None, bump_version: bool = True) -> int:
+    """
+    Remplace les utterances stockées d'une réunion (appel interne, sans contrôle de propriétaire)
+    et recalcule les statistiques par locuteur dans la même transaction.
+
+    bump_version=False laisse l'appelant incrémenter transcript_version dans son propre UPDATE.
+    """
+    records = [
+        (
+            uuid.UUID(meeting_id), idx, u.get("speaker") or "Unknown", u.get("text") or "",
+            int(u["start"]) if u.get("start") is not None else None,
+            int(u["end"]) if u.get("end") is not None else None,
+        )
+        for idx, u in enumerate(utterances)
+    ]
+
+    async def _replace(c):
+        async with c.transaction():
+            meeting_created_at = await c.fetchval("SELECT created_at FROM meetings WHERE id = $1", uuid.UUID(meeting_id))
+            await c.execute("DELETE FROM meeting_utterances WHERE meeting_id = $1", uuid.UUID(meeting_id))
+            if records:
+                await c.copy_records_to_table(
+                    "meeting_utterances",
+                    records=[record + (meeting_created_at,) for record in records],
+                    columns=["meeting_id", "idx", "speaker", "text", "start_ms", "end_ms", "meeting_created_at"],
+                )
+            await _replace_speaker_stats(c, meeting_id, meeting_created_at, utterances)
+            # Toute réécriture complète invalide les éditions en cours basées sur l'ancienne version
+            if bump_version:
+                await c.execute(
+                    "UPDATE meetings SET transcript_version = transcript_version + 1 WHERE id = $1",
+                    uuid.UUID(meeting_id),
+                )
+        return len(records)
+
+    if conn is not None:
+        return await _replace(conn)
+    async with get_db_connection() as c:
+        return await _replace(c)
+
+
+def replace_meeting_utterances(meeting_id: str, utterances: List[Dict[str, Any]]) -> int:
+    return _run(replace_meeting_utterances_async(meeting_id, utterances))
+
+
+async def get_meeting_transcript_info_async(meeting_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Statut de transcription et nombre d'utterances stockées, sans charger le texte."""
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT m.transcript_status, m.transcript_version, m.duration_seconds, m.speakers_count,
+                   (SELECT count(*) FROM meeting_utterances u WHERE u.meeting_id = m.id) AS utterances_count
+            FROM meetings m
+            WHERE m.id = $1 AND m.user_id = $2
+            """,
+            uuid.UUID(meeting_id), uuid.UUID(user_id),
+        )
+        return dict(row) if row else None
+
+
+async def _get_legacy_utterances(conn, meeting_id: str) -> List[Dict[str, Any]]:
+    from ..services.utterances import parse_transcript_text
+    text = await conn.fetchval("SELECT transcript_text FROM meeting_content WHERE meeting_id = $1", uuid.UUID(meeting_id))
+    rows = await conn.fetch(
+        "SELECT speaker_id, custom_name FROM meeting_speakers WHERE meeting_id = $1",
+        uuid.UUID(meeting_id),
+    )
+    speaker_names = {r["speaker_id"]: r["custom_name"] for r in rows}
+    return parse_transcript_text(normalize_transcript_format(text), speaker_names)
+
+
+async def get_meeting_utterances_page_async(meeting_id: str, user_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Retourne une plage d'utterances [offset, offset+limit) et le total.
+    Les réunions sans utterances stockées sont reconstruites depuis transcript_text.
+    """
+    info = await get_meeting_transcript_info_async(meeting_id, user_id)
+    if info is None:
+        return None
+    async with get_db_connection() as conn:
+        if info["utterances_count"]:
+            rows = await conn.fetch(
+                """
+                SELECT idx, speaker, text, start_ms, end_ms FROM meeting_utterances
+                WHERE meeting_id = $1 AND idx >= $2
+                ORDER BY idx
+                LIMIT $3
+                """,
+                uuid.UUID(meeting_id), offset, limit,
+            )
+            items = [(r["idx"], _utterance_from_row(r)) for r in rows]
+            total = info["utterances_count"]
+        else:
+            legacy = await _get_legacy_utterances(conn, meeting_id)
+            end = len(legacy) if limit is None else offset + limit
+            items = list(enumerate(legacy))[offset:end]
+            total = len(legacy)
+    return {
+        "total": total,
+        "items": items,
+        "transcript_status": info["transcript_status"],
+        "transcript_version": info["transcript_version"],
+    }
+
+
+async def iter_meeting_utterances_async(meeting_id: str, offset: int = 0, prefetch: int = 200) -> AsyncIterator[Any]:
+    """
+    Itère sur les utterances d'une réunion au fil de la lecture, par pages de `prefetch`
+    (une requête courte par page). La connexion est rendue au pool entre deux pages: un
+    client lent ne garde ni connexion ni transaction ouverte.
+    L'appelant doit avoir vérifié la propriété de la réunion.
+    """
+    last = offset - 1
+    found = False
+    while True:
+        async with get_db_connection() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT idx, speaker, text, start_ms, end_ms FROM meeting_utterances
+                WHERE meeting_id = $1 AND idx > $2
+                ORDER BY idx
+                LIMIT $3
+                """,
+                uuid.UUID(meeting_id), last, prefetch,
+            )
+        for row in rows:
+            yield row["idx"], _utterance_from_row(row)
+        if rows:
+            found = True
+            last = rows[-1]["idx"]
+        if len(rows) < prefetch:
+            break
+    if found:
+        return
+
+    async with get_db_connection() as conn:
+        # Offset au-delà de la fin d'une transcription structurée: rien à renvoyer
+        if offset > 0 and await conn.fetchval(
+            "SELECT EXISTS (SELECT 1 FROM meeting_utterances WHERE meeting_id = $1)", uuid.UUID(meeting_id)
+        ):
+            return
+        legacy = await _get_legacy_utterances(conn, meeting_id)
+    for idx, utterance in enumerate(legacy):
+        if idx >= offset:
+            yield idx, utterance
+
+
+# Régénère transcript_text côté serveur à partir des utterances et des noms personnalisés
+# (même format que format_transcript_text) et incrémente la version de la transcription.
+# Le texte n'est pas réécrit dans meeting_content s'il n'a pas changé (même empreinte).
+_RENDER_TRANSCRIPT_SQL = f"""
+WITH rendered AS (
+    SELECT m.id, m.created_at, m.user_id, {_TRANSCRIPT_RENDER_EXPR} AS transcript_text
+    FROM meetings m WHERE m.id = $1
+), content AS (
+    INSERT INTO meeting_content (meeting_id, meeting_created_at, user_id, transcript_text)
+    SELECT id, created_at, user_id, transcript_text FROM rendered
+    ON CONFLICT ON CONSTRAINT {_CONTENT_KEY} DO UPDATE SET transcript_text = EXCLUDED.transcript_text, updated_at = NOW()
+    WHERE meeting_content.transcript_hash IS DISTINCT FROM md5(EXCLUDED.transcript_text)
+)
+UPDATE meetings m SET transcript_version = m.transcript_version + 1, transcript_stale = FALSE
+WHERE m.id = $1
+RETURNING m.transcript_version
+"""
+
+# Enregistre le texte reconstruit d'une transcription périmée, sans changer sa version
+# (ignoré si une autre édition a eu lieu depuis la lecture de la version $2)
+_MATERIALIZE_TRANSCRIPT_SQL = f"""
+WITH stale AS (
+    UPDATE meetings m SET transcript_stale = FALSE
+    WHERE m.id = $1 AND m.transcript_version = $2 AND m.transcript_stale
+    RETURNING m.id, m.created_at, m.user_id, {_TRANSCRIPT_RENDER_EXPR} AS transcript_text
+)
+INSERT INTO meeting_content (meeting_id, meeting_created_at, user_id, transcript_text)
+SELECT id, created_at, user_id, transcript_text FROM stale
+ON CONFLICT ON CONSTRAINT {_CONTENT_KEY} DO UPDATE SET transcript_text = EXCLUDED.transcript_text, updated_at = NOW()
+WHERE meeting_content.transcript_hash IS DISTINCT FROM md5(EXCLUDED.transcript_text)
+"""
+
+
+class TranscriptVersionConflict(Exception):
+    """La version de base d'une édition ne correspond plus à la version stockée."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"Version courante: {current_version}")
+        self.current_version = current_version
+
+
+async def apply_transcript_patch_async(meeting_id: str, user_id: str, base_version: int, edits: List[Dict[str, Any]]) -> Optional[int]:
+    """
+    Applique des éditions au niveau des utterances dans une seule transaction.
+
+    Seules les utterances éditées sont réécrites; les statistiques des locuteurs touchés
+    sont mises à jour à partir de ces utterances et de leurs voisines, et transcript_text
+    est marqué périmé (reconstruit à la lecture, voir meeting_select).
+
+    Args:
+        edits: Liste de {index, text?, speaker?}
+
+    Returns:
+        La nouvelle version de la transcription, ou None si la réunion est introuvable.
+
+    Raises:
+        TranscriptVersionConflict: si base_version ne correspond plus à la version stockée
+        ValueError: si la liste est vide, si un index est édité deux fois ou s'il n'existe pas
+    """
+    from ..services.speaker_stats import update_speaker_stats
+
+    if not edits:
+        raise ValueError("Aucune édition à appliquer")
+    edits_by_index = {int(e["index"]): e for e in edits}
+    if len(edits_by_index) != len(edits):
+        raise ValueError("Une même utterance est éditée plusieurs fois")
+    indexes = sorted(edits_by_index)
+    window = sorted({i for idx in indexes for i in (idx - 1, idx, idx + 1) if i >= 0})
+
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                SELECT transcript_version, created_at,
+                       EXISTS (SELECT 1 FROM meeting_utterances u WHERE u.meeting_id = m.id) AS has_utterances
+                FROM meetings m
+                WHERE m.id = $1 AND m.user_id = $2
+                FOR UPDATE
+                """,
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+            )
+            if not row:
+                return None
+            if row["transcript_version"] != base_version:
+                raise TranscriptVersionConflict(row["transcript_version"])
+
+            if not row["has_utterances"]:
+                # Réunion antérieure au stockage structuré: matérialiser les utterances
+                legacy = await _get_legacy_utterances(conn, meeting_id)
+                await replace_meeting_utterances_async(meeting_id, legacy, conn=conn, bump_version=False)
+
+            # Utterances éditées et leurs voisines (frontières de tours de parole)
+            stored = await conn.fetch(
+                """
+                SELECT idx, speaker, text, start_ms, end_ms FROM meeting_utterances
+                WHERE meeting_id = $1 AND idx = ANY($2::int[])
+                """,
+                uuid.UUID(meeting_id), window,
+            )
+            before = {r["idx"]: _utterance_from_row(r) for r in stored}
+            if any(idx not in before for idx in indexes):
+                raise ValueError("Une ou plusieurs éditions ciblent une utterance inexistante")
+
+            await conn.execute(
+                """
+                UPDATE meeting_utterances AS u
+                SET text = COALESCE(e.text, u.text),
+                    speaker = COALESCE(e.speaker, u.speaker)
+                FROM unnest($2::int[], $3::text[], $4::text[]) AS e(idx, text, speaker)
+                WHERE u.meeting_id = $1 AND u.idx = e.idx
+                """,
+                uuid.UUID(meeting_id), indexes,
+                [edits_by_index[i].get("text") for i in indexes], [edits_by_index[i].get("speaker") for i in indexes],
+            )
+
+            after = {idx: dict(u) for idx, u in before.items()}
+            for idx in indexes:
+                for field in ("text", "speaker"):
+                    if edits_by_index[idx].get(field) is not None:
+                        after[idx][field] = edits_by_index[idx][field]
+
+            # Statistiques des seuls locuteurs touchés (absentes: calculées à la première lecture)
+            stats = await conn.fetch(
+                f"SELECT {', '.join(_SPEAKER_STATS_COLUMNS[1:])} FROM meeting_speaker_stats WHERE meeting_id = $1",
+                uuid.UUID(meeting_id),
+            )
+            if stats:
+                updated, removed = update_speaker_stats([dict(r) for r in stats], before, after, indexes)
+                await conn.execute(
+                    "DELETE FROM meeting_speaker_stats WHERE meeting_id = $1 AND speaker = ANY($2::text[])",
+                    uuid.UUID(meeting_id), removed + [s["speaker"] for s in updated],
+                )
+                if updated:
+                    await conn.copy_records_to_table(
+                        "meeting_speaker_stats",
+                        records=[
+                            (uuid.UUID(meeting_id), *[s[c] for c in _SPEAKER_STATS_COLUMNS[1:]], row["created_at"])
+                            for s in updated
+                        ],
+                        columns=_SPEAKER_STATS_COLUMNS + ["meeting_created_at"],
+                    )
+
+            return await conn.fetchval(
+                """
+                UPDATE meetings SET transcript_version = transcript_version + 1, transcript_stale = TRUE
+                WHERE id = $1
+                RETURNING transcript_version
+                """,
+                uuid.UUID(meeting_id),
+            )
+
+
+async def replace_transcript_text_async(meeting_id: str, user_id: str, transcript_text: str) -> Optional[int]:
+    """
+    Enregistre un texte de transcription complet (sauvegarde historique par PUT):
+    les utterances sont reconstruites depuis le texte et la version est incrémentée.
+    """
+    from ..services.utterances import parse_transcript_text
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            exists = await conn.fetchval(
+                "SELECT 1 FROM meetings WHERE id = $1 AND user_id = $2 FOR UPDATE",
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+            )
+            if not exists:
+                return None
+            rows = await conn.fetch(
+                "SELECT speaker_id, custom_name FROM meeting_speakers WHERE meeting_id = $1",
+                uuid.UUID(meeting_id),
+            )
+            speaker_names = {r["speaker_id"]: r["custom_name"] for r in rows}
+            utterances = parse_transcript_text(normalize_transcript_format(transcript_text), speaker_names)
+            await replace_meeting_utterances_async(meeting_id, utterances, conn=conn)
+            return await conn.fetchval(_RENDER_TRANSCRIPT_SQL, uuid.UUID(meeting_id))
+
+
+async def get_meeting_speaker_stats_async(meeting_id: str, user_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Statistiques par locuteur précalculées. Pour les réunions terminées avant leur
+    introduction, elles sont calculées à la première demande puis stockées.
+    """
+    async with get_db_connection() as conn:
+        meeting = await conn.fetchrow(
+            "SELECT transcript_status, created_at FROM meetings WHERE id = $1 AND user_id = $2",
+            uuid.UUID(meeting_id), uuid.UUID(user_id),
+        )
+        if meeting is None:
+            return None
+        status = meeting["transcript_status"]
+        rows = await conn.fetch(
+            f"SELECT {', '.join(_SPEAKER_STATS_COLUMNS[1:])} FROM meeting_speaker_stats "
+            "WHERE meeting_id = $1 ORDER BY talk_time_ms DESC, speaker",
+            uuid.UUID(meeting_id),
+        )
+        if rows or status != "completed":
+            return [dict(r) for r in rows]
+
+        stored = await conn.fetch(
+            "SELECT speaker, text, start_ms, end_ms FROM meeting_utterances WHERE meeting_id = $1 ORDER BY idx",
+            uuid.UUID(meeting_id),
+        )
+        utterances = [_utterance_from_row(r) for r in stored] or await _get_legacy_utterances(conn, meeting_id)
+        async with conn.transaction():
+            return await _replace_speaker_stats(conn, meeting_id, meeting["created_at"], utterances)
@@ -0,0 +1,190 @@
+"""
+Partitions mensuelles des réunions et durées de conservation par utilisateur.
+
+Le partitionnement est optionnel: une base convertie par backend/partition_meetings.py
+découpe `meetings` (sur created_at) et ses tables liées (sur meeting_created_at, copie de
+la date de création de la réunion) en partitions mensuelles. Un même mois porte le même
+suffixe dans chaque table (meetings_2025_01, meeting_content_2025_01, ...), et les lignes
+hors des mois créés vont dans les partitions `<table>_default`. Un mois expiré se supprime
+en détachant ses partitions, sans DELETE ligne à ligne.
+"""
+
+import logging
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from .postgres_database import get_db_connection
+
+logger = logging.getLogger("meeting-transcriber")
+
+# (table, clé de partition), la table des réunions en premier
+PARTITIONED_TABLES = (
+    ("meetings", "created_at"),
+    ("meeting_content", "meeting_created_at"),
+    ("meeting_speakers", "meeting_created_at"),
+    ("meeting_utterances", "meeting_created_at"),
+    ("meeting_speaker_stats", "meeting_created_at"),
+)
+
+RETENTION_ACTIONS = ("archive", "delete")
+
+_MONTH_PARTITION = re.compile(r"^meetings_(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    """Premier instant (UTC) du mois de `value`."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def _bound(month: datetime) -> str:
+    # Les bornes d'une partition sont des constantes du DDL (pas de paramètres)
+    return f"'{month:%Y-%m-%d} 00:00:00+00'"
+
+
+async def is_partitioned_async(conn=None) -> bool:
+    """True si la table meetings est partitionnée."""
+    query = """
+        SELECT EXISTS (
+            SELECT 1 FROM pg_partitioned_table p
+            WHERE p.partrelid = to_regclass('meetings')
+        )
+    """
+    if conn is not None:
+        return await conn.fetchval(query)
+    async with get_db_connection() as c:
+        return await c.fetchval(query)
+
+
+async def meeting_partition_months_async(conn) -> List[datetime]:
+    """Mois des partitions mensuelles existantes de meetings, dans l'ordre."""
+    rows = await conn.fetch(
+        """
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass('meetings')
+        """
+    )
+    months = []
+    for r in rows:
+        match = _MONTH_PARTITION.match(r["relname"])
+        if match:
+            months.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc))
+    return sorted(months)
+
+
+async def create_month_partitions_async(conn, month: datetime, parent_suffix: str = "") -> List[str]:
+    """
+    Crée les partitions manquantes d'un mois dans chaque table; renvoie celles créées.
+    `parent_suffix` désigne les tables partitionnées en cours de construction (conversion).
+    """
+    created = []
+    for table, _ in PARTITIONED_TABLES:
+        name = partition_name(table, month)
+        exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name)
+        if exists:
+            continue
+        await conn.execute(
+            f"CREATE TABLE {name} PARTITION OF {table}{parent_suffix} "
+            f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+        )
+        created.append(name)
+    return created
+
+
+async def ensure_partitions_async(months_ahead: Optional[int] = None, now: Optional[datetime] = None) -> List[str]:
+    """
+    Crée les partitions du mois courant et des `months_ahead` mois suivants
+    (MEETING_PARTITION_PREMAKE_MONTHS par défaut). Sans effet si les réunions ne sont
+    pas partitionnées.
+    """
+    months_ahead = settings.MEETING_PARTITION_PREMAKE_MONTHS if months_ahead is None else months_ahead
+    current = month_start(now or datetime.now(timezone.utc))
+    created: List[str] = []
+    async with get_db_connection() as conn:
+        if not await is_partitioned_async(conn):
+            return created
+        for offset in range(months_ahead + 1):
+            async with conn.transaction():
+                created += await create_month_partitions_async(conn, add_months(current, offset))
+    if created:
+        logger.info(f"Partitions créées: {', '.join(created)}")
+    return created
+
+
+async def drop_month_partitions_async(conn, month: datetime) -> List[str]:
+    """
+    Supprime les partitions d'un mois dans toutes les tables (dans la transaction de
+    l'appelant). Les tables liées sont détachées avant meetings, que leurs clés étrangères
+    référencent; les générations de comptes rendus du mois sont supprimées d'abord.
+    """
+    await conn.execute(
+        f"DELETE FROM summary_jobs sj USING {partition_name('meetings', month)} m WHERE sj.meeting_id = m.id"
+    )
+    dropped = []
+    for table, _ in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, month)
+        if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name):
+            continue
+        await conn.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+        await conn.execute(f"DROP TABLE {name}")
+        dropped.append(name)
+    return dropped
+
+
+async def get_retention_policies_async() -> Dict[str, Dict[str, Any]]:
+    """Durées de conservation personnalisées {user_id: {"retention_months", "action", "updated_at"}}."""
+    async with get_db_connection() as conn:
+        rows = await conn.fetch("SELECT user_id, retention_months, action, updated_at FROM meeting_retention_policies")
+    return {
+        str(r["user_id"]): {"retention_months": r["retention_months"], "action": r["action"], "updated_at": r["updated_at"]}
+        for r in rows
+    }
+
+
+async def set_retention_policy_async(user_id: str, retention_months: int, action: str = "archive") -> Dict[str, Any]:
+    """
+    Crée ou remplace la durée de conservation d'un utilisateur.
+
+    Raises:
+        ValueError: durée négative ou action inconnue
+    """
+    if retention_months < 0:
+        raise ValueError(f"Durée de conservation invalide: {retention_months}")
+    if action not in RETENTION_ACTIONS:
+        raise ValueError(f"Action de conservation inconnue: {action}")
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            INSERT INTO meeting_retention_policies (user_id, retention_months, action)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (user_id) DO UPDATE
+            SET retention_months = EXCLUDED.retention_months, action = EXCLUDED.action, updated_at = NOW()
+            RETURNING user_id, retention_months, action, updated_at
+            """,
+            uuid.UUID(user_id), retention_months, action,
+        )
+    d = dict(row)
+    d["user_id"] = str(d["user_id"])
+    return d
+
+
+async def delete_retention_policy_async(user_id: str) -> bool:
+    """Rétablit la durée de conservation par défaut d'un utilisateur."""
+    async with get_db_connection() as conn:
+        result = await conn.execute("DELETE FROM meeting_retention_policies WHERE user_id = $1", uuid.UUID(user_id))
+    return result.endswith("1")
@@ -0,0 +1,205 @@
+"""
+Régénérations de comptes rendus en masse (table `summary_batches`).
+
+Un lot sélectionne des réunions (statut du compte rendu, ancienneté, client, template)
+et insère une tâche par réunion dans la file `summary_jobs`:
+
+- la limite de débit est appliquée en échelonnant `run_after` (une tâche toutes les
+  60 / rate_per_minute secondes), ce qui survit aux redémarrages;
+- la concurrence du lot est plafonnée au moment de la prise des tâches;
+- une réunion qui a déjà une génération active est ignorée (comptée dans `skipped`);
+- l'annulation retire les tâches encore en attente, les tâches en cours se terminent.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .postgres_database import get_db_connection
+
+_PROGRESS_SQL = """
+SELECT b.*,
+       count(j.id) FILTER (WHERE j.status = 'queued') AS queued,
+       count(j.id) FILTER (WHERE j.status = 'running') AS running,
+       count(j.id) FILTER (WHERE j.status = 'done') AS done,
+       count(j.id) FILTER (WHERE j.status = 'failed') AS failed,
+       count(j.id) FILTER (WHERE j.status = 'cancelled') AS cancelled
+FROM summary_batches b
+LEFT JOIN summary_jobs j ON j.batch_id = b.id
+WHERE {where}
+GROUP BY b.id
+ORDER BY b.created_at DESC
+"""
+
+
+def _batch_from_row(row) -> Dict[str, Any]:
+    batch = dict(row)
+    batch["id"] = str(batch["id"])
+    batch["user_id"] = str(batch["user_id"])
+    batch["filters"] = json.loads(batch["filters"]) if isinstance(batch["filters"], str) else batch["filters"]
+    for key in ("created_at", "finished_at"):
+        if batch.get(key):
+            batch[key] = batch[key].isoformat()
+    if "queued" in batch:
+        processed = batch["done"] + batch["failed"] + batch["cancelled"]
+        batch["progress"] = round(100.0 * processed / batch["total"], 1) if batch["total"] else 100.0
+    return batch
+
+
+async def _finalize_if_drained(conn, batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Passe un lot en 'completed' dès qu'il n'a plus de tâche en attente ni en cours."""
+    if batch["status"] == "running" and batch["queued"] == 0 and batch["running"] == 0:
+        finished_at = await conn.fetchval(
+            """
+            UPDATE summary_batches SET status = 'completed', finished_at = NOW()
+            WHERE id = $1 AND status = 'running'
+            RETURNING finished_at
+            """,
+            uuid.UUID(batch["id"]),
+        )
+        if finished_at:
+            batch["status"] = "completed"
+            batch["finished_at"] = finished_at.isoformat()
+    return batch
+
+
+async def create_summary_batch_async(
+    user_id: str,
+    summary_statuses: Optional[List[str]] = None,
+    created_before: Optional[datetime] = None,
+    created_after: Optional[datetime] = None,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+    limit: int = 500,
+    max_concurrency: int = 2,
+    rate_per_minute: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Crée un lot de régénération pour les réunions transcrites de l'utilisateur.
+
+    Args:
+        summary_statuses: Statuts de compte rendu ciblés ('not_generated' couvre l'absence de statut)
+        created_before / created_after: Bornes sur la date de création de la réunion
+        client_id: Réunions d'un client (son template est appliqué par la génération)
+        template_type: Réunions dont le dernier compte rendu a utilisé ce template intégré;
+            il est réutilisé pour la régénération
+        limit: Nombre maximal de réunions du lot
+        max_concurrency: Générations simultanées maximales pour ce lot
+        rate_per_minute: Débit maximal de démarrage des générations (None = sans limite)
+    """
+    filters = {
+        "summary_statuses": summary_statuses,
+        "created_before": created_before.isoformat() if created_before else None,
+        "created_after": created_after.isoformat() if created_after else None,
+        "client_id": client_id,
+        "template_type": template_type,
+        "limit": limit,
+    }
+    spacing = 60.0 / rate_per_minute if rate_per_minute else 0.0
+
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            batch_id = await conn.fetchval(
+                """
+                INSERT INTO summary_batches (user_id, filters, max_concurrency, rate_per_minute)
+                VALUES ($1, $2::jsonb, $3, $4)
+                RETURNING id
+                """,
+                uuid.UUID(user_id), json.dumps(filters), max_concurrency, rate_per_minute,
+            )
+            counts = await conn.fetchrow(
+                """
+                WITH targets AS (
+                    SELECT m.id, m.user_id, m.client_id,
+                           row_number() OVER (ORDER BY m.created_at, m.id) - 1 AS position
+                    FROM meetings m
+                    WHERE m.user_id = $1
+                      AND m.transcript_status = 'completed'
+                      AND ($2::text[] IS NULL OR COALESCE(m.summary_status, 'not_generated') = ANY($2::text[]))
+                      AND ($3::timestamptz IS NULL OR m.created_at < $3)
+                      AND ($4::timestamptz IS NULL OR m.created_at >= $4)
+                      AND ($5::uuid IS NULL OR m.client_id = $5)
+                      AND ($6::text IS NULL OR (
+                          SELECT sj.template_type FROM summary_jobs sj
+                          WHERE sj.meeting_id = m.id AND sj.status = 'done'
+                          ORDER BY sj.finished_at DESC
+                          LIMIT 1
+                      ) = $6)
+                    ORDER BY m.created_at, m.id
+                    LIMIT $7
+                ),
+                inserted AS (
+                    INSERT INTO summary_jobs (meeting_id, user_id, client_id, template_type, batch_id, run_after)
+                    SELECT id, user_id, client_id, $6, $8, NOW() + make_interval(secs => position * $9)
+                    FROM targets
+                    ON CONFLICT (meeting_id) WHERE status IN ('queued', 'running') DO NOTHING
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM targets) AS selected, (SELECT count(*) FROM inserted) AS total
+                """,
+                uuid.UUID(user_id), summary_statuses, created_before, created_after,
+                uuid.UUID(client_id) if client_id else None, template_type, limit,
+                batch_id, spacing,
+            )
+            # Les réunions sélectionnées qui ont déjà une génération active sont ignorées
+            total = counts["total"]
+            row = await conn.fetchrow(
+                """
+                UPDATE summary_batches
+                SET total = $2, skipped = $3,
+                    status = CASE WHEN $2 = 0 THEN 'completed' ELSE status END,
+                    finished_at = CASE WHEN $2 = 0 THEN NOW() ELSE NULL END
+                WHERE id = $1
+                RETURNING *
+                """,
+                batch_id, total, counts["selected"] - total,
+            )
+    return _batch_from_row(row)
+
+
+async def get_summary_batch_async(batch_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Lot avec ses compteurs de progression (queued/running/done/failed/cancelled)."""
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            _PROGRESS_SQL.format(where="b.id = $1 AND b.user_id = $2"),
+            uuid.UUID(batch_id), uuid.UUID(user_id),
+        )
+        if row is None:
+            return None
+        return await _finalize_if_drained(conn, _batch_from_row(row))
+
+
+async def list_summary_batches_async(user_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+    async with get_db_connection() as conn:
+        rows = await conn.fetch(
+            _PROGRESS_SQL.format(where="b.user_id = $1") + " LIMIT $2",
+            uuid.UUID(user_id), limit,
+        )
+        return [await _finalize_if_drained(conn, _batch_from_row(r)) for r in rows]
+
+
+async def cancel_summary_batch_async(batch_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Annule un lot: les tâches en attente sont retirées (le statut de compte rendu de leur
+    réunion n'a pas été modifié), les tâches déjà en cours vont à leur terme.
+    """
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            updated = await conn.fetchval(
+                """
+                UPDATE summary_batches SET status = 'cancelled', finished_at = NOW()
+                WHERE id = $1 AND user_id = $2 AND status = 'running'
+                RETURNING id
+                """,
+                uuid.UUID(batch_id), uuid.UUID(user_id),
+            )
+            if updated:
+                await conn.execute(
+                    """
+                    UPDATE summary_jobs SET status = 'cancelled', finished_at = NOW()
+                    WHERE batch_id = $1 AND status = 'queued'
+                    """,
+                    uuid.UUID(batch_id),
+                )
+    return await get_summary_batch_async(batch_id, user_id)
@@ -0,0 +1,78 @@
+"""
+Cache des comptes rendus générés, indexé par l'empreinte de la requête LLM.
+
+Postgres (table `summary_cache`) est la source durable; Redis sert de premier niveau.
+Une erreur Redis n'empêche jamais la lecture ou l'écriture en base.
+"""
+
+import logging
+from typing import Optional
+
+from ..core.config import settings
+from .postgres_database import get_db_connection, get_redis_client
+from .postgres_meetings import _run
+
+logger = logging.getLogger(__name__)
+
+
+def _redis_key(cache_key: str) -> str:
+    return f"summary:cache:{cache_key}"
+
+
+async def get_cached_summary_async(cache_key: str) -> Optional[str]:
+    """Retourne le compte rendu en cache pour cette empreinte, ou None."""
+    try:
+        redis_client = await get_redis_client()
+        if redis_client:
+            cached = await redis_client.get(_redis_key(cache_key))
+            if cached:
+                return cached
+    except Exception as e:
+        logger.warning(f"Cache Redis indisponible pour les comptes rendus: {e}")
+
+    async with get_db_connection() as conn:
+        summary_text = await conn.fetchval(
+            """
+            UPDATE summary_cache
+            SET hit_count = hit_count + 1, last_hit_at = NOW()
+            WHERE cache_key = $1
+            RETURNING summary_text
+            """,
+            cache_key,
+        )
+
+    if summary_text:
+        try:
+            redis_client = await get_redis_client()
+            if redis_client:
+                await redis_client.setex(_redis_key(cache_key), settings.SUMMARY_CACHE_TTL, summary_text)
+        except Exception as e:
+            logger.warning(f"Impossible de réalimenter le cache Redis: {e}")
+    return summary_text
+
+
+def get_cached_summary(cache_key: str) -> Optional[str]:
+    return _run(get_cached_summary_async(cache_key))
+
+
+async def store_cached_summary_async(cache_key: str, model: str, summary_text: str) -> None:
+    """Enregistre un compte rendu généré sous son empreinte."""
+    async with get_db_connection() as conn:
+        await conn.execute(
+            """
+            INSERT INTO summary_cache (cache_key, model, summary_text)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (cache_key) DO UPDATE SET summary_text = EXCLUDED.summary_text, created_at = NOW()
+            """,
+            cache_key, model, summary_text,
+        )
+    try:
+        redis_client = await get_redis_client()
+        if redis_client:
+            await redis_client.setex(_redis_key(cache_key), settings.SUMMARY_CACHE_TTL, summary_text)
+    except Exception as e:
+        logger.warning(f"Impossible d'écrire le compte rendu dans Redis: {e}")
+
+
+def store_cached_summary(cache_key: str, model: str, summary_text: str) -> None:
+    return _run(store_cached_summary_async(cache_key, model, summary_text))
@@ -0,0 +1,341 @@
+"""
+File d'attente durable des générations de comptes rendus (table `summary_jobs`).
+
+- Une seule tâche active (queued/running) par réunion: index unique partiel.
+- Les tâches sont prises sous bail; un bail expiré (worker arrêté ou planté) remet
+  la tâche en jeu au cycle suivant.
+- Un échec est retenté avec un délai exponentiel jusqu'à `max_attempts`.
+- Le nombre de tâches en cours est plafonné globalement (tous processus confondus), et
+  par lot pour les régénérations en masse (voir `postgres_summary_batches`).
+"""
+
+import json
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.config import settings
+from .postgres_database import get_db_connection
+from .postgres_meetings import _run
+
+
+def _job_from_row(row) -> Dict[str, Any]:
+    job = dict(row)
+    job["meeting_id"] = str(job["meeting_id"])
+    job["user_id"] = str(job["user_id"])
+    if job.get("client_id"):
+        job["client_id"] = str(job["client_id"])
+    if job.get("batch_id"):
+        job["batch_id"] = str(job["batch_id"])
+    return job
+
+
+async def enqueue_summary_job_async(
+    meeting_id: str,
+    user_id: str,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+    max_attempts: int = 3,
+    conn=None,
+    only_if_statuses: Optional[Sequence[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Ajoute une génération de compte rendu à la file et passe la réunion en 'processing'.
+
+    Si une tâche est déjà en attente ou en cours pour la réunion, elle est retournée telle
+    quelle (`created` = False) au lieu d'en créer une seconde.
+
+    Avec `only_if_statuses` (déclenchements automatiques), la réunion n'est prise que si son
+    summary_status figure dans la liste ('not_generated' couvre l'absence de statut) et
+    qu'aucune génération n'a échoué définitivement depuis SUMMARY_AUTO_RETRY_COOLDOWN
+    secondes; sinon rien n'est ajouté et la fonction retourne None. La mise à jour
+    conditionnelle verrouille la ligne: un seul appelant concurrent l'emporte.
+    """
+    async def _enqueue(c):
+        async with c.transaction():
+            if only_if_statuses is not None:
+                claimed = await c.fetchval(
+                    """
+                    UPDATE meetings SET summary_status = 'processing'
+                    WHERE id = $1
+                      AND COALESCE(summary_status, 'not_generated') = ANY($2::text[])
+                      AND NOT EXISTS (
+                          SELECT 1 FROM summary_jobs
+                          WHERE meeting_id = $1 AND status = 'failed'
+                            AND finished_at > NOW() - make_interval(secs => $3)
+                      )
+                    RETURNING id
+                    """,
+                    uuid.UUID(meeting_id), list(only_if_statuses), float(settings.SUMMARY_AUTO_RETRY_COOLDOWN),
+                )
+                if claimed is None:
+                    return None
+            row = await c.fetchrow(
+                """
+                INSERT INTO summary_jobs (meeting_id, user_id, client_id, template_type, max_attempts)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (meeting_id) WHERE status IN ('queued', 'running') DO NOTHING
+                RETURNING *
+                """,
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+                uuid.UUID(client_id) if client_id else None, template_type, max_attempts,
+            )
+            created = row is not None
+            if row is None:
+                # Tâche existante (ex: échelonnée par une régénération en masse): l'avancer à maintenant
+                row = await c.fetchrow(
+                    """
+                    UPDATE summary_jobs SET run_after = LEAST(run_after, NOW())
+                    WHERE meeting_id = $1 AND status IN ('queued', 'running')
+                    RETURNING *
+                    """,
+                    uuid.UUID(meeting_id),
+                )
+            await c.execute(
+                "UPDATE meetings SET summary_status = 'processing' WHERE id = $1",
+                uuid.UUID(meeting_id),
+            )
+        job = _job_from_row(row)
+        job["created"] = created
+        return job
+
+    if conn is not None:
+        return await _enqueue(conn)
+    async with get_db_connection() as c:
+        return await _enqueue(c)
+
+
+def enqueue_summary_job(
+    meeting_id: str,
+    user_id: str,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    return _run(enqueue_summary_job_async(meeting_id, user_id, client_id, template_type))
+
+
+async def claim_summary_job_inline_async(
+    meeting_id: str,
+    user_id: str,
+    owner: str,
+    lease_seconds: int,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Prend directement la génération d'une réunion pour l'exécuter hors des workers
+    (streaming SSE, scripts synchrones): crée une tâche déjà en cours, ou reprend la tâche
+    en attente de la réunion. Retourne None si une génération est déjà en cours ailleurs.
+    """
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                INSERT INTO summary_jobs (
+                    meeting_id, user_id, client_id, template_type, status, attempts, max_attempts,
+                    started_at, lease_owner, lease_expires_at
+                )
+                VALUES ($1, $2, $3, $4, 'running', 1, 1, NOW(), $5, NOW() + make_interval(secs => $6))
+                ON CONFLICT (meeting_id) WHERE status IN ('queued', 'running') DO NOTHING
+                RETURNING *
+                """,
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+                uuid.UUID(client_id) if client_id else None, template_type, owner, float(lease_seconds),
+            )
+            if row is None:
+                # Tâche en attente dans la file: l'exécuter ici plutôt que d'attendre un worker
+                row = await conn.fetchrow(
+                    """
+                    UPDATE summary_jobs
+                    SET status = 'running',
+                        attempts = attempts + 1,
+                        started_at = NOW(),
+                        template_type = COALESCE($2, template_type),
+                        lease_owner = $3,
+                        lease_expires_at = NOW() + make_interval(secs => $4)
+                    WHERE meeting_id = $1 AND status = 'queued'
+                    RETURNING *
+                    """,
+                    uuid.UUID(meeting_id), template_type, owner, float(lease_seconds),
+                )
+            if row is None:
+                return None
+            await conn.execute(
+                "UPDATE meetings SET summary_status = 'processing' WHERE id = $1",
+                uuid.UUID(meeting_id),
+            )
+            return _job_from_row(row)
+
+
+def claim_summary_job_inline(meeting_id: str, user_id: str, owner: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+    return _run(claim_summary_job_inline_async(meeting_id, user_id, owner, lease_seconds))
+
+
+async def claim_summary_jobs_async(owner: str, limit: int, max_running: int, lease_seconds: int) -> List[Dict[str, Any]]:
+    """
+    Prend jusqu'à `limit` tâches prêtes (en attente arrivées à échéance, ou en cours dont le
+    bail a expiré et qui ont encore des tentatives), sans dépasser `max_running` tâches en
+    cours au total. Une tâche au bail expiré sans tentative restante (worker planté ou tué à
+    chaque essai) passe en 'failed' et le compte rendu de sa réunion en 'error'.
+    """
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            # Sérialise les prises de tâches pour que le plafond global soit exact
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext('summary_jobs_claim'))")
+            await conn.execute(
+                """
+                WITH exhausted AS (
+                    UPDATE summary_jobs
+                    SET status = 'failed',
+                        finished_at = NOW(),
+                        last_error = COALESCE(last_error, 'Bail expiré sans tentative restante'),
+                        lease_owner = NULL,
+                        lease_expires_at = NULL
+                    WHERE status = 'running' AND lease_expires_at < NOW() AND attempts >= max_attempts
+                    RETURNING meeting_id
+                )
+                UPDATE meetings SET summary_status = 'error'
+                WHERE id IN (SELECT meeting_id FROM exhausted)
+                """
+            )
+            running = await conn.fetchval(
+                "SELECT count(*) FROM summary_jobs WHERE status = 'running' AND lease_expires_at >= NOW()"
+            )
+            available = min(limit, max_running - running)
+            if available <= 0:
+                return []
+            rows = await conn.fetch(
+                """
+                UPDATE summary_jobs
+                SET status = 'running',
+                    attempts = attempts + 1,
+                    started_at = NOW(),
+                    lease_owner = $1,
+                    lease_expires_at = NOW() + make_interval(secs => $2)
+                WHERE id IN (
+                    SELECT j.id FROM summary_jobs j
+                    LEFT JOIN summary_batches b ON b.id = j.batch_id
+                    WHERE ((j.status = 'queued' AND j.run_after <= NOW())
+                           OR (j.status = 'running' AND j.lease_expires_at < NOW() AND j.attempts < j.max_attempts))
+                      -- Les tâches d'une régénération en masse respectent la concurrence du lot
+                      AND (b.id IS NULL OR (
+                          SELECT count(*) FROM summary_jobs r
+                          WHERE r.batch_id = b.id AND r.status = 'running' AND r.lease_expires_at >= NOW()
+                      ) < b.max_concurrency)
+                    ORDER BY j.run_after, j.id
+                    LIMIT $3
+                    FOR UPDATE OF j SKIP LOCKED
+                )
+                RETURNING *
+                """,
+                owner, float(lease_seconds), available,
+            )
+            return [_job_from_row(r) for r in rows]
+
+
+async def extend_summary_job_lease_async(job_id: int, owner: str, lease_seconds: int) -> bool:
+    """Prolonge le bail d'une tâche longue (map-reduce); False si elle a été reprise ailleurs."""
+    async with get_db_connection() as conn:
+        result = await conn.execute(
+            """
+            UPDATE summary_jobs SET lease_expires_at = NOW() + make_interval(secs => $3)
+            WHERE id = $1 AND lease_owner = $2 AND status = 'running'
+            """,
+            job_id, owner, float(lease_seconds),
+        )
+        return result.endswith("1")
+
+
+def extend_summary_job_lease(job_id: int, owner: str, lease_seconds: int) -> bool:
+    return _run(extend_summary_job_lease_async(job_id, owner, lease_seconds))
+
+
+async def finish_summary_job_async(job_id: int, owner: str) -> None:
+    async with get_db_connection() as conn:
+        await conn.execute(
+            """
+            UPDATE summary_jobs
+            SET status = 'done', finished_at = NOW(), lease_owner = NULL, lease_expires_at = NULL
+            WHERE id = $1 AND lease_owner = $2
+            """,
+            job_id, owner,
+        )
+
+
+def finish_summary_job(job_id: int, owner: str) -> None:
+    return _run(finish_summary_job_async(job_id, owner))
+
+
+async def fail_summary_job_async(job_id: int, owner: str, error: str, backoff_seconds: int) -> str:
+    """
+    Enregistre un échec: la tâche est replanifiée après `backoff_seconds * 2^(tentatives-1)`
+    tant qu'il reste des tentatives, sinon elle passe en 'failed'. Retourne le nouveau statut.
+    """
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                UPDATE summary_jobs
+                SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,
+                    run_after = CASE WHEN attempts < max_attempts
+                                     THEN NOW() + make_interval(secs => $4 * power(2, attempts - 1))
+                                     ELSE run_after END,
+                    finished_at = CASE WHEN attempts < max_attempts THEN NULL ELSE NOW() END,
+                    last_error = $3,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE id = $1 AND lease_owner = $2
+                RETURNING status, meeting_id
+                """,
+                job_id, owner, error[:2000], float(backoff_seconds),
+            )
+            if row is None:
+                return "lost"
+            # Une nouvelle tentative est prévue: la réunion reste en cours de génération
+            await conn.execute(
+                "UPDATE meetings SET summary_status = $2 WHERE id = $1",
+                row["meeting_id"], "processing" if row["status"] == "queued" else "error",
+            )
+            return row["status"]
+
+
+def fail_summary_job(job_id: int, owner: str, error: str, backoff_seconds: int) -> str:
+    return _run(fail_summary_job_async(job_id, owner, error, backoff_seconds))
+
+
+async def record_summary_job_compaction_async(meeting_id: str, report: Dict[str, Any]) -> bool:
+    """Enregistre le rapport de compaction avec la tâche en cours de la réunion; False sans tâche en cours."""
+    async with get_db_connection() as conn:
+        result = await conn.execute(
+            "UPDATE summary_jobs SET compaction = $2::jsonb WHERE meeting_id = $1 AND status = 'running'",
+            uuid.UUID(meeting_id), json.dumps(report),
+        )
+        return result.endswith("1")
+
+
+async def get_summary_queue_stats_async() -> Dict[str, Any]:
+    """
+    Profondeur de la file, temps d'attente (secondes) et gain de la compaction des
+    transcriptions sur les comptes rendus générés dans l'heure, pour la supervision.
+    """
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT
+                count(*) FILTER (WHERE status = 'queued') AS queued,
+                count(*) FILTER (WHERE status = 'queued' AND run_after <= NOW()) AS ready,
+                count(*) FILTER (WHERE status = 'running') AS running,
+                count(*) FILTER (WHERE status = 'failed' AND finished_at > NOW() - INTERVAL '24 hours') AS failed_last_24h,
+                count(*) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '1 hour') AS done_last_hour,
+                EXTRACT(EPOCH FROM NOW() - min(created_at) FILTER (WHERE status = 'queued')) AS oldest_wait_seconds,
+                EXTRACT(EPOCH FROM avg(started_at - created_at)
+                    FILTER (WHERE started_at > NOW() - INTERVAL '1 hour')) AS avg_wait_seconds_last_hour,
+                sum((compaction->>'tokens_before')::bigint) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '1 hour')::bigint AS tokens_before_compaction_last_hour,
+                sum((compaction->>'tokens_after')::bigint) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '1 hour')::bigint AS tokens_after_compaction_last_hour,
+                avg((compaction->>'reduction_pct')::float) FILTER (WHERE status = 'done' AND finished_at > NOW() - INTERVAL '1 hour') AS avg_compaction_pct_last_hour
+            FROM summary_jobs
+            """
+        )
+        stats = dict(row)
+        for key in ("oldest_wait_seconds", "avg_wait_seconds_last_hour", "avg_compaction_pct_last_hour"):
+            stats[key] = round(float(stats[key]), 1) if stats[key] is not None else None
+        return stats
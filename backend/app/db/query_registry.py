@@ -0,0 +1,213 @@
+"""
+Registre des requêtes SQL et mesures par requête.
+
+Les requêtes fréquentes sont déclarées avec `named_query` (nom stable, texte unique);
+les autres sont identifiées par l'empreinte de leur texte. Toutes les connexions du pool
+sont des `InstrumentedConnection`: chaque appel (execute, fetch, fetchrow, fetchval,
+executemany) enregistre, par requête, le nombre d'appels et d'erreurs, un histogramme
+des latences et le nombre de lignes renvoyées ou modifiées.
+
+Les mises à jour dynamiques passent par `canonical_update`: colonnes filtrées par une
+liste autorisée et triées, de sorte que deux mises à jour des mêmes colonnes produisent
+le même texte SQL et réutilisent l'instruction préparée du cache d'asyncpg.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Bornes supérieures (ms) des tranches de l'histogramme des latences, plus une tranche au-delà
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Instructions émises par asyncpg lui-même (transactions, remise à zéro des connexions du pool)
+_CONTROL_STATEMENT = re.compile(
+    r"^\s*(BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|START TRANSACTION|SELECT pg_advisory_unlock_all)\b",
+    re.IGNORECASE,
+)
+
+
+class NamedQuery(str):
+    """Texte SQL portant le nom sous lequel ses mesures sont enregistrées."""
+
+    name: str
+
+    def __new__(cls, name: str, sql: str):
+        query = super().__new__(cls, sql)
+        query.name = name
+        return query
+
+
+class QueryStats:
+    """Compteurs d'une requête."""
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, seconds: float, rows: int, error: bool):
+        self.calls += 1
+        self.errors += int(error)
+        self.rows += rows
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        milliseconds = seconds * 1000
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if milliseconds <= bound), len(LATENCY_BUCKETS_MS))
+        self.buckets[index] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "sql": self.sql,
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "mean_ms": round(self.total_seconds * 1000 / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "latency_histogram": dict(zip(labels, self.buckets)),
+        }
+
+
+# Partagés entre la loop principale et la loop du pont synchrone (threads différents)
+_lock = threading.Lock()
+_registry: Dict[str, str] = {}
+_stats: Dict[str, QueryStats] = {}
+
+
+def _normalize(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def named_query(name: str, sql: str) -> NamedQuery:
+    """
+    Déclare une requête nommée.
+
+    Raises:
+        ValueError: si le nom est déjà utilisé pour un autre texte SQL
+    """
+    with _lock:
+        registered = _registry.setdefault(name, sql)
+    if _normalize(registered) != _normalize(sql):
+        raise ValueError(f"Nom de requête déjà utilisé pour un autre texte SQL: {name}")
+    return NamedQuery(name, registered)
+
+
+def statement_name(query: str) -> str:
+    """Nom de la requête (nommée) ou empreinte de son texte normalisé."""
+    name = getattr(query, "name", None)
+    if name:
+        return name
+    digest = hashlib.sha1(_normalize(query).encode("utf-8")).hexdigest()[:12]
+    return f"sql:{digest}"
+
+
+def registered_queries() -> Dict[str, str]:
+    """Requêtes nommées déclarées {nom: texte SQL}."""
+    with _lock:
+        return dict(_registry)
+
+
+def record_query(query: str, seconds: float, rows: int = 0, error: bool = False):
+    name = statement_name(query)
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = QueryStats(_normalize(query)[:500])
+        stats.add(seconds, rows, error)
+
+
+def query_stats_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Mesures par requête, de la plus coûteuse (temps cumulé) à la moins coûteuse."""
+    with _lock:
+        items = [(name, stats.as_dict()) for name, stats in _stats.items()]
+    items.sort(key=lambda item: item[1]["total_ms"], reverse=True)
+    return dict(items)
+
+
+def reset_query_stats():
+    with _lock:
+        _stats.clear()
+
+
+def _status_rows(status: Optional[str]) -> int:
+    # Statut de commande PostgreSQL: "UPDATE 3", "INSERT 0 1", "DELETE 0"...
+    last = (status or "").rsplit(" ", 1)[-1]
+    return int(last) if last.isdigit() else 0
+
+
+class InstrumentedConnection(asyncpg.Connection):
+    """Connexion asyncpg qui enregistre les mesures de chaque requête (voir record_query)."""
+
+    async def _measure(self, query: str, args: Sequence[Any], call, count_rows):
+        if not args and not getattr(query, "name", None) and _CONTROL_STATEMENT.match(query):
+            return await call
+        started = time.perf_counter()
+        try:
+            result = await call
+        except BaseException:
+            record_query(query, time.perf_counter() - started, error=True)
+            raise
+        record_query(query, time.perf_counter() - started, count_rows(result))
+        return result
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        return await self._measure(query, args, super().execute(query, *args, **kwargs), _status_rows)
+
+    async def executemany(self, command: str, args, **kwargs):
+        return await self._measure(command, (), super().executemany(command, args, **kwargs), lambda result: 0)
+
+    async def fetch(self, query, *args, **kwargs):
+        return await self._measure(query, args, super().fetch(query, *args, **kwargs), len)
+
+    async def fetchrow(self, query, *args, **kwargs):
+        return await self._measure(
+            query, args, super().fetchrow(query, *args, **kwargs), lambda row: int(row is not None)
+        )
+
+    async def fetchval(self, query, *args, **kwargs):
+        return await self._measure(
+            query, args, super().fetchval(query, *args, **kwargs), lambda value: int(value is not None)
+        )
+
+
+def canonical_update(
+    table: str,
+    allowed_columns: Iterable[str],
+    update_data: Dict[str, Any],
+    key_columns: Sequence[str],
+    returning: Optional[str] = None,
+) -> Tuple[Optional[NamedQuery], List[Any], List[str]]:
+    """
+    Construit un UPDATE aux colonnes triées et limitées à `allowed_columns`.
+
+    Les paramètres des colonnes de `key_columns` (clause WHERE) sont à ajouter par
+    l'appelant après les valeurs renvoyées, dans le même ordre.
+
+    Returns:
+        (requête nommée, valeurs des colonnes modifiées, colonnes refusées);
+        la requête est None si aucune colonne autorisée n'est modifiée
+    """
+    allowed = set(allowed_columns)
+    columns = sorted(column for column in update_data if column in allowed)
+    rejected = sorted(column for column in update_data if column not in allowed)
+    if not columns:
+        return None, [], rejected
+    assignments = ", ".join(f"{column} = ${i}" for i, column in enumerate(columns, start=1))
+    conditions = " AND ".join(f"{column} = ${i}" for i, column in enumerate(key_columns, start=len(columns) + 1))
+    sql = f"UPDATE {table} SET {assignments} WHERE {conditions}"
+    if returning:
+        sql += f" RETURNING {returning}"
+    name = f"{table}.update({','.join(columns)})" + (f" returning {returning}" if returning else "")
+    return named_query(name, sql), [update_data[column] for column in columns], rejected
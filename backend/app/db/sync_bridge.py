@@ -0,0 +1,113 @@
+"""
+Pont synchrone vers les fonctions asynchrones de la base de données.
+
+Les wrappers synchrones (get_meeting, update_meeting...) servent au code exécuté dans
+des threads (transcription, scripts). Plutôt que de créer une event loop par appel, ce
+qui impose un pool asyncpg par loop, les coroutines sont soumises avec
+`run_coroutine_threadsafe` à une event loop de fond unique, dans un thread dédié, qui
+possède son propre pool de connexions (voir get_postgres_pool).
+
+Appeler un wrapper synchrone depuis une event loop en cours (route async, worker)
+bloque cette loop pendant toute la requête: un avertissement est journalisé avec
+l'appelant, la variante `_async` doit être utilisée à la place.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Fonctions intermédiaires ignorées pour retrouver le wrapper et son appelant
+_BRIDGE_FRAMES = frozenset({"run_sync", "_run"})
+
+
+class _BackgroundLoop:
+    """Event loop de fond démarrée à la première utilisation, dans un thread démon."""
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self.loop is None or self.loop.is_closed():
+                self.loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self.thread = threading.Thread(
+                    target=self._serve, args=(self.loop, ready), name="db-sync-bridge", daemon=True
+                )
+                self.thread.start()
+                ready.wait()
+            return self.loop
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def stop(self, timeout: float = 10.0):
+        with self._lock:
+            loop, thread = self.loop, self.thread
+            self.loop, self.thread = None, None
+        if loop is None or loop.is_closed():
+            return
+        from .postgres_database import close_connections
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_connections(), loop).result(timeout)
+        except Exception as e:
+            logger.error(f"Erreur lors de la fermeture des connexions du pont synchrone: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        loop.close()
+
+
+_background = _BackgroundLoop()
+
+
+def is_bridge_loop(loop: Optional[asyncio.AbstractEventLoop]) -> bool:
+    """Indique si la loop est celle du pont synchrone."""
+    return loop is not None and loop is _background.loop
+
+
+def _warn_blocking_call():
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_name in _BRIDGE_FRAMES:
+        frame = frame.f_back
+    wrapper = frame.f_code.co_name if frame is not None else "?"
+    caller = frame.f_back if frame is not None else None
+    location = f"{caller.f_code.co_filename}:{caller.f_lineno}" if caller is not None else "?"
+    logger.warning(
+        f"{wrapper}() synchrone appelé depuis une event loop en cours ({location}): "
+        f"la loop est bloquée pendant la requête, utiliser {wrapper}_async()"
+    )
+
+
+def run_sync(coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+    """
+    Exécute une coroutine sur l'event loop de fond et attend son résultat.
+
+    Raises:
+        RuntimeError: si l'appel est fait depuis la loop de fond elle-même (interblocage)
+    """
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is not None:
+        if is_bridge_loop(running):
+            coro.close()
+            raise RuntimeError("Wrapper synchrone appelé depuis la loop du pont synchrone")
+        _warn_blocking_call()
+    return asyncio.run_coroutine_threadsafe(coro, _background.get()).result(timeout)
+
+
+def shutdown_sync_bridge():
+    """Ferme le pool du pont synchrone et arrête sa loop (arrêt de l'application)."""
+    _background.stop()
@@ -11,6 +11,7 @@ import logging
 import os
 from contextlib import asynccontextmanager
 from .services.queue_processor import start_queue_processor, stop_queue_processor
+from .services.summary_worker import start_summary_workers, stop_summary_workers
 import asyncio
 
 # Configuration du logging
@@ -37,10 +38,20 @@ async def lifespan(app: FastAPI):
     # Démarrer le processeur de file d'attente
     await start_queue_processor()
     
+    # Démarrer les workers de génération des comptes rendus
+    await start_summary_workers()
+    
     # Générer le schéma OpenAPI
     yield
     # Opérations de fermeture
     await stop_queue_processor()
+    await stop_summary_workers()
+    from .services.llm_client import close_llm_client
+    await close_llm_client()
+    from .db.postgres_database import close_connections
+    from .db.sync_bridge import shutdown_sync_bridge
+    await close_connections()
+    await asyncio.to_thread(shutdown_sync_bridge)
     logger.info("Arrêt de l'API Meeting Transcriber")
 
 # Cache pour les réponses des endpoints sans état
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import datetime
 
 class MeetingBase(BaseModel):
@@ -29,6 +29,18 @@ class Meeting(MeetingBase):
     speakers_count: Optional[int] = None
     summary_text: Optional[str] = None
     summary_status: Optional[str] = None
+    summary_revision: Optional[int] = None
 
     class Config:
         orm_mode = True
+
+class TranscriptEdit(BaseModel):
+    """Édition d'une utterance (seuls les champs fournis sont modifiés)"""
+    index: int = Field(..., ge=0)
+    text: Optional[str] = None
+    speaker: Optional[str] = Field(None, min_length=1, max_length=50)
+
+class TranscriptPatch(BaseModel):
+    """Lot d'éditions appliqué sur une version donnée de la transcription"""
+    base_version: int
+    edits: List[TranscriptEdit]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 class SpeakerBase(BaseModel):
@@ -26,3 +26,14 @@ class Speaker(SpeakerBase):
 class SpeakersList(BaseModel):
     """Modèle pour une liste de locuteurs"""
     speakers: List[Speaker]
+
+
+class SpeakersUpdate(BaseModel):
+    """Noms personnalisés à appliquer en une fois ({identifiant: nom}, nom vide ou null = libellé par défaut)"""
+    speakers: Dict[str, Optional[str]]
+
+
+class SpeakersUpdateResult(SpeakersList):
+    """Noms enregistrés après une modification groupée"""
+    transcript_version: Optional[int] = None
+    summary_outcome: Optional[str] = None
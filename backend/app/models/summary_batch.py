@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+class SummaryBatchCreate(BaseModel):
+    """Sélection des réunions à régénérer et limites d'exécution du lot"""
+    summary_statuses: Optional[List[str]] = None
+    created_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+    client_id: Optional[str] = None
+    template_type: Optional[str] = None
+    limit: int = Field(500, ge=1, le=5000)
+    max_concurrency: int = Field(2, ge=1, le=20)
+    rate_per_minute: Optional[int] = Field(None, ge=1, le=600)
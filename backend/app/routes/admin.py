@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 import logging
-import subprocess
-import sys
-import os
-from pathlib import Path
 
-from ..core.security import get_current_user
+from ..core.security import get_current_admin, get_current_user
+from ..db.postgres_summary_batches import (
+    create_summary_batch_async,
+    get_summary_batch_async,
+    list_summary_batches_async,
+    cancel_summary_batch_async,
+)
+from ..models.summary_batch import SummaryBatchCreate
+from ..services.summary_worker import summary_worker_pool
 
 # Configuration du logging
 logger = logging.getLogger("meeting-transcriber")
@@ -16,56 +20,114 @@ router = APIRouter(prefix="/admin", tags=["Administration"])
 @router.post("/update-summaries", response_model=dict)
 async def update_stuck_summaries(current_user: dict = Depends(get_current_user)):
     """
-    Exécute le script de mise à jour des comptes rendus bloqués.
+    Relance les comptes rendus de l'utilisateur bloqués en statut 'processing'.
     
-    Cette route est temporaire et permet de débloquer les comptes rendus qui sont
-    restés en statut 'processing' trop longtemps.
+    Seules les réunions de l'utilisateur connecté sont concernées: elles sont regroupées
+    dans un lot de régénération à son nom (voir /admin/summary-batches); celles qui ont
+    déjà une génération active sont ignorées.
     """
     try:
-        # Vérifier que l'utilisateur a les droits d'administration
-        # Pour simplifier, on autorise tous les utilisateurs pour l'instant
-        
-        logger.info(f"Exécution du script de mise à jour des comptes rendus par l'utilisateur {current_user['id']}")
-        
-        # Chemin du script
-        script_path = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "update_summary_status.py"
-        
-        if not os.path.exists(script_path):
-            logger.error(f"Script non trouvé: {script_path}")
-            return JSONResponse(
-                status_code=404,
-                content={"message": "Script de mise à jour non trouvé", "success": False}
-            )
-        
-        # Exécuter le script en arrière-plan
-        process = subprocess.Popen(
-            [sys.executable, str(script_path)],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        # Attendre un peu pour voir si le script démarre correctement
-        try:
-            stdout, stderr = process.communicate(timeout=2)
-            if process.returncode != 0:
-                logger.error(f"Erreur lors du démarrage du script: {stderr}")
-                return JSONResponse(
-                    status_code=500,
-                    content={"message": f"Erreur lors du démarrage du script: {stderr}", "success": False}
-                )
-        except subprocess.TimeoutExpired:
-            # C'est normal, le script continue de s'exécuter
-            logger.info("Script démarré en arrière-plan")
+        logger.info(f"Relance des comptes rendus bloqués par l'utilisateur {current_user['id']}")
+        batch = await create_summary_batch_async(current_user["id"], summary_statuses=["processing"])
+        summary_worker_pool.notify()
         
         return {
             "message": "Mise à jour des comptes rendus démarrée en arrière-plan",
-            "success": True
+            "success": True,
+            "batch": batch
         }
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'exécution du script de mise à jour: {str(e)}")
+        logger.error(f"Erreur lors de la relance des comptes rendus bloqués: {str(e)}")
         return JSONResponse(
             status_code=500,
             content={"message": f"Une erreur s'est produite: {str(e)}", "success": False}
         )
+
+@router.post("/summary-batches", response_model=dict, status_code=202)
+async def create_summary_batch(
+    batch_request: SummaryBatchCreate,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Régénère en masse les comptes rendus des réunions sélectionnées (statut, ancienneté,
+    client, template), avec une concurrence et un débit bornés.
+    
+    Exemple: relancer tout l'historique d'un client après la modification de son template.
+    """
+    batch = await create_summary_batch_async(current_user["id"], **batch_request.dict())
+    summary_worker_pool.notify()
+    logger.info(
+        f"Lot de régénération {batch['id']} créé par l'utilisateur {current_user['id']}: "
+        f"{batch['total']} réunion(s), {batch['skipped']} ignorée(s)"
+    )
+    return batch
+
+@router.get("/summary-batches", response_model=dict)
+async def list_summary_batches(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)
+):
+    """Liste les derniers lots de régénération avec leur progression."""
+    return {"batches": await list_summary_batches_async(current_user["id"], limit)}
+
+@router.get("/summary-batches/{batch_id}", response_model=dict)
+async def get_summary_batch(batch_id: str, current_user: dict = Depends(get_current_user)):
+    """Progression d'un lot: tâches en attente, en cours, terminées, en échec et annulées."""
+    batch = await get_summary_batch_async(batch_id, current_user["id"])
+    if not batch:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Lot de régénération non trouvé", "type": "NOT_FOUND"}
+        )
+    return batch
+
+@router.post("/summary-batches/{batch_id}/cancel", response_model=dict)
+async def cancel_summary_batch(batch_id: str, current_user: dict = Depends(get_current_user)):
+    """Annule un lot: les générations non démarrées sont retirées, celles en cours se terminent."""
+    batch = await cancel_summary_batch_async(batch_id, current_user["id"])
+    if not batch:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Lot de régénération non trouvé", "type": "NOT_FOUND"}
+        )
+    return batch
+
+@router.get("/summary-queue", response_model=dict)
+async def get_summary_queue_stats(current_user: dict = Depends(get_current_admin)):
+    """
+    État de la file des comptes rendus: profondeur, tâches en cours, échecs récents,
+    temps d'attente (secondes) et tokens économisés par la compaction des transcriptions.
+    """
+    from ..db.postgres_summary_jobs import get_summary_queue_stats_async
+    from ..core.config import settings
+    
+    stats = await get_summary_queue_stats_async()
+    stats["max_running_jobs"] = settings.SUMMARY_MAX_RUNNING_JOBS
+    stats["workers_per_process"] = settings.SUMMARY_WORKERS
+    return stats
+
+@router.get("/db-queries", response_model=dict)
+async def get_db_query_stats(current_user: dict = Depends(get_current_admin)):
+    """
+    Mesures par requête SQL depuis le démarrage du processus (ou la dernière remise à zéro):
+    appels, erreurs, lignes renvoyées, latences (cumul, moyenne, maximum, histogramme).
+    """
+    from ..db.query_registry import query_stats_snapshot, registered_queries
+    from ..core.config import settings
+    
+    queries = query_stats_snapshot()
+    return {
+        "queries": queries,
+        "distinct_statements": len(queries),
+        "named_statements": sorted(registered_queries()),
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+@router.post("/db-queries/reset", response_model=dict)
+async def reset_db_query_stats(current_user: dict = Depends(get_current_admin)):
+    """Remet à zéro les mesures par requête (avant une mesure de charge par exemple)."""
+    from ..db.query_registry import reset_query_stats
+    
+    reset_query_stats()
+    return {"success": True}
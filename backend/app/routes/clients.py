@@ -2,7 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from typing import List, Optional
 from ..core.security import get_current_user
 from ..models.client import ClientCreate, ClientUpdate
-from ..db.client_queries import create_client, get_client, get_clients, update_client, delete_client
+from ..db.postgres_clients import (
+    create_client_async,
+    get_client_async,
+    get_clients_async,
+    update_client_async,
+    delete_client_async,
+)
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
@@ -19,7 +25,7 @@ async def create_client_route(
     
     Retourne les informations du client cru00e9u00e9.
     """
-    client = create_client(client_data.dict(), current_user["id"])
+    client = await create_client_async(client_data.dict(), current_user["id"])
     if not client:
         raise HTTPException(status_code=500, detail="Erreur lors de la cru00e9ation du client")
     return client
@@ -33,7 +39,7 @@ async def list_clients(
     
     Retourne la liste des clients avec leurs informations.
     """
-    return get_clients(current_user["id"])
+    return await get_clients_async(current_user["id"])
 
 @router.get("/{client_id}", response_model=dict)
 async def get_client_route(
@@ -47,7 +53,7 @@ async def get_client_route(
     
     Retourne les informations du client.
     """
-    client = get_client(client_id, current_user["id"])
+    client = await get_client_async(client_id, current_user["id"])
     if not client:
         raise HTTPException(
             status_code=404, 
@@ -75,7 +81,7 @@ async def update_client_route(
     """
     # Filtrer les valeurs non nulles pour la mise u00e0 jour
     update_data = {k: v for k, v in client_update.dict(exclude_unset=True).items() if v is not None}
-    client = update_client(client_id, current_user["id"], update_data)
+    client = await update_client_async(client_id, current_user["id"], update_data)
     
     if not client:
         raise HTTPException(
@@ -101,7 +107,7 @@ async def delete_client_route(
     
     Cette opu00e9ration supprime le client de la base de donnu00e9es mais ne modifie pas les ru00e9unions existantes.
     """
-    success = delete_client(client_id, current_user["id"])
+    success = await delete_client_async(client_id, current_user["id"])
     
     if not success:
         raise HTTPException(
@@ -1,31 +1,43 @@
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Path, Query
 from fastapi.logger import logger
+from fastapi.responses import StreamingResponse
 from ..core.security import get_current_user
 from ..models.user import User
-from ..models.meeting import Meeting, MeetingCreate, MeetingUpdate
+from ..models.meeting import Meeting, MeetingCreate, MeetingUpdate, TranscriptPatch
 from ..db.firebase import upload_mp3
 from ..services.assemblyai import transcribe_meeting, convert_to_wav, check_transcription_status, process_transcription
-from ..services.mistral_summary import process_meeting_summary, process_meeting_summary_async
+from ..services.mistral_summary import process_meeting_summary, process_meeting_summary_async, stream_meeting_summary_async, apply_cached_summary_async
 from ..db.postgres_meetings import (
-    create_meeting,
-    get_meeting,
-    get_meetings_by_user,
-    update_meeting,
-    delete_meeting,
-    get_meeting_speakers,
-    # async variants
+    create_meeting_async,
+    get_meetings_by_user_async,
+    delete_meeting_async,
     get_meeting_async,
     update_meeting_async,
+    get_meeting_speakers_async,
+    get_meeting_transcript_info_async,
+    get_meeting_utterances_page_async,
+    iter_meeting_utterances_async,
+    apply_transcript_patch_async,
+    replace_transcript_text_async,
+    TranscriptVersionConflict,
+    get_meeting_speaker_stats_async,
+    search_meetings_async,
 )
 from datetime import datetime
 from typing import List, Optional
 import os
+import uuid
 import tempfile
 import traceback
 import subprocess
 import threading
 import asyncio
+import json
 from ..services.transcription_checker import get_assemblyai_transcript_details, format_transcript_text
+from ..services.transcript_completion import complete_transcript_async
+from ..services.summary_worker import enqueue_summary
+from ..services.semantic_index import semantic_search_async
+from ..services.utterances import serialize_utterance, resolve_speaker_name
 
 router = APIRouter(prefix="/meetings", tags=["Réunions"])
 
@@ -115,7 +127,7 @@ async def upload_meeting(
             # Ajouter client_id si fourni
             if client_id:
                 meeting_data["client_id"] = client_id
-            meeting = create_meeting(meeting_data, current_user["id"])
+            meeting = await create_meeting_async(meeting_data, current_user["id"])
             
             # Lancer la transcription de manière asynchrone avec logs détaillés
             logger.info(f"Lancement de la transcription pour la réunion {meeting['id']}")
@@ -147,32 +159,96 @@ async def upload_meeting(
 @router.get("/", response_model=List[dict])
 async def list_meetings(
     status: Optional[str] = Query(None, description="Filtrer par statut de transcription (pending, processing, completed, error)"),
+    include_content: bool = Query(True, description="Inclure transcript_text et summary_text"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Liste toutes les réunions de l'utilisateur connecté.
     
     - **status**: Filtre optionnel pour afficher uniquement les réunions avec un statut spécifique
+    - **include_content**: false pour ne lire que les métadonnées (sans transcription ni compte rendu)
     
-    Retourne une liste de réunions avec leurs métadonnées (sans le contenu complet des transcriptions).
+    Retourne une liste de réunions avec leurs métadonnées.
     """
-    meetings = get_meetings_by_user(current_user["id"])
+    return await get_meetings_by_user_async(current_user["id"], status, include_content)
+
+@router.get("/search", response_model=dict)
+async def search_meetings(
+    q: str = Query(..., min_length=1, max_length=500, description="Texte recherché (\"expression exacte\", OR, -exclu)"),
+    client_id: Optional[str] = Query(None, description="Limiter la recherche aux réunions d'un client"),
+    limit: int = Query(20, ge=1, le=100, description="Nombre de résultats par page"),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé par la page précédente (next_cursor)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Recherche plein texte dans les titres, comptes rendus et transcriptions des réunions.
     
-    # Filtrer par statut si spécifié
-    if status:
-        meetings = [m for m in meetings if m.get("transcript_status") == status]
-        
-    return meetings
+    Les résultats sont classés par pertinence (un terme du titre compte plus qu'un terme
+    du compte rendu, lui-même plus qu'un terme de la transcription). Chaque résultat
+    contient un extrait `headline` où les termes trouvés sont entourés de `<mark></mark>`
+    et `headline_source` (title, summary ou transcript). Passer `next_cursor` dans
+    `cursor` pour obtenir la page suivante (null sur la dernière page).
+    """
+    if client_id:
+        try:
+            uuid.UUID(client_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "Identifiant de client invalide", "type": "INVALID_CLIENT_ID"}
+            )
+    try:
+        return await search_meetings_async(current_user["id"], q, client_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Curseur de pagination invalide", "type": "INVALID_CURSOR"}
+        )
+
+@router.get("/semantic-search", response_model=dict)
+async def semantic_search_meetings(
+    q: str = Query(..., min_length=1, max_length=1000, description="Question ou thème recherché"),
+    client_id: Optional[str] = Query(None, description="Limiter la recherche aux réunions d'un client"),
+    limit: int = Query(10, ge=1, le=50, description="Nombre de réunions renvoyées"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Recherche par le sens dans les transcriptions (index vectoriel des passages).
+    
+    Renvoie les réunions dont un passage est le plus proche de `q`, chacune avec son
+    meilleur passage (`passage.from`/`passage.to`: plage d'utterances, utilisable avec
+    `/meetings/{meeting_id}/transcript?from=`). Seules les réunions indexées par la
+    dernière exécution de `build_semantic_index.py` sont trouvées.
+    """
+    if client_id:
+        try:
+            uuid.UUID(client_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "Identifiant de client invalide", "type": "INVALID_CLIENT_ID"}
+            )
+    try:
+        return await semantic_search_async(current_user["id"], q, client_id, limit)
+    except RuntimeError as e:
+        logger.error(f"Recherche sémantique indisponible: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail={"message": "Recherche sémantique indisponible", "type": "SEMANTIC_SEARCH_UNAVAILABLE"}
+        )
 
 @router.get("/{meeting_id}", response_model=dict)
 async def get_meeting_route(
     meeting_id: str = Path(..., description="ID unique de la réunion"),
+    include_transcript: bool = Query(True, description="Inclure le texte complet de la transcription"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Récupère les détails d'une réunion spécifique, y compris sa transcription.
     
     - **meeting_id**: Identifiant unique de la réunion
+    - **include_transcript**: Si false, le texte de transcription est omis (chargement
+      par plages via `/meetings/{meeting_id}/transcript?from=&limit=`)
     
     Retourne toutes les informations de la réunion, y compris le texte de transcription
     si la transcription est terminée. Les noms personnalisés des locuteurs sont
@@ -181,7 +257,7 @@ async def get_meeting_route(
     # Log pour le debugging
     logger.info(f"Attempting to get meeting with ID: {meeting_id} for user: {current_user['id']}")
     
-    meeting = get_meeting(meeting_id, current_user["id"])
+    meeting = await get_meeting_async(meeting_id, current_user["id"])
     
     if not meeting:
         logger.warning(f"Meeting not found - ID: {meeting_id}, User ID: {current_user['id']}")
@@ -196,14 +272,15 @@ async def get_meeting_route(
         )
     
     # Si la transcription est terminée, appliquer automatiquement les noms personnalisés
-    if (meeting.get("transcript_status") == "completed" and 
+    if (include_transcript and
+        meeting.get("transcript_status") == "completed" and 
         meeting.get("transcript_text") and 
         meeting.get("transcript_id")):
         
         logger.info(f"[DEBUG] Checking custom speaker names for meeting {meeting_id}")
         try:
             # Récupérer les noms personnalisés des locuteurs
-            speakers_data = get_meeting_speakers(meeting_id, current_user["id"])
+            speakers_data = await get_meeting_speakers_async(meeting_id, current_user["id"])
             logger.info(f"[DEBUG] Got speakers_data: {speakers_data}")
             
             if speakers_data:
@@ -243,7 +320,7 @@ async def get_meeting_route(
                         logger.info(f"Applying custom speaker names to transcript for meeting {meeting_id}")
                         
                         # Récupérer les données complètes de la transcription depuis AssemblyAI
-                        transcript_data = get_assemblyai_transcript_details(meeting["transcript_id"])
+                        transcript_data = await asyncio.to_thread(get_assemblyai_transcript_details, meeting["transcript_id"])
                         
                         if transcript_data:
                             # Formater la transcription avec les noms personnalisés
@@ -253,7 +330,7 @@ async def get_meeting_route(
                             meeting["transcript_text"] = updated_transcript
                             
                             # Mettre à jour aussi en base de données pour la prochaine fois
-                            update_meeting(meeting_id, current_user["id"], {
+                            await update_meeting_async(meeting_id, current_user["id"], {
                                 "transcript_text": updated_transcript
                             })
                             
@@ -266,6 +343,9 @@ async def get_meeting_route(
             logger.error(f"Error applying custom speaker names: {str(e)}")
             logger.error(f"[DEBUG] Exception details: {traceback.format_exc()}")
     
+    if not include_transcript:
+        meeting.pop("transcript_text", None)
+    
     # Assurer que transcription_status est présent dans la réponse pour compatibilité frontend
     if 'transcript_status' in meeting and 'transcription_status' not in meeting:
         meeting['transcription_status'] = meeting['transcript_status']
@@ -292,14 +372,21 @@ async def update_meeting_route(
     if not update_data:
         raise HTTPException(status_code=400, detail="Aucune donnée à mettre à jour")
     
-    # Mettre à jour les données
-    update_success = update_meeting(meeting_id, current_user["id"], update_data)
+    # Le texte complet passe par le stockage structuré (utterances + version)
+    transcript_text = update_data.pop("transcript_text", None)
+    if transcript_text is not None:
+        if await replace_transcript_text_async(meeting_id, current_user["id"], transcript_text) is None:
+            raise HTTPException(status_code=404, detail="Réunion non trouvée")
     
-    if not update_success:
-        raise HTTPException(status_code=404, detail="Réunion non trouvée")
+    # Mettre à jour les données
+    if update_data:
+        update_success = await update_meeting_async(meeting_id, current_user["id"], update_data)
+        
+        if not update_success:
+            raise HTTPException(status_code=404, detail="Réunion non trouvée")
     
     # Récupérer la réunion mise à jour
-    updated_meeting = get_meeting(meeting_id, current_user["id"])
+    updated_meeting = await get_meeting_async(meeting_id, current_user["id"])
     
     if not updated_meeting:
         raise HTTPException(status_code=404, detail="Réunion non trouvée après mise à jour")
@@ -321,7 +408,7 @@ async def generate_meeting_summary_route(
     de la transcription existante. La génération s'effectue de manière asynchrone.
     """
     # Vérifier que la réunion existe (async pour éviter les conflits d'event loop)
-    meeting = await get_meeting_async(meeting_id, current_user["id"])
+    meeting = await get_meeting_async(meeting_id, current_user["id"], include_content=False)
     
     if not meeting:
         raise HTTPException(
@@ -346,9 +433,14 @@ async def generate_meeting_summary_route(
             }
         )
 
-    # Mettre le statut en processing et lancer en arrière-plan (version 100% async-safe)
-    await update_meeting_async(meeting_id, current_user["id"], {"summary_status": "processing"})
-    asyncio.create_task(process_meeting_summary_async(meeting_id, current_user["id"], None, template_type))
+    # Compte rendu identique déjà généré (même transcription, template, titre, modèle): aucun appel au modèle.
+    # Appliqué sous la tâche de la réunion; si une génération est en cours, la file la retourne ci-dessous
+    if await apply_cached_summary_async(meeting_id, current_user["id"], None, template_type):
+        updated = await get_meeting_async(meeting_id, current_user["id"]) or {"id": meeting_id}
+        return {"message": "Compte rendu récupéré depuis le cache", "meeting": updated}
+
+    # Ajouter à la file durable (une seule génération active par réunion); passe le statut en processing
+    await enqueue_summary(meeting_id, current_user["id"], None, template_type)
 
     # Retourner immédiatement
     updated = await get_meeting_async(meeting_id, current_user["id"]) or {"id": meeting_id}
@@ -375,7 +467,8 @@ async def get_meeting_summary(
     
     - **meeting_id**: Identifiant unique de la réunion
     
-    Retourne le compte rendu de la réunion et son statut.
+    Retourne le compte rendu de la réunion, son statut et sa révision (incrémentée à chaque
+    génération et à chaque report d'un renommage de locuteur).
     """
     # Vérifier que la réunion existe (async)
     meeting = await get_meeting_async(meeting_id, current_user["id"])
@@ -398,9 +491,77 @@ async def get_meeting_summary(
     return {
         "meeting_id": meeting_id,
         "summary_text": summary_text,
-        "summary_status": summary_status
+        "summary_status": summary_status,
+        "summary_revision": meeting.get("summary_revision", 0)
     }
 
+@router.get("/{meeting_id}/summary/stream")
+async def stream_meeting_summary(
+    meeting_id: str = Path(..., description="ID unique de la réunion"),
+    template_type: Optional[str] = Query(None, description="Type de template intégré (ex: 'formation')"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Génère le compte rendu et le diffuse au fil de la génération (Server-Sent Events).
+    
+    - **meeting_id**: Identifiant unique de la réunion
+    - **template_type**: Type de template intégré (ex: 'formation')
+    
+    Événements émis: `delta` (fragment de texte, JSON `{"text": ...}`), puis `done`
+    ou `error`. Le compte rendu complet est enregistré à la fin du flux, même si le
+    client se déconnecte avant.
+    """
+    meeting = await get_meeting_async(meeting_id, current_user["id"], include_content=False)
+    
+    if not meeting:
+        raise HTTPException(
+            status_code=404, 
+            detail={
+                "message": "Réunion non trouvée",
+                "meeting_id": meeting_id,
+                "reason": "Cette réunion a peut-être été supprimée",
+                "type": "MEETING_NOT_FOUND"
+            }
+        )
+    
+    if meeting.get("transcript_status") != "completed":
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "La transcription n'est pas terminée",
+                "meeting_id": meeting_id,
+                "reason": "La génération du compte rendu nécessite une transcription complète",
+                "type": "TRANSCRIPTION_NOT_COMPLETED"
+            }
+        )
+    
+    events = stream_meeting_summary_async(meeting_id, current_user["id"], None, template_type)
+    first_event = await events.__anext__()
+    if first_event["event"] == "busy":
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Un compte rendu est déjà en cours de génération pour cette réunion",
+                "meeting_id": meeting_id,
+                "type": "SUMMARY_IN_PROGRESS"
+            }
+        )
+    
+    async def event_stream():
+        async for event in events:
+            if event["event"] == "delta":
+                yield f"event: delta\ndata: {json.dumps({'text': event['data']}, ensure_ascii=False)}\n\n"
+            elif event["event"] == "done":
+                yield f"event: done\ndata: {json.dumps({'meeting_id': meeting_id, 'summary_status': 'completed'})}\n\n"
+            else:
+                yield f"event: error\ndata: {json.dumps({'message': event['data'], 'summary_status': 'error'}, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.delete("/{meeting_id}", response_model=dict)
 async def delete_meeting_route(
     meeting_id: str = Path(..., description="ID unique de la réunion"),
@@ -415,7 +576,7 @@ async def delete_meeting_route(
     de données et le fichier audio associé s'il est stocké localement.
     """
     # Supprimer la réunion et récupérer l'URL du fichier
-    file_url = delete_meeting(meeting_id, current_user["id"])
+    file_url = await delete_meeting_async(meeting_id, current_user["id"])
     
     if not file_url:
         raise HTTPException(status_code=404, detail="Réunion non trouvée")
@@ -449,7 +610,7 @@ async def transcribe_meeting_route(
     selon la durée de l'audio.
     """
     # Vérifier que la réunion existe et appartient à l'utilisateur
-    meeting = get_meeting(meeting_id, current_user["id"])
+    meeting = await get_meeting_async(meeting_id, current_user["id"], include_content=False)
     
     if not meeting:
         raise HTTPException(status_code=404, detail="Réunion non trouvée")
@@ -462,20 +623,11 @@ async def transcribe_meeting_route(
         if meeting.get("transcript_status") == "completed":
             return meeting
         
-        # Vérifier le statut actuel sur AssemblyAI
+        # Vérifier le statut actuel sur AssemblyAI (finalisation unique et idempotente)
         try:
-            status, text, duration, speakers_count = await check_transcription_status(transcript_id)
-            
-            if status == "completed" and text:
-                # Mettre à jour la base de données avec le texte de transcription
-                update_data = {
-                    "transcript_text": text,
-                    "transcript_status": "completed",
-                    "duration_seconds": duration,
-                    "speakers_count": speakers_count
-                }
-                updated_meeting = update_meeting(meeting_id, current_user["id"], update_data)
-                return updated_meeting
+            result = await complete_transcript_async(meeting_id, current_user["id"], transcript_id)
+            if result is None or result["status"] == "completed":
+                return await get_meeting_async(meeting_id, current_user["id"])
         except Exception as e:
             logger.error(f"Erreur lors de la vérification du statut: {str(e)}")
             # Continuer pour relancer la transcription
@@ -490,36 +642,64 @@ async def transcribe_meeting_route(
         )
     
     # Mettre à jour le statut
-    update_meeting(meeting_id, current_user["id"], {"transcript_status": "processing"})
+    await update_meeting_async(meeting_id, current_user["id"], {"transcript_status": "processing"})
     
-    # Lancer la transcription en arrière-plan
-    transcribe_meeting(meeting_id, file_url, current_user["id"])
+    # Lancer la transcription (appels HTTP et wrappers synchrones: hors de l'event loop)
+    await asyncio.to_thread(transcribe_meeting, meeting_id, file_url, current_user["id"])
     
     # Obtenir la réunion mise à jour
-    updated_meeting = get_meeting(meeting_id, current_user["id"])
+    updated_meeting = await get_meeting_async(meeting_id, current_user["id"])
     
     return updated_meeting
 
+async def _get_speaker_names(meeting_id: str, user_id: str) -> dict:
+    speakers_data = await get_meeting_speakers_async(meeting_id, user_id) or []
+    return {s["speaker_id"]: s["custom_name"] for s in speakers_data if s.get("custom_name")}
+
 @router.get("/{meeting_id}/transcript", response_model=dict)
 async def get_transcript(
     meeting_id: str = Path(..., description="ID unique de la réunion"),
+    from_index: Optional[int] = Query(None, alias="from", ge=0, description="Index de la première utterance à retourner"),
+    limit: Optional[int] = Query(None, ge=1, le=2000, description="Nombre maximum d'utterances à retourner"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Récupère uniquement la transcription d'une réunion.
     
     - **meeting_id**: Identifiant unique de la réunion
+    - **from** / **limit**: Pagination par plage d'utterances. Si l'un des deux est fourni,
+      la réponse contient la liste `utterances` de la plage demandée et `next_from`
+      au lieu du texte complet.
     
     Cette route est optimisée pour récupérer uniquement le texte de transcription
     et son statut, sans les autres métadonnées de la réunion.
     """
-    meeting = get_meeting(meeting_id, current_user["id"])
+    if from_index is not None or limit is not None:
+        offset = from_index or 0
+        page = await get_meeting_utterances_page_async(meeting_id, current_user["id"], offset, limit)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Réunion non trouvée")
+        speaker_names = await _get_speaker_names(meeting_id, current_user["id"])
+        utterances = [serialize_utterance(idx, u, speaker_names) for idx, u in page["items"]]
+        next_from = offset + len(utterances)
+        return {
+            "meeting_id": meeting_id,
+            "transcript_status": page["transcript_status"],
+            "transcript_version": page["transcript_version"],
+            "total": page["total"],
+            "from": offset,
+            "limit": limit,
+            "next_from": next_from if next_from < page["total"] else None,
+            "utterances": utterances,
+        }
+    
+    meeting = await get_meeting_async(meeting_id, current_user["id"])
     
     if not meeting:
         raise HTTPException(status_code=404, detail="Réunion non trouvée")
     
     # Si la transcription est en cours ou terminée, retourner les informations
-    # Note: get_meeting() applique déjà normalize_transcript_format
+    # Note: get_meeting_async() applique déjà normalize_transcript_format
     return {
         "transcript_text": meeting.get("transcript_text", ""),
         "transcript_status": meeting.get("transcript_status", "pending"),
@@ -527,6 +707,108 @@ async def get_transcript(
         "speakers_count": meeting.get("speakers_count")
     }
 
+@router.patch("/{meeting_id}/transcript", response_model=dict)
+async def patch_transcript(
+    patch: TranscriptPatch,
+    meeting_id: str = Path(..., description="ID unique de la réunion"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Applique des éditions au niveau des utterances sans renvoyer le texte complet.
+    
+    - **meeting_id**: Identifiant unique de la réunion
+    - **base_version**: Version de la transcription sur laquelle les éditions ont été faites
+    - **edits**: Liste de `{index, text?, speaker?}`
+    
+    Retourne la nouvelle version. Si la transcription a été modifiée entre-temps,
+    la route répond 409 avec la version courante.
+    """
+    if not patch.edits:
+        raise HTTPException(status_code=400, detail="Aucune édition à appliquer")
+    
+    try:
+        version = await apply_transcript_patch_async(
+            meeting_id, current_user["id"], patch.base_version,
+            [edit.dict(exclude_unset=True) for edit in patch.edits],
+        )
+    except TranscriptVersionConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "La transcription a été modifiée entre-temps",
+                "type": "VERSION_CONFLICT",
+                "current_version": e.current_version
+            }
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={"message": str(e), "type": "INVALID_EDIT"})
+    
+    if version is None:
+        raise HTTPException(status_code=404, detail="Réunion non trouvée")
+    
+    return {"meeting_id": meeting_id, "version": version, "applied": len(patch.edits)}
+
+@router.get("/{meeting_id}/transcript/stream")
+async def stream_transcript(
+    meeting_id: str = Path(..., description="ID unique de la réunion"),
+    from_index: int = Query(0, alias="from", ge=0, description="Index de la première utterance à retourner"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Diffuse la transcription au format NDJSON (une utterance JSON par ligne).
+    
+    - **meeting_id**: Identifiant unique de la réunion
+    - **from**: Index de la première utterance à diffuser
+    
+    Les utterances sont lues depuis la base par pages courtes et envoyées au fil de l'eau,
+    ce qui permet d'afficher le premier écran sans attendre la transcription complète.
+    """
+    info = await get_meeting_transcript_info_async(meeting_id, current_user["id"])
+    if not info:
+        raise HTTPException(status_code=404, detail="Réunion non trouvée")
+    speaker_names = await _get_speaker_names(meeting_id, current_user["id"])
+
+    async def _ndjson():
+        async for idx, utterance in iter_meeting_utterances_async(meeting_id, from_index):
+            yield json.dumps(serialize_utterance(idx, utterance, speaker_names), ensure_ascii=False) + "\n"
+
+    return StreamingResponse(
+        _ndjson(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Transcript-Status": str(info["transcript_status"] or "pending"),
+            "X-Transcript-Version": str(info["transcript_version"]),
+        },
+    )
+
+@router.get("/{meeting_id}/stats", response_model=dict)
+async def get_meeting_stats(
+    meeting_id: str = Path(..., description="ID unique de la réunion"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Récupère les statistiques de parole par locuteur d'une réunion.
+    
+    - **meeting_id**: Identifiant unique de la réunion
+    
+    Temps de parole, part du temps total, tours de parole, durée moyenne d'un tour,
+    interruptions, nombre de mots et débit (mots/minute). Les valeurs sont calculées
+    une seule fois à la fin de la transcription.
+    """
+    stats = await get_meeting_speaker_stats_async(meeting_id, current_user["id"])
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Réunion non trouvée")
+    
+    speaker_names = await _get_speaker_names(meeting_id, current_user["id"])
+    for entry in stats:
+        entry["speaker_name"] = resolve_speaker_name(entry["speaker"], speaker_names)
+    
+    return {
+        "meeting_id": meeting_id,
+        "total_talk_time_ms": sum(entry["talk_time_ms"] for entry in stats),
+        "speakers": stats
+    }
+
 @router.post("/validate-ids", response_model=dict)
 async def validate_meeting_ids(
     meeting_ids: List[str],
@@ -8,6 +8,7 @@ from typing import Optional, Dict, Any, List
 import asyncio
 import asyncio
 import os
+import uuid
 from datetime import datetime
 import logging
 import traceback
@@ -18,10 +19,12 @@ from ..db.postgres_meetings import (
     create_meeting_async,
     get_meeting_async,
     get_meetings_by_user_async,
+    list_meeting_cards_async,
     update_meeting_async,
     delete_meeting_async,
     get_meeting_speakers_async,
 )
+from ..services.transcript_completion import complete_transcript_async
 from ..core.config import settings
 # On s'appuie sur la tâche périodique interne pour les mises à jour de statut
 
@@ -148,27 +151,63 @@ async def simple_retry_transcription(
 @router.get("/", response_model=list)
 async def list_meetings(
     status: Optional[str] = Query(None, description="Filtrer par statut de transcription"),
+    include_content: bool = Query(True, description="Inclure transcript_text et summary_text"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Liste toutes les réunions de l'utilisateur.
     
     - **status**: Filtre optionnel pour afficher uniquement les réunions avec un statut spécifique
+    - **include_content**: false pour ne lire que les métadonnées (sans transcription ni compte rendu)
     
     Retourne une liste de réunions avec leurs métadonnées.
     """
-    meetings = await get_meetings_by_user_async(current_user["id"], status)
+    meetings = await get_meetings_by_user_async(current_user["id"], status, include_content)
     return meetings
 
+@router.get("/cards", response_model=dict)
+async def list_meeting_cards(
+    status: Optional[str] = Query(None, description="Filtrer par statut de transcription"),
+    client_id: Optional[str] = Query(None, description="Filtrer par client"),
+    limit: int = Query(50, ge=1, le=200, description="Nombre de cartes par page"),
+    cursor: Optional[str] = Query(None, description="Curseur renvoyé par la page précédente (next_cursor)"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Liste paginée et allégée des réunions pour le tableau de bord.
+    
+    Chaque carte contient l'identifiant, le titre, les statuts, la durée, le nombre de
+    locuteurs, la date, le client et un aperçu de la transcription. Passer `next_cursor`
+    dans `cursor` pour obtenir la page suivante (null sur la dernière page).
+    """
+    if client_id:
+        try:
+            uuid.UUID(client_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={"message": "Identifiant de client invalide", "type": "INVALID_CLIENT_ID"}
+            )
+    try:
+        return await list_meeting_cards_async(current_user["id"], status, client_id, limit, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "Curseur de pagination invalide", "type": "INVALID_CURSOR"}
+        )
+
 @router.get("/{meeting_id}", response_model=dict)
 async def get_meeting_details(
     meeting_id: str,
+    include_transcript: bool = Query(True, description="Inclure le texte complet de la transcription"),
     current_user: dict = Depends(get_current_user)
 ):
     """
     Récupère les détails d'une réunion spécifique.
     
     - **meeting_id**: Identifiant unique de la réunion
+    - **include_transcript**: Si false, le texte de transcription est omis (utiliser
+      `/meetings/{meeting_id}/transcript?from=&limit=` pour le charger par plages)
     
     Retourne toutes les informations de la réunion, y compris le texte de transcription
     si la transcription est terminée.
@@ -193,30 +232,15 @@ async def get_meeting_details(
         # Si la transcription est en cours et qu'on a un transcript_id, vérifier immédiatement auprès d'AssemblyAI
         if meeting.get("transcript_status") == "processing" and meeting.get("transcript_id"):
             try:
-                tid = meeting.get("transcript_id")
-                status_data = await asyncio.to_thread(check_transcription_status, tid)
-                if isinstance(status_data, dict) and status_data.get("status") == "completed":
-                    transcript_text = status_data.get("text", "")
-                    audio_duration = int(status_data.get("audio_duration", 0) or 0)
-                    speakers_count = 1
-                    if status_data.get("utterances"):
-                        speakers_set = set()
-                        for u in status_data.get("utterances", []) or []:
-                            speakers_set.add(u.get("speaker", "Unknown"))
-                        speakers_count = len(speakers_set) or 1
-                    await update_meeting_async(meeting_id, current_user["id"], {
-                        "transcript_status": "completed",
-                        "transcript_text": transcript_text,
-                        "duration_seconds": audio_duration,
-                        "speakers_count": speakers_count,
-                    })
+                result = await complete_transcript_async(meeting_id, current_user["id"], meeting.get("transcript_id"))
+                if result and result["status"] in ("completed", "error"):
                     # Rafraîchir l'objet meeting après update
                     meeting = await get_meeting_async(meeting_id, current_user["id"]) 
             except Exception as _e:
                 logger.warning(f"Vérification immédiate AssemblyAI échouée pour {meeting_id}: {_e}")
         
         # Appliquer les noms personnalisés des speakers à la transcription si elle est complétée
-        if meeting.get("transcript_status") == "completed" and meeting.get("transcript_id"):
+        if include_transcript and meeting.get("transcript_status") == "completed" and meeting.get("transcript_id"):
             try:
                 from ..services.transcription_checker import get_assemblyai_transcript_details, format_transcript_text
                 
@@ -248,16 +272,18 @@ async def get_meeting_details(
                 and (meeting.get("summary_status") in (None, "not_generated", "error") )
             )
             if should_start_summary:
-                from ..services.mistral_summary import process_meeting_summary_async
-                logger.info(f"Déclenchement automatique du résumé pour {meeting_id}")
-                # Marquer en processing et lancer en arrière-plan
-                await update_meeting_async(meeting_id, current_user["id"], {"summary_status": "processing"})
-                asyncio.create_task(process_meeting_summary_async(meeting_id, current_user["id"]))
-                # Rafraîchir l'objet meeting pour refléter le nouveau statut
-                meeting = await get_meeting_async(meeting_id, current_user["id"]) 
+                from ..services.summary_worker import enqueue_summary, AUTO_SUMMARY_STATUSES
+                # Prise atomique du statut: parmi des consultations concurrentes, une seule ajoute la tâche
+                job = await enqueue_summary(meeting_id, current_user["id"], only_if_statuses=AUTO_SUMMARY_STATUSES)
+                if job:
+                    logger.info(f"Déclenchement automatique du résumé pour {meeting_id}")
+                    meeting["summary_status"] = "processing"
         except Exception as e:
             logger.warning(f"Échec du déclenchement auto du résumé pour {meeting_id}: {e}")
         
+        if not include_transcript:
+            meeting.pop("transcript_text", None)
+        
         # Ajouter des informations supplémentaires pour faciliter le débogage côté frontend
         meeting["status"] = "success"
         meeting["success"] = True
@@ -292,7 +318,7 @@ async def delete_simple_meeting(
         logger.info(f"Tentative de suppression de la réunion {meeting_id} par l'utilisateur {current_user['id']}")
         
         # Récupérer la réunion pour vérifier qu'elle existe et appartient à l'utilisateur
-        meeting = await get_meeting_async(meeting_id, current_user["id"]) 
+        meeting = await get_meeting_async(meeting_id, current_user["id"], include_content=False) 
         
         if not meeting:
             logger.warning(f"Réunion {meeting_id} non trouvée pour l'utilisateur {current_user['id']}")
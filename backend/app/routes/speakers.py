@@ -2,18 +2,72 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Body
 from fastapi.logger import logger
 from ..core.security import get_current_user
 from ..models.user import User
-from ..models.speaker import Speaker, SpeakerCreate, SpeakersList
-from ..db.queries import (
-    get_meeting, get_meeting_speakers, set_meeting_speaker,
-    delete_meeting_speaker, get_custom_speaker_name
-)
-from ..services.transcription_checker import get_assemblyai_transcript_details, format_transcript_text
+from ..models.speaker import Speaker, SpeakerCreate, SpeakersList, SpeakersUpdate, SpeakersUpdateResult
+from ..db.postgres_meetings import get_meeting_async, get_meeting_speakers_async, update_meeting_speakers_async
+from ..services.summary_speakers import propagate_speaker_names_async
 from typing import List, Dict, Any, Optional
 import uuid
-from datetime import datetime
 
 router = APIRouter(prefix="/meetings/{meeting_id}/speakers", tags=["Locuteurs"])
 
+# Longueurs des colonnes meeting_speakers.speaker_id et custom_name
+_MAX_SPEAKER_ID_LENGTH = 50
+_MAX_CUSTOM_NAME_LENGTH = 255
+
+
+def _speaker_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    speaker = dict(row)
+    speaker["id"] = str(speaker["id"])
+    speaker["meeting_id"] = str(speaker["meeting_id"])
+    if speaker.get("created_at"):
+        speaker["created_at"] = speaker["created_at"].isoformat()
+    return speaker
+
+
+def _validate_speaker_names(names: Dict[str, Optional[str]]):
+    for speaker_id, custom_name in names.items():
+        if not speaker_id or len(speaker_id) > _MAX_SPEAKER_ID_LENGTH or len(custom_name or "") > _MAX_CUSTOM_NAME_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": f"Identifiant ou nom de locuteur invalide: {speaker_id!r}",
+                    "type": "INVALID_SPEAKER_NAME"
+                }
+            )
+
+
+async def _apply_speaker_names(meeting_id: str, user_id: str, names: Dict[str, Optional[str]], replace: bool = False) -> Dict[str, Any]:
+    """
+    Enregistre les noms (une transaction, une seule régénération de la transcription),
+    puis les reporte dans le compte rendu existant.
+    """
+    _validate_speaker_names(names)
+    try:
+        uuid.UUID(meeting_id)
+    except ValueError:
+        result = None
+    else:
+        result = await update_meeting_speakers_async(meeting_id, user_id, names, replace=replace)
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"message": "Réunion non trouvée", "type": "NOT_FOUND"}
+        )
+    if names or replace:
+        result["summary_outcome"] = await _propagate_to_summary(meeting_id, user_id, result["previous_names"])
+    return result
+
+
+async def _propagate_to_summary(meeting_id: str, user_id: str, previous_names: Dict[str, str]) -> Optional[str]:
+    """Reporte les noms des locuteurs dans le compte rendu existant (sans faire échouer la requête)."""
+    try:
+        outcome = await propagate_speaker_names_async(meeting_id, user_id, previous_names)
+        logger.info(f"Compte rendu de la réunion {meeting_id} après modification des locuteurs: {outcome}")
+        return outcome
+    except Exception as e:
+        logger.error(f"Erreur lors du report des noms de locuteurs dans le compte rendu: {str(e)}")
+        return None
+
 @router.get("", response_model=SpeakersList)
 async def list_meeting_speakers(
     meeting_id: str = Path(..., description="ID unique de la réunion"),
@@ -26,23 +80,15 @@ async def list_meeting_speakers(
     
     Retourne la liste des mappages entre identifiants de locuteurs et noms personnalisés.
     """
-    # Vérifier que la réunion existe et appartient à l'utilisateur courant
-    meeting = get_meeting(meeting_id, current_user["id"])
-    if not meeting:
+    # Réunion et noms en une seule requête (None si la réunion n'appartient pas à l'utilisateur)
+    speakers = await get_meeting_speakers_async(meeting_id, current_user["id"])
+    if speakers is None:
         raise HTTPException(
             status_code=404,
             detail={"message": "Réunion non trouvée", "type": "NOT_FOUND"}
         )
     
-    # Récupérer les noms personnalisés des locuteurs
-    speakers = get_meeting_speakers(meeting_id, current_user["id"])
-    if speakers is None:  # Erreur lors de la récupération
-        raise HTTPException(
-            status_code=500,
-            detail={"message": "Erreur lors de la récupération des locuteurs", "type": "SERVER_ERROR"}
-        )
-    
-    return SpeakersList(speakers=speakers)
+    return SpeakersList(speakers=[_speaker_from_row(s) for s in speakers])
 
 
 @router.post("", response_model=Speaker)
@@ -60,77 +106,41 @@ async def create_or_update_speaker(
     Si un nom existe déjà pour ce locuteur dans cette réunion, il est mis à jour.
     Sinon, un nouveau mapping est créé.
     """
-    # Vérifier que la réunion existe et appartient à l'utilisateur courant
-    meeting = get_meeting(meeting_id, current_user["id"])
-    if not meeting:
+    if not speaker_data.custom_name:
         raise HTTPException(
-            status_code=404,
-            detail={"message": "Réunion non trouvée", "type": "NOT_FOUND"}
+            status_code=400,
+            detail={"message": "Le nom personnalisé ne peut pas être vide", "type": "INVALID_SPEAKER_NAME"}
         )
     
-    # Créer ou mettre à jour le nom personnalisé
-    success = set_meeting_speaker(
-        meeting_id, current_user["id"],
-        speaker_data.speaker_id, speaker_data.custom_name
+    result = await _apply_speaker_names(
+        meeting_id, current_user["id"], {speaker_data.speaker_id: speaker_data.custom_name}
     )
+    return next(
+        _speaker_from_row(speaker) for speaker in result["speakers"]
+        if speaker["speaker_id"] == speaker_data.speaker_id
+    )
+
+
+@router.put("", response_model=SpeakersUpdateResult)
+async def replace_speakers(
+    speakers_update: SpeakersUpdate = Body(...),
+    meeting_id: str = Path(..., description="ID unique de la réunion"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Remplace l'ensemble des noms personnalisés des locuteurs d'une réunion.
     
-    if not success:
-        raise HTTPException(
-            status_code=500,
-            detail={"message": "Erreur lors de la création/mise à jour du nom personnalisé", "type": "SERVER_ERROR"}
-        )
-    
-    # Récupérer les données mises à jour
-    speakers = get_meeting_speakers(meeting_id, current_user["id"])
-    if not speakers:
-        raise HTTPException(
-            status_code=500,
-            detail={"message": "Erreur lors de la récupération du locuteur mis à jour", "type": "SERVER_ERROR"}
-        )
-    
-    # Trouver le locuteur nouvellement créé/mis à jour
-    created_speaker = None
-    for speaker in speakers:
-        if speaker["speaker_id"] == speaker_data.speaker_id:
-            created_speaker = speaker
-            break
+    - **speakers**: {identifiant: nom}; les locuteurs absents ou sans nom reprennent leur libellé par défaut
     
-    if not created_speaker:
-        # Fallback au cas où le locuteur n'est pas retrouvé (ne devrait pas arriver)
-        raise HTTPException(
-            status_code=500,
-            detail={"message": "Erreur lors de la création du locuteur", "type": "SERVER_ERROR"}
-        )
-        
-    # Mettre à jour automatiquement la transcription avec le nouveau nom de locuteur
-    try:
-        # Vérifier que la transcription est terminée
-        if meeting.get("transcript_status") == "completed" and meeting.get("transcript_id"):
-            transcript_id = meeting.get("transcript_id")
-            transcript_data = get_assemblyai_transcript_details(transcript_id)
-            
-            if transcript_data:
-                # Récupérer tous les noms personnalisés des locuteurs
-                speaker_names = {s["speaker_id"]: s["custom_name"] for s in speakers if s.get("custom_name")}
-                
-                # Formater la transcription avec les noms personnalisés
-                updated_transcript = format_transcript_text(transcript_data, speaker_names)
-                
-                # Mettre à jour le texte de transcription dans la base de données
-                from ..db.queries import update_meeting
-                logger.info(f"Mise à jour automatique de la transcription après renommage de {speaker_data.speaker_id} en {speaker_data.custom_name}")
-                
-                update_result = update_meeting(meeting_id, current_user["id"], {
-                    "transcript_text": updated_transcript,
-                    "updated_at": datetime.utcnow().isoformat()  # Force une mise à jour du timestamp
-                })
-                
-                logger.info(f"Transcription mise à jour automatiquement: {update_result}")
-    except Exception as e:
-        # Log l'erreur mais ne pas faire échouer la création du speaker
-        logger.error(f"Erreur lors de la mise à jour automatique de la transcription: {str(e)}")
-    
-    return created_speaker
+    Les noms sont appliqués dans une seule transaction, la transcription est régénérée
+    une seule fois et le compte rendu existant est mis à jour en une passe.
+    """
+    result = await _apply_speaker_names(meeting_id, current_user["id"], speakers_update.speakers, replace=True)
+    return SpeakersUpdateResult(
+        speakers=[_speaker_from_row(s) for s in result["speakers"]],
+        transcript_version=result["transcript_version"],
+        summary_outcome=result.get("summary_outcome"),
+    )
 
 
 @router.delete("/{speaker_id}", response_model=dict)
@@ -147,22 +157,8 @@ async def delete_speaker(
     
     Retourne un statut de succès ou d'échec.
     """
-    # Vérifier que la réunion existe et appartient à l'utilisateur courant
-    meeting = get_meeting(meeting_id, current_user["id"])
-    if not meeting:
-        raise HTTPException(
-            status_code=404,
-            detail={"message": "Réunion non trouvée", "type": "NOT_FOUND"}
-        )
-    
-    # Supprimer le nom personnalisé
-    success = delete_meeting_speaker(meeting_id, current_user["id"], speaker_id)
-    
-    if not success:
-        raise HTTPException(
-            status_code=500,
-            detail={"message": "Erreur lors de la suppression du nom personnalisé", "type": "SERVER_ERROR"}
-        )
+    # Le locuteur reprend son libellé par défaut dans la transcription et le compte rendu
+    await _apply_speaker_names(meeting_id, current_user["id"], {speaker_id: None})
     
     return {"success": True, "message": "Nom personnalisé supprimé avec succès"}
 
@@ -180,7 +176,7 @@ async def get_updated_transcript(
     Retourne la transcription mise à jour avec les noms personnalisés.
     """
     # Vérifier que la réunion existe et appartient à l'utilisateur courant
-    meeting = get_meeting(meeting_id, current_user["id"])
+    meeting = await get_meeting_async(meeting_id, current_user["id"], include_content=False)
     if not meeting:
         raise HTTPException(
             status_code=404,
@@ -198,53 +194,14 @@ async def get_updated_transcript(
             }
         )
     
-    # Récupérer l'ID de la transcription
-    transcript_id = meeting.get("transcript_id")
-    if not transcript_id:
-        raise HTTPException(
-            status_code=400,
-            detail={"message": "Pas d'ID de transcription disponible", "type": "MISSING_DATA"}
-        )
-    
-    # Récupérer les détails de la transcription
-    transcript_data = get_assemblyai_transcript_details(transcript_id)
-    if not transcript_data:
-        raise HTTPException(
-            status_code=500,
-            detail={"message": "Impossible de récupérer les détails de la transcription", "type": "API_ERROR"}
-        )
-    
-    # Récupérer les noms personnalisés des locuteurs
-    speakers_data = get_meeting_speakers(meeting_id, current_user["id"])
-    speaker_names = {}
-    
-    if speakers_data:
-        for speaker in speakers_data:
-            speaker_names[speaker["speaker_id"]] = speaker["custom_name"]
-    
-    # Formater la transcription avec les noms personnalisés
-    updated_transcript = format_transcript_text(transcript_data, speaker_names)
-    
-    # Mettre à jour le texte de transcription dans la base de données
-    from ..db.queries import update_meeting
-    logger.info(f"Mise à jour de la transcription pour {meeting_id} avec {len(speaker_names)} noms personnalisés")
-    for speaker_id, name in speaker_names.items():
-        logger.info(f"Remplacement du locuteur {speaker_id} par {name}")
-        
-    update_result = update_meeting(meeting_id, current_user["id"], {
-        "transcript_text": updated_transcript,
-        "updated_at": datetime.utcnow().isoformat()  # Force une mise à jour du timestamp
-    })
-    
-    # Vérification que la mise à jour a bien été prise en compte
-    updated_meeting = get_meeting(meeting_id, current_user["id"])
-    if updated_meeting and updated_meeting.get("transcript_text") == updated_transcript:
-        logger.info("Vérification OK: La transcription a été correctement mise à jour")
-    else:
-        logger.warning("ATTENTION: La transcription ne semble pas avoir été mise à jour correctement")
+    # Régénérer la transcription à partir des utterances et des noms personnalisés actuels
+    result = await _apply_speaker_names(meeting_id, current_user["id"], {})
+    logger.info(f"Transcription de {meeting_id} régénérée avec {len(result['speakers'])} noms personnalisés")
     
+    updated_meeting = await get_meeting_async(meeting_id, current_user["id"])
     return {
         "success": True,
         "message": "Transcription mise à jour avec les noms personnalisés",
-        "transcript_text": updated_transcript
+        "transcript_text": updated_meeting.get("transcript_text") if updated_meeting else None,
+        "transcript_version": result["transcript_version"]
     }
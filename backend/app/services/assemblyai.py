@@ -12,7 +12,8 @@ import subprocess
 import threading
 
 from ..core.config import settings
-from ..db.postgres_meetings import update_meeting, get_meeting, get_meeting_speakers, normalize_transcript_format
+from ..db.postgres_meetings import update_meeting, get_meeting
+from .transcript_completion import complete_transcript, complete_transcript_async
 
 # Configuration pour AssemblyAI
 # Lire la clé via les settings (env)
@@ -363,113 +364,31 @@ def process_completed_transcript(meeting_id, user_id, transcript):
     """
     Traite une transcription terminée et met à jour la base de données.
     
+    Délègue à l'étape unique de finalisation (verrou sur la réunion, écriture unique,
+    résumé lancé une seule fois).
+    
     Args:
         meeting_id: ID de la réunion
         user_id: ID de l'utilisateur
         transcript: Objet Transcript du SDK AssemblyAI
     """
     try:
-        # Extraction des données importantes
-        audio_duration = transcript.audio_duration or 0
-        logger.info(f"Durée audio: {audio_duration} secondes")
-        
-        # Récupérer les noms personnalisés des locuteurs s'ils existent
-        speaker_names = {}
-        try:
-            speakers_data = get_meeting_speakers(meeting_id, user_id)
-            if speakers_data:
-                for speaker in speakers_data:
-                    speaker_names[speaker['speaker_id']] = speaker['custom_name']
-                logger.info(f"Noms personnalisés récupérés: {speaker_names}")
-        except Exception as e:
-            logger.warning(f"Impossible de récupérer les noms personnalisés: {str(e)}")
-            speaker_names = {}
-        
-        # Extraction et comptage des locuteurs
-        speaker_count = 0
-        unique_speakers = set()
-        utterances_data = []
-        formatted_text = transcript.text or ""
-        
-        # Traitement des utterances si disponibles
-        if hasattr(transcript, 'utterances') and transcript.utterances:
-            try:
-                utterances_text = []
-                for utterance in transcript.utterances:
-                    speaker = getattr(utterance, 'speaker', 'Unknown')
-                    text = getattr(utterance, 'text', '').strip()
-                    
-                    # SAFETY: Assurer qu'on a toujours un texte, même vide
-                    if text is None:
-                        text = ''
-                    
-                    if speaker:
-                        unique_speakers.add(speaker)
-                        
-                        # Utiliser le nom personnalisé s'il existe, sinon utiliser le format par défaut
-                        speaker_name = None
-                        
-                        # 1. Essayer d'abord avec l'ID simple (ex: "A", "B", "C", "D")
-                        if speaker in speaker_names:
-                            speaker_name = speaker_names[speaker]
-                            logger.debug(f"Found custom name for simple ID '{speaker}': {speaker_name}")
-                        
-                        # 2. Essayer avec le format "Speaker X" (ex: "Speaker A", "Speaker B")
-                        full_speaker_id = f"Speaker {speaker}"
-                        if speaker_name is None and full_speaker_id in speaker_names:
-                            speaker_name = speaker_names[full_speaker_id]
-                            logger.debug(f"Found custom name for full ID '{full_speaker_id}': {speaker_name}")
-                        
-                        # 3. Si aucun nom personnalisé trouvé, utiliser le format par défaut
-                        if speaker_name is None:
-                            speaker_name = full_speaker_id
-                            logger.debug(f"No custom name found for speaker '{speaker}', using default: {speaker_name}")
-                        
-                        # IMPORTANT: Toujours ajouter la ligne, même si le texte est vide
-                        utterance_formatted = f"{speaker_name}: {text}"
-                        utterances_text.append(utterance_formatted)
-                        utterances_data.append({"speaker": speaker, "text": text})
-                
-                if utterances_text:
-                    formatted_text = "\n".join(utterances_text)
-                    logger.info(f"Texte formaté avec {len(utterances_text)} segments de locuteurs")
-            except Exception as e:
-                logger.warning(f"Erreur lors du traitement des utterances: {str(e)}")
-        else:
-            logger.warning("Aucune utterance trouvée dans la transcription")
-        
-        # S'assurer qu'il y a au moins 1 locuteur
-        speaker_count = len(unique_speakers)
-        if speaker_count == 0:
-            speaker_count = 1
-            logger.warning("Aucun locuteur détecté, on force à 1")
-        
-        logger.info(f"Nombre de locuteurs détectés: {speaker_count}")
-        
-        # Normaliser le format du texte avant l'update
-        formatted_text = normalize_transcript_format(formatted_text)
-        
-        # Mise à jour de la base de données
-        update_data = {
-            "transcript_text": formatted_text,
-            "transcript_status": "completed",
-            "duration_seconds": int(audio_duration),
-            "speakers_count": speaker_count
+        transcript_data = {
+            "id": getattr(transcript, 'id', None),
+            "status": "completed",
+            "text": transcript.text or "",
+            "audio_duration": transcript.audio_duration or 0,
+            "utterances": [
+                {
+                    "speaker": getattr(utterance, 'speaker', None),
+                    "text": (getattr(utterance, 'text', '') or '').strip(),
+                    "start": getattr(utterance, 'start', None),
+                    "end": getattr(utterance, 'end', None),
+                }
+                for utterance in (getattr(transcript, 'utterances', None) or [])
+            ],
         }
-        
-        logger.info(f"Mise à jour de la base de données pour {meeting_id}")
-        update_meeting(meeting_id, user_id, update_data)
-        logger.info(f"Transcription terminée avec succès pour {meeting_id}")
-        
-        # Lancer la génération du résumé automatiquement en mode asynchrone
-        try:
-            from .mistral_summary import process_meeting_summary
-            logger.info(f"Lancement de la génération du résumé pour la réunion {meeting_id}")
-            # Utiliser le mode asynchrone pour éviter les problèmes de threads sur Render
-            process_meeting_summary(meeting_id, user_id, async_mode=True)
-            logger.info(f"Génération du résumé lancée en mode asynchrone pour la réunion {meeting_id}")
-        except Exception as summary_error:
-            logger.error(f"Erreur lors du lancement de la génération du résumé: {str(summary_error)}")
+        complete_transcript(meeting_id, user_id, transcript_data["id"], transcript_data)
     except Exception as e:
         logger.error(f"Erreur lors du traitement de la transcription terminée: {str(e)}")
         logger.error(traceback.format_exc())
@@ -505,15 +424,14 @@ async def process_pending_transcriptions():
     
     Cette fonction utilise l'API REST d'AssemblyAI pour être plus fiable.
     """
+    import asyncio
     import requests
     from ..db.postgres_meetings import (
         get_pending_transcriptions_async,
-        get_meetings_by_status_async,
-        get_meeting_async,
-        update_meeting_async,
-        get_meeting_speakers_async,
+        claim_meetings_async,
+        default_lease_owner,
     )
-    from ..core.config import settings
+    from .transcription_checker import get_assemblyai_transcript_details
     
     # Utiliser directement la clé API AssemblyAI définie en haut du fichier
     api_key = ASSEMBLY_AI_API_KEY
@@ -531,8 +449,13 @@ async def process_pending_transcriptions():
     pending_meetings = await get_pending_transcriptions_async()
     logger.info(f"Transcriptions en attente: {len(pending_meetings)}")
     
-    # Récupérer également les transcriptions bloquées en état 'processing'
-    processing_meetings = await get_meetings_by_status_async('processing')
+    # Récupérer également les transcriptions bloquées en état 'processing' (sous bail: une seule
+    # vérification par réunion même si plusieurs workers exécutent cette fonction)
+    lease_owner = default_lease_owner("pending-transcriptions")
+    processing_meetings = await claim_meetings_async(
+        lease_owner, ("processing",), settings.TRANSCRIPT_POLL_LEASE_SECONDS,
+        include_content=True,  # ID AssemblyAI des anciennes réunions, noté dans transcript_text
+    )
     logger.info(f"Transcriptions bloquées en état 'processing': {len(processing_meetings)}")
     
     # Fusionner les deux listes
@@ -561,238 +484,53 @@ async def process_pending_transcriptions():
     # Traiter chaque transcription
     for meeting in all_meetings_to_process:
         try:
-            meeting_id = meeting['id']
-            user_id = meeting['user_id']
+            meeting_id = str(meeting['id'])
+            user_id = str(meeting['user_id'])
             file_url = meeting.get('file_url', '')
             file_name = os.path.basename(file_url) if file_url else ''
             
-            # Vérifier si la réunion est en état 'processing'
-            if meeting['transcript_status'] == 'processing':
-                logger.info(f"Vérification de la réunion {meeting_id} en état 'processing'")
-                
-                # Essayer d'extraire l'ID de transcription AssemblyAI du texte
-                transcript_id = None
-                transcript_text = meeting.get('transcript_text', '')
-                
-                if transcript_text and 'ID:' in transcript_text:
-                    try:
-                        # Extraire l'ID de transcription du texte (format: 'Transcription en cours, ID: xyz')
-                        transcript_id = transcript_text.split('ID:')[-1].strip()
-                        logger.info(f"ID de transcription AssemblyAI extrait: {transcript_id}")
-                        
-                        # Vérifier le statut de la transcription via l'API REST
-                        url = f"https://api.assemblyai.com/v2/transcript/{transcript_id}"
-                        response = requests.get(url, headers=headers)
-                        
-                        if response.status_code == 200:
-                            transcript_data = response.json()
-                            status = transcript_data.get('status')
-                            logger.info(f"Statut de la transcription {transcript_id}: {status}")
-                            
-                            if status == 'completed':
-                                # Créer un objet compatible avec process_completed_transcript
-                                class TranscriptObject:
-                                    def __init__(self, data):
-                                        self.id = data.get('id')
-                                        self.status = data.get('status')
-                                        self.text = data.get('text')
-                                        self.audio_duration = data.get('audio_duration')
-                                        self.utterances = []
-                                        
-                                        # Traiter les utterances si disponibles
-                                        utterances_data = data.get('utterances', [])
-                                        if utterances_data and isinstance(utterances_data, list):
-                                            for utterance in utterances_data:
-                                                self.utterances.append(UtteranceObject(utterance))
-                                
-                                class UtteranceObject:
-                                    def __init__(self, data):
-                                        self.speaker = data.get('speaker')
-                                        self.text = data.get('text')
-                                
-                                # Créer l'objet transcript
-                                transcript = TranscriptObject(transcript_data)
-                                
-                                # Traiter la transcription terminée
-                                logger.info(f"Transcription {transcript_id} terminée, mise à jour de la base de données")
-                                process_completed_transcript(meeting_id, user_id, transcript)
-                                continue
-                            elif status == 'error':
-                                # Gérer l'erreur
-                                error_message = transcript_data.get('error', 'Unknown error')
-                                logger.error(f"Erreur de transcription pour {meeting_id}: {error_message}")
-                                update_meeting(meeting_id, user_id, {
-                                    "transcript_status": "error",
-                                    "transcript_text": f"Erreur lors de la transcription: {error_message}"
-                                })
-                                continue
-                            else:
-                                # Toujours en cours, ne rien faire
-                                logger.info(f"Transcription {transcript_id} toujours en cours ({status})")
-                                continue
-                        else:
-                            logger.error(f"Erreur lors de la vérification de la transcription {transcript_id}: {response.status_code} - {response.text}")
-                    except Exception as e:
-                        logger.error(f"Erreur lors de la vérification de la transcription {transcript_id}: {str(e)}")
-                        # Continuer avec la recherche dans les transcriptions récentes
-                
-                # Si on n'a pas pu extraire l'ID ou vérifier le statut, essayer de trouver la transcription par le nom de fichier
-                if file_name:
-                    logger.info(f"Recherche de transcription pour le fichier: {file_name}")
-                    
-                    for transcript in recent_transcripts:
-                        if transcript.get('status') == 'completed':
-                            # Récupérer les détails complets de la transcription
-                            transcript_id = transcript.get('id')
-                            url = f"https://api.assemblyai.com/v2/transcript/{transcript_id}"
-                            response = requests.get(url, headers=headers)
-                            
-                            if response.status_code == 200:
-                                transcript_data = response.json()
-                                audio_url = transcript_data.get('audio_url', '')
-                                audio_filename = os.path.basename(audio_url) if audio_url else ''
-                                
-                                # Si le nom de fichier correspond
-                                if file_name in audio_filename or audio_filename in file_name:
-                                    logger.info(f"Transcription trouvée pour {file_name}: {transcript_id}")
-                                    
-                                    # Créer un objet compatible avec process_completed_transcript
-                                    class TranscriptObject:
-                                        def __init__(self, data):
-                                            self.id = data.get('id')
-                                            self.status = data.get('status')
-                                            self.text = data.get('text')
-                                            self.audio_duration = data.get('audio_duration')
-                                            self.utterances = []
-                                            
-                                            # Traiter les utterances si disponibles
-                                            utterances_data = data.get('utterances', [])
-                                            if utterances_data and isinstance(utterances_data, list):
-                                                for utterance in utterances_data:
-                                                    self.utterances.append(UtteranceObject(utterance))
-                                    
-                                    class UtteranceObject:
-                                        def __init__(self, data):
-                                            self.speaker = data.get('speaker')
-                                            self.text = data.get('text')
-                                    
-                                    # Créer l'objet transcript
-                                    transcript = TranscriptObject(transcript_data)
-                                    
-                                    # Traiter la transcription terminée
-                                    logger.info(f"Transcription {transcript_id} terminée, mise à jour de la base de données")
-                                    process_completed_transcript(meeting_id, user_id, transcript)
-                                    break
-                    else:
-                        logger.warning(f"Aucune transcription trouvée pour le fichier {file_name}")
-            
-            # Si on arrive ici et que la réunion est toujours en état 'processing',
-            # vérifier directement auprès d'AssemblyAI si la transcription est terminée
-            meeting = await get_meeting_async(meeting_id, user_id)  # Récupérer l'état actuel
-            if meeting and meeting.get('transcript_status') == 'processing' and meeting.get('transcript_id'):
-                transcript_id = meeting.get('transcript_id')
-                logger.info(f"Vérification du statut de la transcription {transcript_id} pour la réunion {meeting_id}")
-                
-                # Vérifier le statut auprès d'AssemblyAI
-                try:
-                    response = requests.get(
-                        f"https://api.assemblyai.com/v2/transcript/{transcript_id}",
-                        headers=headers
-                    )
-                    
-                    if response.status_code == 200:
-                        transcript_data = response.json()
-                        status = transcript_data.get('status')
-                        logger.info(f"Statut de la transcription {transcript_id}: {status}")
-                        
-                        if status == 'completed':
-                            # Préparer les données de mise à jour
-                            transcript_text = transcript_data.get('text', '')
-                            audio_duration = transcript_data.get('audio_duration', 0)
-                            
-                            # Essayer de formater avec les locuteurs si disponibles
-                            if 'utterances' in transcript_data and transcript_data['utterances']:
-                                try:
-                                    # Récupérer les noms personnalisés des locuteurs s'ils existent
-                                    speaker_names = {}
-                                    try:
-                                        speakers_data = await get_meeting_speakers_async(meeting_id, user_id)
-                                        if speakers_data:
-                                            for speaker in speakers_data:
-                                                speaker_names[speaker['speaker_id']] = speaker['custom_name']
-                                    except Exception as e:
-                                        logger.warning(f"Impossible de récupérer les noms personnalisés: {str(e)}")
-                                        speaker_names = {}
-                                    
-                                    formatted_text = []
-                                    speakers_set = set()
-                                    for utterance in transcript_data.get('utterances', []):
-                                        speaker = utterance.get('speaker', 'Unknown')
-                                        speakers_set.add(speaker)
-                                        text = utterance.get('text', '')
-                                        
-                                        # SAFETY: Assurer qu'on a toujours un texte, même vide
-                                        if text is None:
-                                            text = ''
-                                        
-                                        # Utiliser le nom personnalisé s'il existe, sinon utiliser le format par défaut
-                                        speaker_name = None
-                                        
-                                        # 1. Essayer d'abord avec l'ID simple (ex: "A", "B", "C", "D")
-                                        if speaker in speaker_names:
-                                            speaker_name = speaker_names[speaker]
-                                            logger.debug(f"Found custom name for simple ID '{speaker}': {speaker_name}")
-                                        
-                                        # 2. Essayer avec le format "Speaker X" (ex: "Speaker A", "Speaker B")
-                                        full_speaker_id = f"Speaker {speaker}"
-                                        if speaker_name is None and full_speaker_id in speaker_names:
-                                            speaker_name = speaker_names[full_speaker_id]
-                                            logger.debug(f"Found custom name for full ID '{full_speaker_id}': {speaker_name}")
-                                        
-                                        # 3. Si aucun nom personnalisé trouvé, utiliser le format par défaut
-                                        if speaker_name is None:
-                                            speaker_name = full_speaker_id
-                                            logger.debug(f"No custom name found for speaker '{speaker}', using default: {speaker_name}")
-                                        
-                                        # IMPORTANT: Toujours ajouter la ligne, même si le texte est vide
-                                        formatted_text.append(f"{speaker_name}: {text}")
-                                    
-                                    transcript_text = "\n".join(formatted_text)
-                                    speakers_count = len(speakers_set) if speakers_set else 1
-                                except Exception as e:
-                                    logger.error(f"Erreur lors du formatage du texte: {str(e)}")
-                                    speakers_count = 1
-                            else:
-                                speakers_count = 1
-                            
-                            # Mettre à jour la base de données
-                            update_data = {
-                                "transcript_text": transcript_text,
-                                "transcript_status": "completed",
-                                "duration_seconds": int(audio_duration) if audio_duration else 0,
-                                "speakers_count": speakers_count
-                            }
-                            
-                            await update_meeting_async(meeting_id, user_id, update_data)
-                            logger.info(f"Réunion {meeting_id} mise à jour avec succès (statut: completed)")
-                        elif status == 'error':
-                            # Mettre à jour la base de données en cas d'erreur
-                            error_message = transcript_data.get('error', 'Unknown error')
-                            update_data = {
-                                "transcript_status": "error",
-                                "transcript_text": f"Erreur lors de la transcription: {error_message}"
-                            }
-                            
-                            await update_meeting_async(meeting_id, user_id, update_data)
-                            logger.info(f"Réunion {meeting_id} mise à jour avec succès (statut: error)")
-                        else:
-                            logger.info(f"Réunion {meeting_id} toujours en cours de traitement (statut: {status})")
-                except Exception as e:
-                    logger.error(f"Erreur lors de la vérification du statut de la transcription {transcript_id}: {str(e)}")
-            elif meeting and meeting.get('transcript_status') == 'pending':
+            if meeting['transcript_status'] != 'processing':
                 logger.info(f"Réunion {meeting_id} toujours en attente")
                 # Ne pas relancer automatiquement la transcription
                 # Juste logger l'information pour le suivi
+                continue
+            
+            logger.info(f"Vérification de la réunion {meeting_id} en état 'processing'")
+            transcript_id = meeting.get('transcript_id')
+            transcript_text = meeting.get('transcript_text') or ''
+            if not transcript_id and 'ID:' in transcript_text:
+                # Anciennes réunions: l'ID n'est présent que dans le texte (format: 'Transcription en cours, ID: xyz')
+                transcript_id = transcript_text.split('ID:')[-1].strip()
+                logger.info(f"ID de transcription AssemblyAI extrait: {transcript_id}")
+            
+            if transcript_id:
+                result = await complete_transcript_async(meeting_id, user_id, transcript_id, lease_owner=lease_owner)
+                if result:
+                    logger.info(f"Réunion {meeting_id}: statut AssemblyAI {result['status']}")
+                else:
+                    logger.info(f"Réunion {meeting_id} déjà finalisée ou traitée par un autre worker")
+                continue
+            
+            # Sans ID, essayer de trouver la transcription par le nom de fichier
+            if file_name:
+                logger.info(f"Recherche de transcription pour le fichier: {file_name}")
+                
+                for transcript in recent_transcripts:
+                    if transcript.get('status') != 'completed':
+                        continue
+                    transcript_data = await asyncio.to_thread(get_assemblyai_transcript_details, transcript.get('id'))
+                    if not transcript_data:
+                        continue
+                    audio_url = transcript_data.get('audio_url', '')
+                    audio_filename = os.path.basename(audio_url) if audio_url else ''
+                    
+                    # Si le nom de fichier correspond
+                    if file_name in audio_filename or audio_filename in file_name:
+                        logger.info(f"Transcription trouvée pour {file_name}: {transcript_data.get('id')}")
+                        await complete_transcript_async(meeting_id, user_id, transcript_data.get('id'), transcript_data)
+                        break
+                else:
+                    logger.warning(f"Aucune transcription trouvée pour le fichier {file_name}")
         except Exception as e:
             logger.error(f"Erreur lors du traitement de la transcription pour {meeting.get('id', 'unknown')}: {str(e)}")
             import traceback
@@ -0,0 +1,131 @@
+"""
+Vectorisation de textes pour la recherche sémantique.
+
+Le vectoriseur est choisi par SEMANTIC_EMBEDDER:
+
+- "hashing" (défaut): mots et n-grammes de caractères hachés dans SEMANTIC_HASHING_DIM
+  dimensions. Sans modèle ni dépendance supplémentaire; rapproche les variantes d'un
+  même mot (budget, budgets, budgétaire) mais pas les paraphrases.
+- "sentence-transformers:<modèle>": modèle local chargé par le paquet optionnel
+  sentence-transformers (non installé par défaut), qui rapproche aussi les paraphrases
+  ("budget" et "enveloppe financière").
+
+Les vecteurs renvoyés sont en float32 et de norme 1: leur produit scalaire est la
+similarité cosinus. `name` identifie le vectoriseur et ses paramètres; un index construit
+avec un autre vectoriseur est reconstruit.
+"""
+
+import logging
+import math
+import re
+import threading
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Sequence
+
+import numpy as np
+
+from ..core.config import settings
+
+logger = logging.getLogger("meeting-transcriber")
+
+_WORD = re.compile(r"\w+")
+
+# Mots outils et tics de l'oral, sans accents (voir _fold)
+_STOPWORDS = frozenset("""
+a ai alors au aux avec avoir ben bon c ca ce cela ces cet cette d dans de des donc du elle
+elles en est et etait etre euh eu hein il ils j je l la le les leur lui m ma mais me mes moi
+mon n ne nous on ont ou oui par pas pour qu que qui s sa se ses si son sont sur t ta te tes
+toi ton tu un une vos votre vous voila y
+""".split())
+
+
+def _fold(text: str) -> str:
+    """Minuscules sans accents."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class HashingEmbedder:
+    """Sac de mots et de n-grammes de caractères, haché avec signe (feature hashing)."""
+
+    def __init__(self, dim: int = 512, ngram: int = 4):
+        self.dim = dim
+        self.ngram = ngram
+        self.name = f"hashing-{dim}-{ngram}"
+
+    def _features(self, text: str) -> Counter:
+        features: Counter = Counter()
+        for word in _WORD.findall(_fold(text)):
+            if word in _STOPWORDS or word.isdigit():
+                continue
+            features[f"w:{word}"] += 1
+            # Les n-grammes rapprochent les formes fléchies et dérivées d'un même mot
+            padded = f"<{word}>"
+            for start in range(max(1, len(padded) - self.ngram + 1)):
+                features[padded[start:start + self.ngram]] += 1
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text or "")
+            if not features:
+                continue
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+            # Fréquences amorties; un n-gramme pèse moitié moins qu'un mot entier
+            weights = np.fromiter(
+                ((1 + math.log(count)) * (1.0 if feature.startswith("w:") else 0.5) for feature, count in features.items()),
+                dtype=np.float32, count=len(features),
+            )
+            signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], hashes % self.dim, signs * weights)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """Modèle local sentence-transformers (paquet optionnel), exécuté sur CPU."""
+
+    def __init__(self, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "SEMANTIC_EMBEDDER utilise sentence-transformers, qui n'est pas installé "
+                "(pip install sentence-transformers)"
+            ) from e
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """
+    Vectoriseur configuré (chargé une fois par processus).
+
+    Raises:
+        RuntimeError: vectoriseur inconnu ou dépendance manquante
+    """
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            kind, _, model_name = settings.SEMANTIC_EMBEDDER.partition(":")
+            if kind == "hashing":
+                _embedder = HashingEmbedder(settings.SEMANTIC_HASHING_DIM)
+            elif kind == "sentence-transformers" and model_name:
+                logger.info(f"Chargement du modèle de vectorisation {model_name}")
+                _embedder = SentenceTransformerEmbedder(model_name)
+            else:
+                raise RuntimeError(f"SEMANTIC_EMBEDDER inconnu: {settings.SEMANTIC_EMBEDDER}")
+        return _embedder
@@ -0,0 +1,98 @@
+"""
+Client HTTP asynchrone pour l'API de chat Mistral.
+
+Un `httpx.AsyncClient` est conservé par boucle d'événements afin de réutiliser les
+connexions (keep-alive) entre les générations de comptes rendus. Le mode streaming
+de l'API (`"stream": true`) renvoie des événements SSE `data: {...}` dont on extrait
+les fragments `choices[0].delta.content`.
+"""
+
+import asyncio
+import json
+import logging
+import weakref
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from ..core.config import settings
+
+logger = logging.getLogger("meeting-transcriber")
+
+
+class LLMError(Exception):
+    """Erreur renvoyée par le fournisseur LLM (statut HTTP non 200 ou réponse invalide)."""
+
+
+class LLMClient:
+    """Client de chat Mistral avec pool de connexions."""
+
+    def __init__(self, api_url: str, api_key: str, timeout: float, max_connections: int = 20):
+        self.api_url = api_url
+        self.api_key = api_key
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=10.0),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    def _headers(self, stream: bool) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream" if stream else "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+
+    async def complete(self, payload: Dict[str, Any]) -> str:
+        """Génère une réponse complète (sans streaming)."""
+        response = await self._client.post(self.api_url, headers=self._headers(False), json={**payload, "stream": False})
+        if response.status_code != 200:
+            raise LLMError(f"{response.status_code} - {response.text}")
+        data = response.json()
+        return data.get("choices", [{}])[0].get("message", {}).get("content", "") or ""
+
+    async def stream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """Génère la réponse en streaming et produit les fragments de texte au fil de l'eau."""
+        async with self._client.stream(
+            "POST", self.api_url, headers=self._headers(True), json={**payload, "stream": True}
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise LLMError(f"{response.status_code} - {body.decode(errors='replace')}")
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError:
+                    logger.warning(f"Fragment SSE invalide ignoré: {data[:200]}")
+                    continue
+                delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# Un client par boucle d'événements: un AsyncClient ne peut pas être partagé entre boucles
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMClient]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_client() -> LLMClient:
+    """Retourne le client partagé de la boucle d'événements courante."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = LLMClient(settings.MISTRAL_API_URL, settings.MISTRAL_API_KEY, settings.MISTRAL_TIMEOUT)
+        _clients[loop] = client
+    return client
+
+
+async def close_llm_client() -> None:
+    """Ferme le client de la boucle courante (arrêt de l'application)."""
+    client: Optional[LLMClient] = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,180 @@
+"""
+Serveur de substitution local pour l'API de chat Mistral (format /v1/chat/completions).
+
+Permet de tester la chaîne de génération des comptes rendus (charge, streaming, erreurs)
+sans crédit Mistral ni accès réseau: il suffit de faire pointer MISTRAL_API_URL vers
+`http://127.0.0.1:<LLM_STANDIN_PORT>/v1/chat/completions` (voir llm_standin_server.py).
+
+Comportement configurable (settings LLM_STANDIN_*):
+- latence avant le premier token et débit de génération (tokens/s), en streaming SSE ou non;
+- taux d'erreurs 500 injectées;
+- limitation de débit (requêtes/minute) et de concurrence, avec réponses 429 et Retry-After.
+
+GET /stats expose les compteurs (dont la concurrence maximale observée) et
+POST /stats/reset les remet à zéro entre deux mesures.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ..core.config import settings
+from .summary_chunking import estimate_tokens
+
+_WORDS = (
+    "réunion décision budget planning équipe client livraison priorité risque action "
+    "responsable échéance validation suivi document formation objectif point question "
+    "réponse ressource projet calendrier revue proposition contrat qualité"
+).split()
+
+
+class StandinStats:
+    """Compteurs partagés du serveur de substitution."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.injected_errors = 0
+        self.rate_limited = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.started_at = time.monotonic()
+        self.recent: Deque[float] = deque()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "injected_errors": self.injected_errors,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+        }
+
+
+def _synthetic_completion(messages: List[Dict[str, Any]], max_tokens: int) -> List[str]:
+    """Réponse déterministe (dépend du prompt) découpée en tokens d'environ un mot."""
+    prompt = "".join(str(m.get("content") or "") for m in messages)
+    rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+    length = min(max_tokens, settings.LLM_STANDIN_COMPLETION_TOKENS)
+    tokens = ["# Compte rendu\n\n"]
+    while len(tokens) < length:
+        line = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 14)))
+        tokens.extend(word + " " for word in f"- {line}".split(" "))
+        tokens.append("\n")
+    return tokens[:length]
+
+
+def create_standin_app() -> FastAPI:
+    """Application FastAPI du serveur de substitution."""
+    app = FastAPI(title="LLM stand-in", docs_url=None, redoc_url=None)
+    stats = StandinStats()
+
+    def _rejection() -> Optional[JSONResponse]:
+        now = time.monotonic()
+        rate = settings.LLM_STANDIN_RATE_LIMIT_RPM
+        if rate:
+            while stats.recent and stats.recent[0] < now - 60:
+                stats.recent.popleft()
+            if len(stats.recent) >= rate:
+                stats.rate_limited += 1
+                retry_after = max(1, int(60 - (now - stats.recent[0])) + 1)
+                return JSONResponse(
+                    status_code=429,
+                    content={"message": "Requests rate limit exceeded"},
+                    headers={"Retry-After": str(retry_after)},
+                )
+        if settings.LLM_STANDIN_MAX_CONCURRENCY and stats.in_flight >= settings.LLM_STANDIN_MAX_CONCURRENCY:
+            stats.rate_limited += 1
+            return JSONResponse(
+                status_code=429,
+                content={"message": "Too many concurrent requests"},
+                headers={"Retry-After": "1"},
+            )
+        if settings.LLM_STANDIN_ERROR_RATE and random.random() < settings.LLM_STANDIN_ERROR_RATE:
+            stats.injected_errors += 1
+            return JSONResponse(status_code=500, content={"message": "Injected stand-in error"})
+        stats.recent.append(now)
+        return None
+
+    async def _emit(tokens: List[str]) -> AsyncIterator[str]:
+        # Regrouper les tokens par paquets d'environ 50 ms pour limiter les réveils
+        tps = max(settings.LLM_STANDIN_TOKENS_PER_SECOND, 1.0)
+        batch = max(1, int(tps / 20))
+        for i in range(0, len(tokens), batch):
+            await asyncio.sleep(batch / tps)
+            yield "".join(tokens[i:i + batch])
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.requests += 1
+        rejection = _rejection()
+        if rejection is not None:
+            return rejection
+
+        messages = body.get("messages") or []
+        tokens = _synthetic_completion(messages, int(body.get("max_tokens") or 4000))
+        prompt_tokens = sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+        model = body.get("model") or settings.MISTRAL_MODEL
+
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        stats.prompt_tokens += prompt_tokens
+
+        def _done():
+            stats.in_flight -= 1
+            stats.completed += 1
+            stats.completion_tokens += len(tokens)
+
+        if body.get("stream"):
+            async def _stream():
+                try:
+                    await asyncio.sleep(settings.LLM_STANDIN_LATENCY_MS / 1000)
+                    async for piece in _emit(tokens):
+                        chunk = {"object": "chat.completion.chunk", "model": model,
+                                 "choices": [{"index": 0, "delta": {"content": piece}}]}
+                        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                    yield "data: [DONE]\n\n"
+                finally:
+                    _done()
+            return StreamingResponse(_stream(), media_type="text/event-stream")
+
+        try:
+            await asyncio.sleep(settings.LLM_STANDIN_LATENCY_MS / 1000 + len(tokens) / max(settings.LLM_STANDIN_TOKENS_PER_SECOND, 1.0))
+        finally:
+            _done()
+        return {
+            "id": f"standin-{stats.requests}",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                      "total_tokens": prompt_tokens + len(tokens)},
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats.as_dict()
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        stats.reset()
+        return stats.as_dict()
+
+    return app
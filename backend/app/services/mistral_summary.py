@@ -1,15 +1,20 @@
+import hashlib
 import json
 import logging
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 import asyncio
 from ..core.config import settings
+from .summary_chunking import needs_chunking, reduce_transcript, reduce_transcript_async
+from .transcript_compaction import compact_for_summary
+from .summary_templates import get_client_summary_template, resolve_summary_template
+from .summary_speakers import speaker_labels_for_transcript
 import requests
 
 # Configuration pour Mistral AI
 # Lire la clé via les settings/env
 MISTRAL_API_KEY = settings.MISTRAL_API_KEY
-MISTRAL_API_URL = "https://api.mistral.ai/v1/chat/completions"
+MISTRAL_API_URL = settings.MISTRAL_API_URL
 
 # Configuration du logging
 logger = logging.getLogger("meeting-transcriber")
@@ -25,25 +30,54 @@ def get_client_template(client_id: Optional[str] = None, user_id: Optional[str]
     Returns:
         str: Template de résumé ou None si aucun template n'est trouvé
     """
-    if not client_id or not user_id:
+    try:
+        template = get_client_summary_template(client_id, user_id)
+        return template.text if template else None
+    except Exception as e:
+        logger.error(f"Erreur lors de la récupération du template client: {str(e)}")
         return None
+
+def build_summary_payload(
+    transcript_text: str,
+    meeting_title: Optional[str] = None,
+    client_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Construit la requête de chat Mistral (prompt résolu, modèle, température) pour un compte rendu.
+    
+    Args:
+        transcript_text: Texte de la transcription de la réunion
+        meeting_title: Titre de la réunion (optionnel)
+        client_id: ID du client pour personnaliser le résumé (optionnel)
+        user_id: ID de l'utilisateur qui demande le résumé (optionnel)
+        template_type: Type de template intégré (ex: 'formation')
         
+    Returns:
+        dict: Corps de la requête /chat/completions (sans le champ stream)
+    """
+    # Template client personnalisé s'il existe, sinon template intégré (formation) ou par défaut
     try:
-        # Importer les fonctions ici pour éviter les imports circulaires
-        from ..db.client_queries import get_client
-        
-        # Récupérer les informations du client
-        client = get_client(client_id, user_id)
-        
-        if client and client.get("summary_template"):
-            logger.info(f"Template de résumé trouvé pour le client {client_id}")
-            return client["summary_template"]
-        else:
-            logger.info(f"Aucun template de résumé trouvé pour le client {client_id}")
-            return None
+        template = resolve_summary_template(client_id, user_id, template_type)
     except Exception as e:
         logger.error(f"Erreur lors de la récupération du template client: {str(e)}")
-        return None
+        template = resolve_summary_template(None, None, template_type)
+    logger.info(f"Utilisation du template de résumé: {template.name}")
+    prompt = template.render(transcript_text, meeting_title)
+
+    # Température plus basse en mode formation pour renforcer la déterminisme
+    temperature_value = 0.1 if (template_type and template_type.lower() == "formation") else 0.3
+
+    return {
+        "model": settings.MISTRAL_MODEL,
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": temperature_value,  # Plus strict en mode formation
+        "max_tokens": 4000  # Limite de tokens pour la réponse
+    }
+
 
 def generate_meeting_summary(
     transcript_text: str,
@@ -69,170 +103,20 @@ def generate_meeting_summary(
         return None
         
     try:
-        # Vérifier s'il existe un template client personnalisé
-        client_template = None
-        if client_id and user_id:
-            client_template = get_client_template(client_id, user_id)
+        from ..db.postgres_summary_cache import get_cached_summary, store_cached_summary
         
-        title_part = f" intitulée '{meeting_title}'" if meeting_title else ""
+        transcript_text, _ = compact_for_summary(transcript_text)
+        payload = build_summary_payload(transcript_text, meeting_title, client_id, user_id, template_type)
+        cache_key = summary_cache_key(payload)
+        cached = get_cached_summary(cache_key)
+        if cached is not None:
+            logger.info("Compte rendu servi depuis le cache")
+            return cached
+        
+        # Transcription trop longue pour un seul prompt: la condenser d'abord en plusieurs passes
+        if needs_chunking(transcript_text):
+            payload = build_summary_payload(reduce_transcript(transcript_text, template_type), meeting_title, client_id, user_id, template_type)
         
-        # Préparer prompts intégrés
-        formation_prompt = f"""Objectif :
-À partir d'une transcription d'une session de formation, produire un compte rendu PEDAGOGIQUE, FACTUEL et EXHAUSTIF des points réellement abordés.
-
-RÈGLES STRICTES (à respecter à 100%) :
-- NE JAMAIS inventer d'information. Aucune supposition. Aucune hallucination.
-- Interdire les formulations d'incertitude: pas de "peut-être", "semble", "probablement", "on dirait", "?" ajouté en fin de phrase.
-- N'inclure un prénom/noms propres que s'ils sont clairement et explicitement énoncés comme tels dans la transcription; sinon, anonymiser (ex: "Participant A", "Participant B").
-- Si une information n'est pas présente, écrire exactement "Non mentionné".
-- Résumer précisément chaque point important; couvrir toutes les questions posées et leurs réponses, même brèves.
-- Français clair, phrases concises; éviter le verbiage. Pas de placeholders.
-- Sortie uniquement en Markdown, sections dans l'ordre ci‑dessous, sans texte superflu.
-
-FORMAT EXACT ATTENDU :
-
-# 🎓 Session de formation{f" — '{meeting_title}'" if meeting_title else ''}
-
-- 👥 **Participants** : [Liste ou "Non mentionné"]
-- 🧑‍🏫 **Formateur** : [Nom ou "Non mentionné"]
-- 🕒 **Durée estimée** : [Durée ou "Non mentionné"]
-
----
-
-## 🎯 Objectifs pédagogiques
-- [Objectif 1]
-- [Objectif 2]
-
----
-
-## 🧠 Points clés appris
-- [Point 1]
-- [Point 2]
-
----
-
-## ❓ Questions & Réponses (Q/R)
-- Q: [Question 1]
-  R: [Réponse 1]
-- Q: [Question 2]
-  R: [Réponse 2]
-
----
-
-## 🧪 Exercices / Démonstrations
-| Exercice | Compétences visées | Résultat |
-|----------|--------------------|----------|
-| [Nom] | [Compétences] | [Résultat] |
-
----
-
-## 🔜 Actions / Mise en pratique
-- [Action 1] — Responsable: [Nom ou "Non mentionné"] — Échéance: ["Non mentionné" si absente]
-- [Action 2]
-
----
-
-## 📚 Ressources citées
-- [Ressource 1]
-- [Ressource 2]
-
-Consignes supplémentaires :
-- Écarter les bruits/verbatim hors sujet.
-- Préserver le sens exact des décisions/conclusions.
-- Ne jamais conserver de crochets si l'information réelle est disponible.
-
-Transcription :
-
-{transcript_text}
-"""
-
-        # Utiliser le template personnalisé s'il existe, sinon utiliser un template intégré (formation) ou par défaut
-        if client_template:
-            # Remplacer les variables dans le template client
-            prompt = client_template.replace("{transcript_text}", transcript_text)
-            if meeting_title:
-                prompt = prompt.replace("{meeting_title}", meeting_title)
-            logger.info("Utilisation d'un template client personnalisé")
-        elif template_type and template_type.lower() == "formation":
-            prompt = formation_prompt
-            logger.info("Utilisation du template intégré: formation")
-        else:
-            # Template par défaut
-            prompt = f"""Objectif :
-À partir d'une transcription brute d'une réunion, produire un compte rendu EXACTEMENT selon le format d'exemple fourni ci-dessous, intégrant précisément les emojis, les titres, les tableaux, et le style montrés.
-
-VOICI UN EXEMPLE EXACT DU FORMAT DE SORTIE QUE TU DOIS REPRODUIRE :
-
-# 📅 Réunion du [date inconnue ou date exacte si mentionnée] u2014 [Titre de la réunion ou sujet principal]
-
-- 👥 **Participants** : [Liste des participants]
-- ✏️ **Animateur/trice** : [Nom de l'animateur si identifiable]
-- 🕒 **Durée estimée** : [Durée si mentionnée]
-
----
-
-## 🧠 Résumé express
-Un paragraphe de 3-4 lignes résumant l'essentiel de la réunion.
-
----
-
-## 🗂️ Ordre du jour *(reconstruit)*
-1. 📡 [Premier point]
-2. 💰 [Deuxième point]
-3. 👤 [Troisième point]
-4. ⏱️ [Quatrième point]
-
----
-
-## ✅ Décisions prises
-- 🔒 [Décision 1] *([Nom de la personne])*
-- 💰 [Décision 2] *([Nom de la personne])*
-- 👥 [Décision 3] *([Nom de la personne])*
-
----
-
-## 🔜 Tâches & actions à suivre
-
-| 📌 Tâche | 👤 Responsable | ⏳ Échéance | 🔗 Liée à |
-|------------------|----------------|----------------|-----------|
-| [Description tâche 1] | [Responsable] | [Échéance] | [Lien] |
-| [Description tâche 2] | [Responsable] | [Échéance] | [Lien] |
-
----
-
-## ⚠️ Points de vigilance
-- ⚠️ [Point de vigilance 1]
-- 🔄 [Point de vigilance 2]
-
----
-
-## 🧵 Sujets abordés
-
-| 💬 Sujet | 🗣️ Intervenants |
-|-------------|------------------------|
-| [Sujet 1] | [Liste des intervenants] |
-| [Sujet 2] | [Liste des intervenants] |
-| [Sujet 3] | [Liste des intervenants] |
-| [Sujet 4] | [Liste des intervenants] |
-
----
-
-## 📚 Ressources mentionnées
-- [Ressource 1]
-- [Ressource 2]
-- [Ressource 3]
-
----
-
-## 🗓️ Prochaine réunion
-📍 [Date et heure de la prochaine réunion si mentionnée]
-
-UTILISE EXACTEMENT CE FORMAT, avec les mêmes emojis et la même mise en page, mais REMPLACE TOUS LES PLACEHOLDERS ENTRE CROCHETS par les informations réelles extraites de la transcription. Ne laisse AUCUN texte du type '[Premier point]' ou '[Sujet 1]' dans ta réponse. Si tu n'as pas l'information pour une section, indique-le clairement (ex: "Non mentionné" ou "Aucun point identifié"), mais NE CONSERVE PAS les placeholders entre crochets.
-
-Voici la transcription d'une réunion{title_part} :
-
-{transcript_text}
-"""        
         # Préparer la requête pour l'API Mistral
         headers = {
             "Content-Type": "application/json",
@@ -240,21 +124,9 @@ Voici la transcription d'une réunion{title_part} :
             "Authorization": f"Bearer {MISTRAL_API_KEY}"
         }
         
-        # Température plus basse en mode formation pour renforcer la déterminisme
-        temperature_value = 0.1 if (template_type and template_type.lower() == "formation") else 0.3
-
-        payload = {
-            "model": "mistral-large-latest",  # Utiliser le modèle le plus récent et le plus performant
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": temperature_value,  # Plus strict en mode formation
-            "max_tokens": 4000  # Limite de tokens pour la réponse
-        }
-        
         # Envoyer la requête à l'API Mistral
         logger.info("Envoi de la requête à l'API Mistral pour générer un compte rendu")
-        response = requests.post(MISTRAL_API_URL, headers=headers, json=payload)
+        response = requests.post(MISTRAL_API_URL, headers=headers, json=payload, timeout=settings.MISTRAL_TIMEOUT)
         
         # Vérifier la réponse
         if response.status_code == 200:
@@ -263,6 +135,7 @@ Voici la transcription d'une réunion{title_part} :
             
             if summary:
                 logger.info("Compte rendu généré avec succès par l'API Mistral")
+                store_cached_summary(cache_key, payload["model"], summary)
                 return summary
             else:
                 logger.error("La réponse de l'API Mistral ne contient pas de contenu")
@@ -290,9 +163,12 @@ def process_meeting_summary(meeting_id: str, user_id: str, client_id: Optional[s
     Returns:
         bool: True si le traitement a réussi, False sinon
     """
-    from ..db.postgres_meetings import get_meeting, update_meeting, get_meeting_speakers
+    from ..db.postgres_meetings import get_meeting, update_meeting, get_meeting_speakers, default_lease_owner, store_meeting_summary
+    from ..db.postgres_summary_jobs import claim_summary_job_inline, enqueue_summary_job, fail_summary_job, finish_summary_job
     from ..services.transcription_checker import get_assemblyai_transcript_details, replace_speaker_names_in_text
     
+    owner = default_lease_owner("summary-sync")
+    job = None
     try:
         # Récupérer les données de la réunion
         meeting = get_meeting(meeting_id, user_id)
@@ -322,13 +198,19 @@ def process_meeting_summary(meeting_id: str, user_id: str, client_id: Optional[s
             formatted_transcript = transcript_text
             logger.info("Aucun nom personnalisé trouvé, utilisation de la transcription originale")
         
-        # Mettre à jour le statut en "processing"
-        update_meeting(meeting_id, user_id, {"summary_status": "processing"})
-        
         if async_mode:
-            logger.info(f"Mode asynchrone activé pour la réunion {meeting_id}, statut mis à jour")
+            # Confier la génération aux workers (une seule tâche active par réunion); passe le statut en processing
+            enqueue_summary_job(meeting_id, user_id, client_id)
+            logger.info(f"Mode asynchrone activé pour la réunion {meeting_id}, génération ajoutée à la file")
             return True
         
+        # Prendre la génération (exclusive avec la file et le streaming); sans prolongation
+        # possible ici, le bail couvre toute la génération
+        job = claim_summary_job_inline(meeting_id, user_id, owner, 4 * settings.SUMMARY_JOB_LEASE_SECONDS)
+        if job is None:
+            logger.warning(f"Un compte rendu est déjà en cours de génération pour la réunion {meeting_id}")
+            return False
+        
         # Générer le compte rendu avec la transcription formatée
         logger.info(f"Génération du compte rendu pour la réunion {meeting_id}")
         summary_text = generate_meeting_summary(
@@ -340,15 +222,17 @@ def process_meeting_summary(meeting_id: str, user_id: str, client_id: Optional[s
         )
         
         if summary_text:
-            # Mettre à jour la base de données avec le compte rendu
-            update_meeting(meeting_id, user_id, {
-                "summary_text": summary_text,
-                "summary_status": "completed"
-            })
+            # Mettre à jour la base de données avec le compte rendu et les libellés de locuteurs utilisés
+            store_meeting_summary(
+                meeting_id, user_id, summary_text,
+                speaker_labels_for_transcript(formatted_transcript, speaker_names),
+            )
+            finish_summary_job(job["id"], owner)
             logger.info(f"Compte rendu généré avec succès pour la réunion {meeting_id}")
             return True
         else:
             # Marquer comme erreur
+            fail_summary_job(job["id"], owner, "Échec de la génération du compte rendu", settings.SUMMARY_JOB_BACKOFF_SECONDS)
             update_meeting(meeting_id, user_id, {"summary_status": "error"})
             logger.error(f"Échec de la génération du compte rendu pour la réunion {meeting_id}")
             return False
@@ -356,12 +240,152 @@ def process_meeting_summary(meeting_id: str, user_id: str, client_id: Optional[s
     except Exception as e:
         logger.error(f"Erreur lors du traitement du compte rendu pour la réunion {meeting_id}: {str(e)}")
         try:
+            if job:
+                fail_summary_job(job["id"], owner, str(e), settings.SUMMARY_JOB_BACKOFF_SECONDS)
             update_meeting(meeting_id, user_id, {"summary_status": "error"})
         except:
             pass
         return False
 
 
+def summary_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    Empreinte d'une requête de compte rendu: prompt résolu (transcription formatée, template,
+    titre), modèle, température et limite de tokens.
+    """
+    material = json.dumps(
+        {k: payload.get(k) for k in ("model", "messages", "temperature", "max_tokens")},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+async def _prepare_summary_request_async(
+    meeting_id: str,
+    user_id: str,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Charge la réunion, construit la requête complète et consulte le cache.
+
+    Returns:
+        None si aucune transcription n'est disponible, sinon
+        {"cache_key", "cached" (texte ou None), "transcript", "title", "payload", "speaker_labels",
+        "compaction" (rapport de compaction ou None)}
+    """
+    from ..db.postgres_meetings import get_meeting_async, get_meeting_speakers_async
+    from ..db.postgres_summary_cache import get_cached_summary_async
+    from ..services.transcription_checker import replace_speaker_names_in_text
+
+    meeting = await get_meeting_async(meeting_id, user_id)
+    if not meeting:
+        logger.error(f"Réunion {meeting_id} non trouvée pour l'utilisateur {user_id}")
+        return None
+
+    transcript_text = meeting.get("transcript_text")
+    if not transcript_text:
+        logger.error(f"Aucune transcription disponible pour la réunion {meeting_id}")
+        return None
+
+    speakers_data = await get_meeting_speakers_async(meeting_id, user_id)
+    speaker_names: Dict[str, str] = {}
+    if speakers_data:
+        for speaker in speakers_data:
+            speaker_names[speaker['speaker_id']] = speaker['custom_name']
+
+    formatted_transcript = replace_speaker_names_in_text(transcript_text, speaker_names) if speaker_names else transcript_text
+    title = meeting.get("title", "Réunion")
+    # Libellés vus par le modèle, pour reporter les renommages ultérieurs dans le compte rendu
+    speaker_labels = await asyncio.to_thread(speaker_labels_for_transcript, formatted_transcript, speaker_names)
+    formatted_transcript, compaction = await asyncio.to_thread(compact_for_summary, formatted_transcript, meeting_id)
+
+    # Un template client absent du registre est lu en base de façon synchrone: rester hors de l'event loop
+    payload = await asyncio.to_thread(build_summary_payload, formatted_transcript, title, client_id, user_id, template_type)
+    cache_key = summary_cache_key(payload)
+    return {
+        "cache_key": cache_key,
+        "cached": await get_cached_summary_async(cache_key),
+        "transcript": formatted_transcript,
+        "title": title,
+        "payload": payload,
+        "speaker_labels": speaker_labels,
+        "compaction": compaction,
+    }
+
+
+async def _store_summary_async(meeting_id: str, user_id: str, summary_text: str, request: Dict[str, Any]):
+    """
+    Enregistre le compte rendu avec les libellés de sa requête (voir store_meeting_summary_async),
+    et le rapport de compaction avec la tâche en cours de la réunion.
+    """
+    from ..db.postgres_meetings import store_meeting_summary_async
+    from ..db.postgres_summary_jobs import record_summary_job_compaction_async
+
+    result = await store_meeting_summary_async(meeting_id, user_id, summary_text, request["speaker_labels"])
+    if request.get("compaction"):
+        await record_summary_job_compaction_async(meeting_id, request["compaction"])
+    if result and result["outcome"] == "ambiguous":
+        logger.warning(
+            f"Locuteurs renommés pendant la génération du compte rendu de la réunion {meeting_id}: "
+            "report impossible sans ambiguïté, le compte rendu conserve les libellés de la génération"
+        )
+
+
+async def _final_payload_async(
+    request: Dict[str, Any],
+    client_id: Optional[str],
+    user_id: str,
+    template_type: Optional[str],
+) -> Dict[str, Any]:
+    """Requête envoyée au modèle: la transcription est d'abord condensée si elle dépasse une passe."""
+    if not needs_chunking(request["transcript"]):
+        return request["payload"]
+    reduced = await reduce_transcript_async(request["transcript"], template_type)
+    return await asyncio.to_thread(build_summary_payload, reduced, request["title"], client_id, user_id, template_type)
+
+
+async def apply_cached_summary_async(
+    meeting_id: str,
+    user_id: str,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> bool:
+    """
+    Enregistre directement le compte rendu en cache s'il existe (aucun appel au modèle).
+
+    L'écriture est faite sous une tâche `summary_jobs` prise comme pour le streaming: si une
+    génération est déjà en cours pour la réunion, rien n'est écrit et la fonction retourne False.
+    """
+    from ..db.postgres_summary_jobs import (
+        claim_summary_job_inline_async,
+        fail_summary_job_async,
+        finish_summary_job_async,
+    )
+    from .summary_worker import summary_worker_pool
+
+    request = await _prepare_summary_request_async(meeting_id, user_id, client_id, template_type)
+    if not request or request["cached"] is None:
+        return False
+
+    owner = summary_worker_pool.owner
+    job = await claim_summary_job_inline_async(
+        meeting_id, user_id, owner, settings.SUMMARY_JOB_LEASE_SECONDS, client_id, template_type
+    )
+    if job is None:
+        logger.info(f"Génération déjà en cours pour la réunion {meeting_id}: cache non appliqué")
+        return False
+    try:
+        await _store_summary_async(meeting_id, user_id, request["cached"], request)
+    except Exception as e:
+        await fail_summary_job_async(job["id"], owner, str(e), settings.SUMMARY_JOB_BACKOFF_SECONDS)
+        raise
+    await finish_summary_job_async(job["id"], owner)
+    logger.info(f"Compte rendu servi depuis le cache pour la réunion {meeting_id}")
+    return True
+
+
 async def process_meeting_summary_async(
     meeting_id: str,
     user_id: str,
@@ -370,46 +394,34 @@ async def process_meeting_summary_async(
 ) -> bool:
     """
     Version asynchrone sûre pour l'event loop principale: utilise les fonctions DB async
-    et exécute l'appel bloquant à l'API Mistral dans un thread.
+    et le client HTTP asynchrone partagé (pool de connexions) pour l'appel Mistral.
     """
-    from ..db.postgres_meetings import get_meeting_async, update_meeting_async, get_meeting_speakers_async
-    from ..services.transcription_checker import replace_speaker_names_in_text
+    from ..db.postgres_meetings import update_meeting_async
+    from ..db.postgres_summary_cache import store_cached_summary_async
+    from .llm_client import get_llm_client
     try:
-        meeting = await get_meeting_async(meeting_id, user_id)
-        if not meeting:
-            logger.error(f"Réunion {meeting_id} non trouvée pour l'utilisateur {user_id}")
+        request = await _prepare_summary_request_async(meeting_id, user_id, client_id, template_type)
+        if request is None:
             return False
 
-        transcript_text = meeting.get("transcript_text")
-        if not transcript_text:
-            logger.error(f"Aucune transcription disponible pour la réunion {meeting_id}")
-            return False
-
-        speakers_data = await get_meeting_speakers_async(meeting_id, user_id)
-        speaker_names: Dict[str, str] = {}
-        if speakers_data:
-            for speaker in speakers_data:
-                speaker_names[speaker['speaker_id']] = speaker['custom_name']
+        if request["cached"] is not None:
+            logger.info(f"Compte rendu servi depuis le cache pour la réunion {meeting_id}")
+            await _store_summary_async(meeting_id, user_id, request["cached"], request)
+            return True
 
-        formatted_transcript = replace_speaker_names_in_text(transcript_text, speaker_names) if speaker_names else transcript_text
+        if not MISTRAL_API_KEY:
+            logger.error("Clé API Mistral non configurée. Impossible de générer le compte rendu.")
+            await update_meeting_async(meeting_id, user_id, {"summary_status": "error"})
+            return False
 
         await update_meeting_async(meeting_id, user_id, {"summary_status": "processing"})
 
-        # Appel Mistral (bloquant) déporté dans un thread
-        summary_text = await asyncio.to_thread(
-            generate_meeting_summary,
-            formatted_transcript,
-            meeting.get("title", "Réunion"),
-            client_id,
-            user_id,
-            template_type,
-        )
+        payload = await _final_payload_async(request, client_id, user_id, template_type)
+        summary_text = await get_llm_client().complete(payload)
 
         if summary_text:
-            await update_meeting_async(meeting_id, user_id, {
-                "summary_text": summary_text,
-                "summary_status": "completed",
-            })
+            await store_cached_summary_async(request["cache_key"], payload["model"], summary_text)
+            await _store_summary_async(meeting_id, user_id, summary_text, request)
             return True
         else:
             await update_meeting_async(meeting_id, user_id, {"summary_status": "error"})
@@ -421,3 +433,100 @@ async def process_meeting_summary_async(
         except Exception:
             pass
         return False
+
+
+# Références fortes vers les générations en streaming (elles survivent au client SSE)
+_stream_tasks = set()
+
+
+async def stream_meeting_summary_async(
+    meeting_id: str,
+    user_id: str,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Génère le compte rendu en streaming.
+
+    Produit des événements {"event": "delta", "data": texte}, puis {"event": "done"} ou
+    {"event": "error", "data": message}. La génération tourne dans une tâche séparée:
+    si le client se déconnecte, elle se poursuit et le texte final est tout de même
+    enregistré (summary_status='completed') à la fermeture du flux. Un compte rendu
+    en cache est renvoyé en un seul fragment.
+
+    La génération est prise dans la file `summary_jobs` comme une tâche en cours: si une
+    autre génération est déjà en cours pour la réunion, seul l'événement {"event": "busy"}
+    est produit; sinon le premier événement est {"event": "started"}.
+    """
+    from ..db.postgres_meetings import update_meeting_async
+    from ..db.postgres_summary_cache import store_cached_summary_async
+    from ..db.postgres_summary_jobs import (
+        claim_summary_job_inline_async,
+        fail_summary_job_async,
+        finish_summary_job_async,
+    )
+    from .llm_client import get_llm_client
+    from .summary_worker import keep_summary_job_lease, summary_worker_pool
+
+    owner = summary_worker_pool.owner
+    lease_seconds = settings.SUMMARY_JOB_LEASE_SECONDS
+    job = await claim_summary_job_inline_async(meeting_id, user_id, owner, lease_seconds, client_id, template_type)
+    if job is None:
+        yield {"event": "busy"}
+        return
+    yield {"event": "started"}
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _produce():
+        parts = []
+        heartbeat = asyncio.create_task(keep_summary_job_lease(job["id"], owner, lease_seconds))
+        try:
+            request = await _prepare_summary_request_async(meeting_id, user_id, client_id, template_type)
+            if request is None:
+                raise RuntimeError("Aucune transcription disponible")
+
+            if request["cached"] is not None:
+                await _store_summary_async(meeting_id, user_id, request["cached"], request)
+                await finish_summary_job_async(job["id"], owner)
+                queue.put_nowait({"event": "delta", "data": request["cached"]})
+                queue.put_nowait({"event": "done"})
+                return
+
+            if not MISTRAL_API_KEY:
+                raise RuntimeError("Clé API Mistral non configurée")
+
+            await update_meeting_async(meeting_id, user_id, {"summary_status": "processing"})
+            payload = await _final_payload_async(request, client_id, user_id, template_type)
+            async for delta in get_llm_client().stream(payload):
+                parts.append(delta)
+                queue.put_nowait({"event": "delta", "data": delta})
+
+            summary_text = "".join(parts)
+            if not summary_text:
+                raise RuntimeError("La réponse de l'API Mistral ne contient pas de contenu")
+            await store_cached_summary_async(request["cache_key"], payload["model"], summary_text)
+            await _store_summary_async(meeting_id, user_id, summary_text, request)
+            logger.info(f"Compte rendu généré en streaming pour la réunion {meeting_id} ({len(summary_text)} caractères)")
+            await finish_summary_job_async(job["id"], owner)
+            queue.put_nowait({"event": "done"})
+        except Exception as e:
+            logger.error(f"[stream] Erreur lors de la génération du compte rendu pour {meeting_id}: {e}")
+            try:
+                # Passe la réunion en erreur (ou la laisse en cours si la tâche reprise a encore des tentatives)
+                await fail_summary_job_async(job["id"], owner, str(e), settings.SUMMARY_JOB_BACKOFF_SECONDS)
+            except Exception:
+                await update_meeting_async(meeting_id, user_id, {"summary_status": "error"})
+            queue.put_nowait({"event": "error", "data": str(e)})
+        finally:
+            heartbeat.cancel()
+
+    task = asyncio.create_task(_produce())
+    _stream_tasks.add(task)
+    task.add_done_callback(_stream_tasks.discard)
+
+    while True:
+        event = await queue.get()
+        yield event
+        if event["event"] != "delta":
+            break
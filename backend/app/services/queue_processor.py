@@ -10,7 +10,7 @@ import asyncio
 import threading
 from datetime import datetime, timedelta
 from ..core.config import settings
-from ..db.postgres_meetings import get_meeting, update_meeting
+from ..db.postgres_meetings import get_meeting, update_meeting, default_lease_owner, claim_meeting, release_meeting
 from .assemblyai import process_transcription
 from fastapi.logger import logger
 
@@ -31,6 +31,8 @@ class QueueProcessor:
         self.is_running = False
         self.task = None
         self.lock = threading.Lock()
+        # Détenteur des baux pris par ce worker (un par processus uvicorn)
+        self.lease_owner = default_lease_owner("queue-processor")
     
     async def start(self):
         """Démarre le processeur de file d'attente"""
@@ -73,7 +75,8 @@ class QueueProcessor:
         while self.is_running:
             try:
                 logger.info("Traitement périodique de la file d'attente de transcription")
-                self._process_queue()
+                # _process_queue utilise les fonctions synchrones de la base: hors de la boucle principale
+                await asyncio.to_thread(self._process_queue)
                 # Vérification périodique des transcriptions en cours
                 await self._check_pending_transcriptions()
             except Exception as e:
@@ -137,6 +140,11 @@ class QueueProcessor:
                     os.remove(queue_file_path)
                     continue
                 
+                # Un seul worker traite un fichier de queue donné; les autres le laissent
+                if not claim_meeting(meeting_id, self.lease_owner, settings.TRANSCRIPTION_LEASE_SECONDS):
+                    logger.info(f"La réunion {meeting_id} est déjà prise en charge par un autre processus")
+                    continue
+                
                 logger.info(f"Traitement de la transcription pour la réunion {meeting_id} (statut actuel: {status})")
                 
                 # Mettre à jour le statut en "processing" si nécessaire
@@ -160,31 +168,20 @@ class QueueProcessor:
     async def _check_pending_transcriptions(self):
         """Vérifie périodiquement les transcriptions avec transcript_id et met à jour si terminé (async)."""
         try:
-            from .assemblyai import check_transcription_status
-            from ..db.postgres_meetings import get_meetings_by_status_async, update_meeting_async
-            processing = await get_meetings_by_status_async('processing')
+            from ..db.postgres_meetings import claim_meetings_async, release_meeting_async
+            from .transcript_completion import complete_transcript_async
+            # Le bail espace les vérifications d'une même réunion, tous workers et scripts confondus
+            processing = await claim_meetings_async(self.lease_owner, ("processing",), settings.TRANSCRIPT_POLL_LEASE_SECONDS)
             if not processing:
                 return
             logger.info(f"Contrôle périodique: {len(processing)} réunion(s) en processing")
             for m in processing:
                 tid = m.get('transcript_id')
                 if not tid:
+                    await release_meeting_async(str(m['id']), self.lease_owner)
                     continue
                 try:
-                    data = await asyncio.to_thread(check_transcription_status, tid)
-                    if isinstance(data, dict) and data.get('status') == 'completed':
-                        text = data.get('text', '')
-                        duration = int(data.get('audio_duration', 0) or 0)
-                        speakers_count = 1
-                        if data.get('utterances'):
-                            speakers = {u.get('speaker', 'Unknown') for u in data.get('utterances', [])}
-                            speakers_count = len(speakers) or 1
-                        await update_meeting_async(m['id'], m['user_id'], {
-                            'transcript_status': 'completed',
-                            'transcript_text': text,
-                            'duration_seconds': duration,
-                            'speakers_count': speakers_count,
-                        })
+                    await complete_transcript_async(str(m['id']), str(m['user_id']), tid, lease_owner=self.lease_owner)
                 except Exception as e:
                     logger.warning(f"Contrôle statut transcript_id={tid} échoué: {e}")
         except Exception as e:
@@ -208,6 +205,8 @@ class QueueProcessor:
                     logger.info(f"Fichier de queue supprimé: {queue_file_path}")
             except Exception as e:
                 logger.error(f"Impossible de supprimer le fichier de queue {queue_file_path}: {str(e)}")
+            # Libérer le bail seulement après suppression du fichier pour qu'aucun worker ne le reprenne
+            release_meeting(meeting_id, self.lease_owner)
 
 # Instance singleton du processeur de file d'attente
 queue_processor = QueueProcessor()
@@ -0,0 +1,229 @@
+"""
+Application des durées de conservation des réunions.
+
+La durée est fixée par utilisateur (table meeting_retention_policies, sinon
+MEETING_RETENTION_MONTHS) en mois complets: les réunions d'un mois sont retirées quand ce
+mois entier est plus ancien que la durée de conservation (0: conservation illimitée).
+
+- Mois dont toutes les réunions ont expiré, sur une base partitionnée: les partitions du
+  mois sont détachées puis supprimées dans toutes les tables, sans DELETE ligne à ligne.
+- Mois partagé avec des utilisateurs dont les réunions sont conservées, mois tombé dans
+  les partitions par défaut, ou base non partitionnée: les réunions expirées sont
+  supprimées par lots (les tables liées suivent par ON DELETE CASCADE).
+
+L'action 'archive' exporte d'abord, par utilisateur et par mois, les lignes de chaque
+table en CSV compressé et les fichiers audio dans MEETING_ARCHIVE_DIR; l'action 'delete'
+supprime aussi les fichiers audio locaux.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from ..db.postgres_database import get_db_connection
+from ..db.postgres_partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    drop_month_partitions_async,
+    get_retention_policies_async,
+    is_partitioned_async,
+    meeting_partition_months_async,
+    month_start,
+    partition_name,
+)
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Colonnes archivées quand toutes ne sont pas utiles (vecteur de recherche recalculable)
+_ARCHIVE_COLUMNS = {
+    "meeting_content": "t.meeting_id, t.user_id, t.transcript_text, t.summary_text, t.updated_at, t.meeting_created_at",
+}
+
+
+def default_policy() -> Dict[str, Any]:
+    return {"retention_months": settings.MEETING_RETENTION_MONTHS, "action": settings.MEETING_RETENTION_ACTION}
+
+
+def month_expired(month: datetime, retention_months: int, now: datetime) -> bool:
+    """True si le mois entier est plus ancien que `retention_months` mois complets."""
+    if retention_months <= 0:
+        return False
+    return add_months(month, 1) <= add_months(month_start(now), -retention_months)
+
+
+async def plan_retention_async(now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Mois contenant des réunions expirées, du plus ancien au plus récent.
+
+    Returns:
+        [{"month", "mode" ('partition' ou 'rows'), "expired_users", "archive_users",
+          "kept_users" (utilisateurs conservés dans le mois), "meetings" (réunions expirées)}]
+    """
+    now = now or datetime.now(timezone.utc)
+    policies = await get_retention_policies_async()
+    default = default_policy()
+    durations = [p["retention_months"] for p in policies.values()] + [default["retention_months"]]
+    shortest = min((months for months in durations if months > 0), default=0)
+    if not shortest:
+        return []
+    horizon = add_months(month_start(now), -shortest)
+
+    async with get_db_connection() as conn:
+        partitioned = await is_partitioned_async(conn)
+        partition_months = set(await meeting_partition_months_async(conn)) if partitioned else set()
+        rows = await conn.fetch(
+            """
+            SELECT date_trunc('month', created_at, 'UTC') AS month, user_id, count(*) AS meetings
+            FROM meetings
+            WHERE created_at < $1
+            GROUP BY 1, 2
+            ORDER BY 1
+            """,
+            horizon,
+        )
+
+    by_month: Dict[datetime, Dict[str, int]] = {}
+    for r in rows:
+        by_month.setdefault(month_start(r["month"]), {})[str(r["user_id"])] = r["meetings"]
+
+    plan = []
+    for month, users in sorted(by_month.items()):
+        expired = [
+            user_id for user_id in users
+            if month_expired(month, policies.get(user_id, default)["retention_months"], now)
+        ]
+        if not expired:
+            continue
+        whole_month = len(expired) == len(users)
+        plan.append({
+            "month": month,
+            "mode": "partition" if whole_month and month in partition_months else "rows",
+            "expired_users": expired,
+            "archive_users": [u for u in expired if policies.get(u, default)["action"] == "archive"],
+            "kept_users": len(users) - len(expired),
+            "meetings": sum(users[u] for u in expired),
+        })
+    return plan
+
+
+def _local_audio_path(file_url: Optional[str]) -> Optional[Path]:
+    if not file_url or not file_url.startswith("/uploads/"):
+        return None
+    return settings.UPLOADS_DIR.parent / file_url.lstrip("/")
+
+
+def _archive_dir(user_id: str, month: datetime) -> Path:
+    return Path(settings.MEETING_ARCHIVE_DIR) / user_id / f"{month:%Y_%m}"
+
+
+async def _archive_user_month_async(conn, user_id: str, month: datetime) -> int:
+    """Exporte les réunions d'un utilisateur pour un mois (une archive CSV compressée par table)."""
+    directory = _archive_dir(user_id, month)
+    directory.mkdir(parents=True, exist_ok=True)
+    start, end = month, add_months(month, 1)
+    for table, _ in PARTITIONED_TABLES:
+        if table == "meetings":
+            query = "SELECT * FROM meetings WHERE user_id = $1 AND created_at >= $2 AND created_at < $3"
+        else:
+            columns = _ARCHIVE_COLUMNS.get(table, "t.*")
+            query = (
+                f"SELECT {columns} FROM {table} t JOIN meetings m ON m.id = t.meeting_id "
+                "WHERE m.user_id = $1 AND m.created_at >= $2 AND m.created_at < $3"
+            )
+        with gzip.open(directory / f"{table}.csv.gz", "wb") as output:
+            await conn.copy_from_query(query, uuid.UUID(user_id), start, end, output=output, format="csv", header=True)
+
+    file_urls = await conn.fetch(
+        "SELECT file_url FROM meetings WHERE user_id = $1 AND created_at >= $2 AND created_at < $3",
+        uuid.UUID(user_id), start, end,
+    )
+    archived = 0
+    for r in file_urls:
+        source = _local_audio_path(r["file_url"])
+        if source and source.exists():
+            (directory / "audio").mkdir(exist_ok=True)
+            await asyncio.to_thread(shutil.copy2, source, directory / "audio" / source.name)
+            archived += 1
+    return archived
+
+
+def _remove_audio(file_urls: List[Optional[str]]) -> int:
+    removed = 0
+    for file_url in file_urls:
+        path = _local_audio_path(file_url)
+        try:
+            if path and path.exists():
+                os.remove(path)
+                removed += 1
+        except OSError as e:
+            logger.error(f"Suppression du fichier audio {path} impossible: {e}")
+    return removed
+
+
+async def _delete_rows_async(conn, month: datetime, user_ids: List[str], batch_size: int) -> List[Optional[str]]:
+    """Supprime par lots les réunions du mois de ces utilisateurs; renvoie leurs fichiers audio."""
+    file_urls: List[Optional[str]] = []
+    while True:
+        rows = await conn.fetch(
+            """
+            WITH batch AS (
+                SELECT id FROM meetings
+                WHERE user_id = ANY($1::uuid[]) AND created_at >= $2 AND created_at < $3
+                LIMIT $4
+            ), jobs AS (
+                DELETE FROM summary_jobs WHERE meeting_id IN (SELECT id FROM batch)
+            )
+            DELETE FROM meetings m USING batch WHERE m.id = batch.id
+            RETURNING m.file_url
+            """,
+            [uuid.UUID(u) for u in user_ids], month, add_months(month, 1), batch_size,
+        )
+        file_urls += [r["file_url"] for r in rows]
+        if len(rows) < batch_size:
+            return file_urls
+
+
+async def apply_retention_async(
+    dry_run: bool = False,
+    batch_size: int = 500,
+    now: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Retire les réunions expirées (voir plan_retention_async).
+
+    Returns:
+        Le plan, chaque mois traité complété de "removed" (réunions supprimées) et
+        "audio_removed" (fichiers audio locaux supprimés)
+    """
+    plan = await plan_retention_async(now)
+    if dry_run:
+        return plan
+    for entry in plan:
+        month = entry["month"]
+        async with get_db_connection() as conn:
+            for user_id in entry["archive_users"]:
+                await _archive_user_month_async(conn, user_id, month)
+
+            if entry["mode"] == "partition":
+                meetings_partition = partition_name("meetings", month)
+                async with conn.transaction():
+                    rows = await conn.fetch(f"SELECT file_url FROM {meetings_partition}")
+                    dropped = await drop_month_partitions_async(conn, month)
+                file_urls = [r["file_url"] for r in rows]
+                logger.info(f"Conservation: mois {month:%Y-%m} supprimé ({', '.join(dropped)})")
+            else:
+                file_urls = await _delete_rows_async(conn, month, entry["expired_users"], batch_size)
+                logger.info(
+                    f"Conservation: {len(file_urls)} réunion(s) de {month:%Y-%m} supprimée(s) "
+                    f"pour {len(entry['expired_users'])} utilisateur(s)"
+                )
+        entry["removed"] = len(file_urls)
+        entry["audio_removed"] = await asyncio.to_thread(_remove_audio, file_urls)
+    return plan
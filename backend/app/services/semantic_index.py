@@ -0,0 +1,357 @@
+"""
+Index vectoriel des transcriptions pour la recherche sémantique.
+
+Les transcriptions terminées sont découpées en passages de SEMANTIC_CHUNK_UTTERANCES
+utterances (dont SEMANTIC_CHUNK_OVERLAP communes avec le passage précédent), chaque
+passage est vectorisé (voir embeddings) et les vecteurs d'un utilisateur sont rangés en
+float16 dans une matrice sur disque, lue par memmap:
+
+    SEMANTIC_INDEX_DIR/<user_id>/
+        index.json        vectoriseur, fichier de vecteurs, passages (lignes) et réunions indexées
+        vectors.<n>.f16   matrice lignes x dimension, ligne i = passage i de index.json
+        .lock             verrou de construction (un seul constructeur par utilisateur)
+
+La construction est incrémentale (sync_user_index_async, lancée hors requêtes par
+build_semantic_index.py): les passages des réunions nouvelles ou retranscrites sont
+ajoutés en fin de matrice; les lignes des réunions supprimées ou retranscrites ne sont
+plus référencées par index.json (pierres tombales) et la matrice est réécrite sans elles
+dès que leur part dépasse SEMANTIC_INDEX_COMPACT_RATIO. index.json est remplacé
+atomiquement après l'écriture des vecteurs et la compaction écrit un nouveau fichier de
+vecteurs: une recherche concurrente voit toujours un état cohérent.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from ..db.postgres_meetings import (
+    get_client_meeting_ids_async,
+    get_indexable_meetings_async,
+    get_meeting_utterances_page_async,
+    get_meetings_brief_async,
+)
+from .embeddings import get_embedder
+
+logger = logging.getLogger("meeting-transcriber")
+
+INDEX_FILE = "index.json"
+# Longueur de l'extrait conservé pour chaque passage (affiché dans les résultats)
+PASSAGE_PREVIEW_CHARS = 240
+# Réunions vectorisées puis écrites ensemble pendant une construction
+BUILD_BATCH_MEETINGS = 20
+# Lignes lues par bloc pour le produit scalaire (mémoire bornée sur les gros index)
+SCORE_BLOCK_ROWS = 65536
+# Passages candidats par résultat: plusieurs passages d'une même réunion peuvent arriver en tête
+CANDIDATES_PER_RESULT = 4
+# Index ouverts gardés par processus
+VIEW_CACHE_SIZE = 32
+
+
+def user_index_dir(user_id: str) -> Path:
+    return Path(settings.SEMANTIC_INDEX_DIR) / str(uuid.UUID(str(user_id)))
+
+
+def chunk_utterances(
+    utterances: Sequence[Tuple[int, Dict[str, Any]]],
+    size: int,
+    overlap: int,
+) -> List[Tuple[int, int, str]]:
+    """Passages (première utterance, dernière utterance, texte) d'une transcription [(idx, utterance)]."""
+    step = max(1, size - overlap)
+    chunks: List[Tuple[int, int, str]] = []
+    for start in range(0, len(utterances), step):
+        window = utterances[start:start + size]
+        text = " ".join((u.get("text") or "").strip() for _, u in window).strip()
+        if text:
+            chunks.append((window[0][0], window[-1][0], text))
+        if start + size >= len(utterances):
+            break
+    return chunks
+
+
+def _empty_index(embedder, generation: int = 0) -> Dict[str, Any]:
+    return {
+        "embedder": embedder.name,
+        "dim": embedder.dim,
+        "generation": generation,
+        "vectors": f"vectors.{generation}.f16",
+        # [meeting_id, première utterance, dernière utterance, extrait] par ligne de la matrice
+        "rows": [],
+        # meeting_id -> [transcript_version, première ligne, nombre de lignes] (réunions vivantes)
+        "meetings": {},
+    }
+
+
+def _load_index(directory: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(directory / INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_index(directory: Path, index: Dict[str, Any]) -> None:
+    tmp = directory / f"{INDEX_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, directory / INDEX_FILE)
+
+
+def _dead_rows(index: Dict[str, Any]) -> int:
+    return len(index["rows"]) - sum(count for _, _, count in index["meetings"].values())
+
+
+def _append_meetings(
+    directory: Path,
+    index: Dict[str, Any],
+    meetings: List[Tuple[str, int, List[Tuple[int, int, str]]]],
+    vectors: np.ndarray,
+) -> None:
+    """Ajoute les passages de réunions [(id, version, passages)] et leurs vecteurs, dans l'ordre."""
+    path = directory / index["vectors"]
+    row_bytes = index["dim"] * 2
+    with open(path, "r+b" if path.exists() else "w+b") as f:
+        # Écarte un ajout interrompu avant la mise à jour d'index.json
+        f.truncate(len(index["rows"]) * row_bytes)
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(vectors, dtype=np.float16).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    for meeting_id, version, chunks in meetings:
+        index["meetings"][meeting_id] = [version, len(index["rows"]), len(chunks)]
+        index["rows"].extend([meeting_id, first, last, text[:PASSAGE_PREVIEW_CHARS]] for first, last, text in chunks)
+    _write_index(directory, index)
+
+
+def _compact(directory: Path, index: Dict[str, Any]) -> Dict[str, Any]:
+    """Réécrit la matrice sans les lignes mortes dans un nouveau fichier de vecteurs."""
+    old_path = directory / index["vectors"]
+    compacted = _empty_index_like(index, index["generation"] + 1)
+    new_path = directory / compacted["vectors"]
+    matrix = _open_matrix(old_path, len(index["rows"]), index["dim"])
+    with open(new_path, "wb") as f:
+        for meeting_id, (version, first, count) in index["meetings"].items():
+            compacted["meetings"][meeting_id] = [version, len(compacted["rows"]), count]
+            compacted["rows"].extend(index["rows"][first:first + count])
+            if count:
+                f.write(np.ascontiguousarray(matrix[first:first + count]).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    del matrix
+    _write_index(directory, compacted)
+    old_path.unlink(missing_ok=True)
+    return compacted
+
+
+def _empty_index_like(index: Dict[str, Any], generation: int) -> Dict[str, Any]:
+    return {**index, "generation": generation, "vectors": f"vectors.{generation}.f16", "rows": [], "meetings": {}}
+
+
+def _open_matrix(path: Path, rows: int, dim: int) -> Optional[np.memmap]:
+    if rows == 0:
+        return None
+    return np.memmap(path, dtype=np.float16, mode="r", shape=(rows, dim))
+
+
+@contextmanager
+def _build_lock(directory: Path) -> Iterator[bool]:
+    """Verrou exclusif non bloquant; donne False si une construction est déjà en cours."""
+    with open(directory / ".lock", "a+") as f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+async def sync_user_index_async(user_id: str) -> Dict[str, Any]:
+    """
+    Met l'index sémantique d'un utilisateur à jour avec ses transcriptions terminées.
+
+    Returns:
+        {"added": réunions (ré)indexées, "removed": réunions retirées, "passages": passages
+        ajoutés, "compacted": matrice réécrite, "busy": construction déjà en cours ailleurs}
+    """
+    embedder = get_embedder()
+    directory = user_index_dir(user_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    stats = {"added": 0, "removed": 0, "passages": 0, "compacted": False, "busy": False}
+    with _build_lock(directory) as locked:
+        if not locked:
+            stats["busy"] = True
+            return stats
+
+        index = await asyncio.to_thread(_load_index, directory)
+        replaced: Optional[Path] = None
+        if index is None or index["embedder"] != embedder.name:
+            if index is not None:
+                logger.info(f"Vectoriseur modifié ({index['embedder']} -> {embedder.name}): reconstruction de l'index de {user_id}")
+                replaced = directory / index["vectors"]
+            index = _empty_index(embedder, index["generation"] + 1 if index else 0)
+        dirty = replaced is not None or not (directory / INDEX_FILE).exists()
+
+        current = await get_indexable_meetings_async(user_id)
+        # Réunions supprimées, plus terminées ou retranscrites: leurs lignes deviennent mortes
+        for meeting_id in [m for m, (version, _, _) in index["meetings"].items() if current.get(m) != version]:
+            del index["meetings"][meeting_id]
+            stats["removed"] += 1
+            dirty = True
+        pending = [m for m in current if m not in index["meetings"]]
+
+        for start in range(0, len(pending), BUILD_BATCH_MEETINGS):
+            batch: List[Tuple[str, int, List[Tuple[int, int, str]]]] = []
+            for meeting_id in pending[start:start + BUILD_BATCH_MEETINGS]:
+                page = await get_meeting_utterances_page_async(meeting_id, user_id)
+                if page is None:
+                    continue
+                chunks = chunk_utterances(page["items"], settings.SEMANTIC_CHUNK_UTTERANCES, settings.SEMANTIC_CHUNK_OVERLAP)
+                batch.append((meeting_id, page["transcript_version"], chunks))
+            texts = [text for _, _, chunks in batch for _, _, text in chunks]
+            vectors = await asyncio.to_thread(embedder.embed, texts) if texts else np.zeros((0, index["dim"]), np.float32)
+            await asyncio.to_thread(_append_meetings, directory, index, batch, vectors)
+            stats["added"] += len(batch)
+            stats["passages"] += len(texts)
+            dirty = False
+
+        if dirty:
+            await asyncio.to_thread(_write_index, directory, index)
+        if replaced is not None:
+            replaced.unlink(missing_ok=True)
+        if index["rows"] and _dead_rows(index) / len(index["rows"]) > settings.SEMANTIC_INDEX_COMPACT_RATIO:
+            await asyncio.to_thread(_compact, directory, index)
+            stats["compacted"] = True
+    return stats
+
+
+class _IndexView:
+    """Index ouvert en lecture: métadonnées, matrice memmap et masque des lignes vivantes."""
+
+    def __init__(self, directory: Path, index: Dict[str, Any]):
+        self.embedder = index["embedder"]
+        self.rows = index["rows"]
+        self.meetings = index["meetings"]
+        self.matrix = _open_matrix(directory / index["vectors"], len(self.rows), index["dim"])
+        self.live = self.mask(self.meetings)
+
+    def mask(self, meeting_ids) -> np.ndarray:
+        mask = np.zeros(len(self.rows), dtype=bool)
+        for meeting_id in meeting_ids:
+            entry = self.meetings.get(meeting_id)
+            if entry:
+                mask[entry[1]:entry[1] + entry[2]] = True
+        return mask
+
+    def top(self, query: np.ndarray, mask: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Les k lignes autorisées par `mask` de plus grand produit scalaire avec `query`."""
+        k = min(k, int(mask.sum()))
+        if k <= 0:
+            return []
+        scores = np.empty(len(self.rows), dtype=np.float32)
+        for start in range(0, len(self.rows), SCORE_BLOCK_ROWS):
+            block = self.matrix[start:start + SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        scores[~mask] = -np.inf
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(int(row), float(scores[row])) for row in best]
+
+
+_views: "OrderedDict[str, Tuple[Tuple[int, int, int], _IndexView]]" = OrderedDict()
+_views_lock = threading.Lock()
+
+
+def _open_view(user_id: str) -> Optional[_IndexView]:
+    """Index de l'utilisateur, rouvert seulement si index.json a changé (None s'il n'existe pas)."""
+    directory = user_index_dir(user_id)
+    for _ in range(2):
+        try:
+            stat = os.stat(directory / INDEX_FILE)
+        except FileNotFoundError:
+            return None
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with _views_lock:
+            cached = _views.get(user_id)
+            if cached and cached[0] == key:
+                _views.move_to_end(user_id)
+                return cached[1]
+        index = _load_index(directory)
+        if index is None:
+            return None
+        try:
+            view = _IndexView(directory, index)
+        except FileNotFoundError:
+            # Compaction entre la lecture d'index.json et l'ouverture des vecteurs
+            continue
+        with _views_lock:
+            _views[user_id] = (key, view)
+            _views.move_to_end(user_id)
+            while len(_views) > VIEW_CACHE_SIZE:
+                _views.popitem(last=False)
+        return view
+    return None
+
+
+async def semantic_search_async(
+    user_id: str,
+    query: str,
+    client_id: Optional[str] = None,
+    limit: int = 10,
+) -> Dict[str, Any]:
+    """
+    Réunions de l'utilisateur dont un passage est le plus proche de `query`.
+
+    Un résultat par réunion (son meilleur passage), du plus proche au moins proche. Les
+    réunions supprimées depuis la dernière construction de l'index sont écartées.
+
+    Returns:
+        {"items": [...], "indexed_meetings": nombre de réunions indexées}
+    Raises:
+        RuntimeError: vectoriseur indisponible
+    """
+    embedder = await asyncio.to_thread(get_embedder)
+    view = await asyncio.to_thread(_open_view, str(user_id))
+    if view is None or view.embedder != embedder.name:
+        return {"items": [], "indexed_meetings": 0}
+
+    mask = view.live
+    if client_id:
+        mask = view.mask(await get_client_meeting_ids_async(user_id, client_id))
+    query_vector = (await asyncio.to_thread(embedder.embed, [query]))[0]
+    candidates = await asyncio.to_thread(view.top, query_vector, mask, limit * CANDIDATES_PER_RESULT)
+
+    best: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+    for row, score in candidates:
+        best.setdefault(view.rows[row][0], (row, score))
+    meetings = await get_meetings_brief_async(list(best), user_id) if best else {}
+
+    items = []
+    for meeting_id, (row, score) in best.items():
+        meeting = meetings.get(meeting_id)
+        if meeting is None:
+            continue
+        _, first, last, text = view.rows[row]
+        items.append({
+            **meeting,
+            "score": round(score, 4),
+            "passage": {"from": first, "to": last, "text": text},
+        })
+        if len(items) == limit:
+            break
+    return {"items": items, "indexed_meetings": len(view.meetings)}
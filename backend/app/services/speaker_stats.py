@@ -0,0 +1,156 @@
+"""
+Statistiques par locuteur calculées une fois à la fin de la transcription.
+
+Les agrégats (temps de parole, part, tours de parole, interruptions, débit) sont
+calculés de façon vectorisée avec NumPy sur les tableaux start/end des utterances.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+def compute_speaker_stats(utterances: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Calcule les statistiques par locuteur.
+
+    Args:
+        utterances: Liste ordonnée de {speaker, text, start, end} (timestamps en ms,
+            éventuellement absents pour les transcriptions antérieures)
+
+    Returns:
+        Liste de dictionnaires, un par locuteur, triée par temps de parole décroissant
+    """
+    if not utterances:
+        return []
+
+    speakers = np.array([u.get("speaker") or "Unknown" for u in utterances], dtype=object)
+    labels, codes = np.unique(speakers, return_inverse=True)
+    n_speakers = len(labels)
+
+    start = np.array([u.get("start") if u.get("start") is not None else np.nan for u in utterances], dtype=np.float64)
+    end = np.array([u.get("end") if u.get("end") is not None else np.nan for u in utterances], dtype=np.float64)
+    words = np.fromiter((len((u.get("text") or "").split()) for u in utterances), dtype=np.int64, count=len(utterances))
+
+    durations = np.nan_to_num(np.clip(end - start, 0, None), nan=0.0)
+    talk_time = np.bincount(codes, weights=durations, minlength=n_speakers)
+    total_talk_time = talk_time.sum()
+    share = talk_time / total_talk_time if total_talk_time > 0 else np.zeros(n_speakers)
+
+    # Un tour de parole commence à chaque changement de locuteur
+    new_turn = np.ones(len(codes), dtype=bool)
+    new_turn[1:] = codes[1:] != codes[:-1]
+    turns = np.bincount(codes[new_turn], minlength=n_speakers)
+
+    # Interruption: un autre locuteur commence avant la fin de l'utterance précédente
+    interrupts = np.zeros(len(codes), dtype=bool)
+    interrupts[1:] = new_turn[1:] & (start[1:] < end[:-1])
+    interruptions = np.bincount(codes[interrupts], minlength=n_speakers)
+
+    word_counts = np.bincount(codes, weights=words, minlength=n_speakers)
+    minutes = talk_time / 60000.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_turn = np.where(turns > 0, talk_time / np.maximum(turns, 1), 0.0)
+        wpm = np.where(minutes > 0, word_counts / minutes, 0.0)
+
+    order = np.argsort(-talk_time, kind="stable")
+    return [
+        {
+            "speaker": str(labels[i]),
+            "talk_time_ms": int(talk_time[i]),
+            "talk_share": round(float(share[i]), 4),
+            "turns": int(turns[i]),
+            "avg_turn_ms": round(float(avg_turn[i]), 1),
+            "interruptions": int(interruptions[i]),
+            "words": int(word_counts[i]),
+            "words_per_minute": round(float(wpm[i]), 1),
+        }
+        for i in order
+    ]
+
+
+def _label(utterance: Dict[str, Any]) -> str:
+    return utterance.get("speaker") or "Unknown"
+
+
+def _window_counts(rows: Dict[int, Dict[str, Any]], edited: List[int]) -> Dict[str, Dict[str, int]]:
+    """
+    Part des agrégats portée par les utterances éditées et leurs frontières de tour
+    (paires (i-1, i) et (i, i+1)), par locuteur.
+    """
+    counts: Dict[str, Dict[str, int]] = {}
+
+    def add(speaker: str, field: str, value: int):
+        counts.setdefault(speaker, {"talk_time_ms": 0, "turns": 0, "interruptions": 0, "words": 0})[field] += value
+
+    for idx in edited:
+        u = rows[idx]
+        if u.get("start") is not None and u.get("end") is not None:
+            add(_label(u), "talk_time_ms", max(u["end"] - u["start"], 0))
+        add(_label(u), "words", len((u.get("text") or "").split()))
+
+    for idx in sorted({i for e in edited for i in (e, e + 1)}):
+        u = rows.get(idx)
+        if u is None:
+            continue
+        previous = rows.get(idx - 1)
+        if previous is not None and _label(previous) == _label(u):
+            continue
+        add(_label(u), "turns", 1)
+        if (previous is not None and u.get("start") is not None and previous.get("end") is not None
+                and u["start"] < previous["end"]):
+            add(_label(u), "interruptions", 1)
+    return counts
+
+
+def update_speaker_stats(
+    stats: List[Dict[str, Any]],
+    before: Dict[int, Dict[str, Any]],
+    after: Dict[int, Dict[str, Any]],
+    edited: List[int],
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Met à jour les statistiques stockées après l'édition de quelques utterances, sans
+    relire la transcription: seuls les locuteurs des utterances éditées et de leurs
+    voisines changent. Le temps de parole total ne dépend pas des locuteurs, les parts
+    des autres locuteurs restent donc valables.
+
+    Args:
+        stats: Statistiques stockées (une entrée par locuteur)
+        before: {index: utterance} avant édition, pour les index édités et leurs voisins
+        after: Mêmes index après édition
+        edited: Index des utterances éditées
+
+    Returns:
+        (statistiques recalculées des locuteurs touchés, locuteurs sans utterance restante)
+    """
+    old = _window_counts(before, edited)
+    new = _window_counts(after, edited)
+    by_speaker = {s["speaker"]: s for s in stats}
+    total_talk_time = sum(s["talk_time_ms"] for s in stats)
+
+    updated, removed = [], []
+    for speaker in sorted(set(old) | set(new)):
+        current = by_speaker.get(speaker, {})
+        values = {
+            field: current.get(field, 0) + new.get(speaker, {}).get(field, 0) - old.get(speaker, {}).get(field, 0)
+            for field in ("talk_time_ms", "turns", "interruptions", "words")
+        }
+        # Chaque utterance appartient à un tour: plus de tour, plus d'utterance
+        if values["turns"] <= 0:
+            if speaker in by_speaker:
+                removed.append(speaker)
+            continue
+        talk_time = values["talk_time_ms"]
+        minutes = talk_time / 60000.0
+        updated.append({
+            "speaker": speaker,
+            "talk_time_ms": int(talk_time),
+            "talk_share": round(talk_time / total_talk_time, 4) if total_talk_time > 0 else 0.0,
+            "turns": int(values["turns"]),
+            "avg_turn_ms": round(talk_time / values["turns"], 1),
+            "interruptions": int(values["interruptions"]),
+            "words": int(values["words"]),
+            "words_per_minute": round(values["words"] / minutes, 1) if minutes > 0 else 0.0,
+        })
+    return updated, removed
@@ -0,0 +1,166 @@
+"""
+Résumé en plusieurs passes (map-reduce) des transcriptions trop longues pour un seul prompt.
+
+La transcription formatée est découpée aux frontières d'utterances (une ligne par
+intervention) selon un budget de tokens. Chaque partie est condensée en notes
+factuelles en parallèle (map, concurrence limitée), puis les notes sont fusionnées
+par niveaux jusqu'à tenir dans le budget. Le texte obtenu remplace la transcription
+dans l'appel final qui remplit le template habituel (par défaut, "formation" ou client).
+"""
+
+import asyncio
+import logging
+import math
+from typing import List, Optional
+
+from ..core.config import settings
+from .llm_client import LLMClient, get_llm_client
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Approximation du tokenizer Mistral pour du français (caractères par token)
+_CHARS_PER_TOKEN = 3.5
+
+_MAP_PROMPT = """Tu reçois la partie {index}/{total} d'une transcription de {kind}.
+Extrais des notes FACTUELLES et EXHAUSTIVES de cette partie uniquement, en Markdown, sous les rubriques suivantes :
+- Participants et rôles (noms uniquement s'ils sont explicitement énoncés)
+- Sujets abordés (avec les intervenants)
+- Décisions prises (avec la personne concernée)
+- Tâches et actions (responsable, échéance si mentionnée)
+- Questions posées et réponses apportées
+- Points de vigilance
+- Ressources mentionnées
+- Dates, durées et prochaines échéances mentionnées
+
+RÈGLES : ne jamais inventer, ne rien supposer, écrire "Non mentionné" pour une rubrique vide, aucune phrase d'introduction.
+
+Transcription (partie {index}/{total}) :
+
+{chunk}
+"""
+
+_MERGE_PROMPT = """Voici des notes extraites de parties consécutives d'une transcription de {kind}.
+Fusionne-les en un seul jeu de notes sous les mêmes rubriques, en conservant TOUTES les décisions, tâches,
+questions/réponses et informations factuelles, en supprimant uniquement les doublons. Ne rien inventer.
+
+{notes}
+"""
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimation du nombre de tokens d'un texte (sans dépendance au tokenizer)."""
+    return math.ceil(len(text or "") / _CHARS_PER_TOKEN)
+
+
+def needs_chunking(transcript_text: Optional[str]) -> bool:
+    return estimate_tokens(transcript_text) > settings.SUMMARY_SINGLE_PASS_TOKENS
+
+
+def split_transcript(transcript_text: str, max_tokens: int) -> List[str]:
+    """
+    Découpe une transcription formatée en parties d'au plus `max_tokens`, sans couper
+    d'utterance sauf si une utterance seule dépasse le budget.
+    """
+    max_chars = int(max_tokens * _CHARS_PER_TOKEN)
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+
+    for line in transcript_text.split("\n"):
+        if not line.strip():
+            continue
+        # Utterance plus longue que le budget: la découper en morceaux de taille fixe
+        pieces = [line[i:i + max_chars] for i in range(0, len(line), max_chars)] if len(line) > max_chars else [line]
+        for piece in pieces:
+            if current and current_len + len(piece) + 1 > max_chars:
+                chunks.append("\n".join(current))
+                current, current_len = [], 0
+            current.append(piece)
+            current_len += len(piece) + 1
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+async def _summarize_parts(client: LLMClient, prompts: List[str], max_tokens: int) -> List[str]:
+    """Exécute les appels d'une passe en parallèle, sous la limite de concurrence configurée."""
+    semaphore = asyncio.Semaphore(settings.SUMMARY_MAP_CONCURRENCY)
+
+    async def _one(prompt: str) -> str:
+        async with semaphore:
+            return await client.complete({
+                "model": settings.MISTRAL_MODEL,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0.1,
+                "max_tokens": max_tokens,
+            })
+
+    return list(await asyncio.gather(*(_one(p) for p in prompts)))
+
+
+async def reduce_transcript_async(
+    transcript_text: str,
+    template_type: Optional[str] = None,
+    client: Optional[LLMClient] = None,
+) -> str:
+    """
+    Retourne un texte à placer dans le prompt final: la transcription elle-même si elle
+    tient dans une passe, sinon les notes fusionnées issues du map-reduce.
+    """
+    if not needs_chunking(transcript_text):
+        return transcript_text
+
+    client = client or get_llm_client()
+    kind = "session de formation" if (template_type and template_type.lower() == "formation") else "réunion"
+    chunk_tokens = settings.SUMMARY_CHUNK_TOKENS
+    notes_tokens = settings.SUMMARY_NOTES_MAX_TOKENS
+
+    chunks = split_transcript(transcript_text, chunk_tokens)
+    logger.info(f"Résumé en plusieurs passes: {len(chunks)} parties (~{estimate_tokens(transcript_text)} tokens)")
+    notes = await _summarize_parts(
+        client,
+        [_MAP_PROMPT.format(index=i + 1, total=len(chunks), kind=kind, chunk=chunk) for i, chunk in enumerate(chunks)],
+        notes_tokens,
+    )
+
+    # Fusion par niveaux tant que l'ensemble des notes dépasse le budget d'une passe
+    level = 1
+    while len(notes) > 1 and estimate_tokens("\n\n".join(notes)) > chunk_tokens:
+        groups: List[List[str]] = []
+        for note in notes:
+            if groups and estimate_tokens("\n\n".join(groups[-1] + [note])) <= chunk_tokens:
+                groups[-1].append(note)
+            else:
+                groups.append([note])
+        if len(groups) == len(notes):
+            # Chaque note remplit déjà le budget: fusionner deux à deux pour garantir la convergence
+            groups = [notes[i:i + 2] for i in range(0, len(notes), 2)]
+        level += 1
+        logger.info(f"Fusion des notes (niveau {level}): {len(notes)} -> {len(groups)}")
+        notes = await _summarize_parts(
+            client,
+            [_MERGE_PROMPT.format(kind=kind, notes="\n\n---\n\n".join(group)) for group in groups],
+            notes_tokens,
+        )
+
+    parts = "\n\n---\n\n".join(notes)
+    return (
+        f"Notes structurées extraites de l'intégralité de la transcription "
+        f"(découpée en {len(chunks)} parties, dans l'ordre chronologique) :\n\n{parts}"
+    )
+
+
+def reduce_transcript(transcript_text: str, template_type: Optional[str] = None) -> str:
+    """Version synchrone (threads de traitement hors event loop)."""
+    if not needs_chunking(transcript_text):
+        return transcript_text
+
+    async def _main() -> str:
+        client = LLMClient(settings.MISTRAL_API_URL, settings.MISTRAL_API_KEY, settings.MISTRAL_TIMEOUT)
+        try:
+            return await reduce_transcript_async(transcript_text, template_type, client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(_main())
@@ -0,0 +1,113 @@
+"""
+Report des renommages de locuteurs dans les comptes rendus déjà générés.
+
+Chaque compte rendu enregistre les libellés de locuteurs présents dans la transcription
+envoyée au modèle (`meetings.summary_speaker_labels`, {identifiant: libellé}). Lorsqu'un
+nom personnalisé change, les anciens libellés sont remplacés dans `summary_text` par une
+substitution délimitée aux frontières de mots (une seule passe, tous les renommages à la
+fois, ce qui gère aussi les échanges de noms) et `summary_revision` est incrémentée.
+
+La substitution est refusée lorsqu'elle est ambiguë (libellé trop court, libellé contenu
+dans celui d'un autre locuteur, libellé partagé par plusieurs locuteurs): le compte rendu
+est alors régénéré via la file `summary_jobs`.
+"""
+
+import logging
+import re
+from typing import Dict, Optional
+
+from .utterances import parse_transcript_text, resolve_speaker_name
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Longueur minimale d'un libellé remplaçable sans risque de toucher un mot ordinaire
+_MIN_LABEL_LENGTH = 2
+
+
+def _bounded(label: str) -> str:
+    return rf"(?<!\w){re.escape(label)}(?!\w)"
+
+
+def speaker_labels_for_transcript(transcript_text: Optional[str], speaker_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Libellés affichés {identifiant: libellé} des locuteurs présents dans une transcription formatée."""
+    labels: Dict[str, str] = {}
+    for utterance in parse_transcript_text(transcript_text, speaker_names):
+        speaker = utterance.get("speaker") or "Unknown"
+        if speaker not in labels:
+            labels[speaker] = resolve_speaker_name(speaker, speaker_names)
+    return labels
+
+
+def current_speaker_labels(recorded: Dict[str, str], speaker_names: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Libellés actuels des locuteurs d'un compte rendu, d'après les noms personnalisés en base."""
+    return {speaker: resolve_speaker_name(speaker, speaker_names) for speaker in recorded}
+
+
+def rewrite_summary_speakers(summary_text: str, recorded: Dict[str, str], current: Dict[str, str]) -> Optional[str]:
+    """
+    Remplace les libellés enregistrés par les libellés actuels dans le texte du compte rendu.
+
+    Returns:
+        Le texte réécrit (inchangé si aucun libellé n'a changé), ou None si la substitution
+        est ambiguë et qu'il faut régénérer le compte rendu.
+    """
+    changes: Dict[str, str] = {}
+    for speaker, old_label in recorded.items():
+        new_label = current.get(speaker, old_label)
+        if new_label == old_label:
+            continue
+        if changes.get(old_label, new_label) != new_label:
+            # Deux locuteurs affichés sous le même libellé et renommés différemment
+            return None
+        changes[old_label] = new_label
+    if not changes:
+        return summary_text
+
+    old_labels = list(recorded.values())
+    for old_label in changes:
+        if len(old_label.strip()) < _MIN_LABEL_LENGTH or old_labels.count(old_label) > 1:
+            return None
+        # "Jean" dans "Jean Dupont": impossible de savoir à qui se rapporte une occurrence
+        pattern = re.compile(_bounded(old_label))
+        if any(other != old_label and pattern.search(other) for other in old_labels):
+            return None
+
+    # Libellés les plus longs d'abord pour que l'alternance préfère la correspondance complète
+    pattern = re.compile("|".join(_bounded(label) for label in sorted(changes, key=len, reverse=True)))
+    return pattern.sub(lambda match: changes[match.group(0)], summary_text)
+
+
+async def propagate_speaker_names_async(
+    meeting_id: str,
+    user_id: str,
+    previous_names: Optional[Dict[str, str]] = None,
+) -> Optional[str]:
+    """
+    Reporte les noms personnalisés actuels dans le compte rendu stocké d'une réunion.
+
+    Args:
+        previous_names: Noms personnalisés avant la modification, pour les comptes rendus
+            générés avant l'enregistrement des libellés
+
+    Returns:
+        'rewritten', 'unchanged', 'pending' (génération en cours, reportée à son
+        enregistrement), 'regenerating' (substitution ambiguë) ou None (réunion introuvable)
+    """
+    from ..db.postgres_meetings import sync_summary_speaker_labels_async
+    from .summary_worker import enqueue_summary
+
+    result = await sync_summary_speaker_labels_async(meeting_id, user_id, previous_names)
+    if result is None:
+        return None
+    outcome = result["outcome"]
+    if outcome == "ambiguous":
+        # Même client et même template que la génération précédente
+        logger.info(f"Renommage ambigu dans le compte rendu de la réunion {meeting_id}: régénération")
+        job = await enqueue_summary(meeting_id, user_id, result["client_id"], result["template_type"])
+        return "regenerating" if job else "pending"
+    if outcome == "rewritten":
+        logger.info(
+            f"Noms des locuteurs reportés dans le compte rendu de la réunion {meeting_id} "
+            f"(révision {result['summary_revision']})"
+        )
+    return outcome
@@ -0,0 +1,266 @@
+"""
+Registre des templates de comptes rendus.
+
+Les templates intégrés (par défaut, formation) et les templates clients sont découpés
+une seule fois en segments fixes et en emplacements (`{transcript_text}`,
+`{meeting_title}`...). Un prompt est ensuite assemblé par une seule concaténation,
+sans reconstruire les textes ni enchaîner les `str.replace`.
+
+Les templates clients sont mis en cache par client; `update_client` et `delete_client`
+invalident l'entrée du processus courant, et une durée de vie courte
+(CLIENT_TEMPLATE_CACHE_TTL) borne le délai de prise en compte dans les autres workers.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from ..core.config import settings
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Emplacements reconnus dans les templates; toute autre accolade reste littérale
+_SLOT_PATTERN = re.compile(r"\{(transcript_text|meeting_title|title_part|title_heading)\}")
+
+
+class SummaryTemplate:
+    """Template pré-découpé: segments fixes entrecoupés d'emplacements nommés."""
+
+    def __init__(self, name: str, text: str, slots: Tuple[str, ...]):
+        self.name = name
+        self.text = text
+        self.parts: List[str] = []
+        self.slots: List[Optional[str]] = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(text):
+            if match.group(1) not in slots:
+                continue
+            self.parts.append(text[position:match.start()])
+            self.slots.append(match.group(1))
+            position = match.end()
+        self.parts.append(text[position:])
+        self.slots.append(None)
+
+    def render(self, transcript_text: str, meeting_title: Optional[str] = None) -> str:
+        values = {
+            "transcript_text": transcript_text,
+            # Sans titre, l'emplacement {meeting_title} d'un template client reste tel quel
+            "meeting_title": meeting_title if meeting_title else "{meeting_title}",
+            "title_part": f" intitulée '{meeting_title}'" if meeting_title else "",
+            "title_heading": f" — '{meeting_title}'" if meeting_title else "",
+        }
+        pieces: List[str] = []
+        for part, slot in zip(self.parts, self.slots):
+            pieces.append(part)
+            if slot is not None:
+                pieces.append(values[slot])
+        return "".join(pieces)
+
+
+_FORMATION_TEMPLATE = """Objectif :
+À partir d'une transcription d'une session de formation, produire un compte rendu PEDAGOGIQUE, FACTUEL et EXHAUSTIF des points réellement abordés.
+
+RÈGLES STRICTES (à respecter à 100%) :
+- NE JAMAIS inventer d'information. Aucune supposition. Aucune hallucination.
+- Interdire les formulations d'incertitude: pas de "peut-être", "semble", "probablement", "on dirait", "?" ajouté en fin de phrase.
+- N'inclure un prénom/noms propres que s'ils sont clairement et explicitement énoncés comme tels dans la transcription; sinon, anonymiser (ex: "Participant A", "Participant B").
+- Si une information n'est pas présente, écrire exactement "Non mentionné".
+- Résumer précisément chaque point important; couvrir toutes les questions posées et leurs réponses, même brèves.
+- Français clair, phrases concises; éviter le verbiage. Pas de placeholders.
+- Sortie uniquement en Markdown, sections dans l'ordre ci‑dessous, sans texte superflu.
+
+FORMAT EXACT ATTENDU :
+
+# 🎓 Session de formation{title_heading}
+
+- 👥 **Participants** : [Liste ou "Non mentionné"]
+- 🧑‍🏫 **Formateur** : [Nom ou "Non mentionné"]
+- 🕒 **Durée estimée** : [Durée ou "Non mentionné"]
+
+---
+
+## 🎯 Objectifs pédagogiques
+- [Objectif 1]
+- [Objectif 2]
+
+---
+
+## 🧠 Points clés appris
+- [Point 1]
+- [Point 2]
+
+---
+
+## ❓ Questions & Réponses (Q/R)
+- Q: [Question 1]
+  R: [Réponse 1]
+- Q: [Question 2]
+  R: [Réponse 2]
+
+---
+
+## 🧪 Exercices / Démonstrations
+| Exercice | Compétences visées | Résultat |
+|----------|--------------------|----------|
+| [Nom] | [Compétences] | [Résultat] |
+
+---
+
+## 🔜 Actions / Mise en pratique
+- [Action 1] — Responsable: [Nom ou "Non mentionné"] — Échéance: ["Non mentionné" si absente]
+- [Action 2]
+
+---
+
+## 📚 Ressources citées
+- [Ressource 1]
+- [Ressource 2]
+
+Consignes supplémentaires :
+- Écarter les bruits/verbatim hors sujet.
+- Préserver le sens exact des décisions/conclusions.
+- Ne jamais conserver de crochets si l'information réelle est disponible.
+
+Transcription :
+
+{transcript_text}
+"""
+
+_DEFAULT_TEMPLATE = """Objectif :
+À partir d'une transcription brute d'une réunion, produire un compte rendu EXACTEMENT selon le format d'exemple fourni ci-dessous, intégrant précisément les emojis, les titres, les tableaux, et le style montrés.
+
+VOICI UN EXEMPLE EXACT DU FORMAT DE SORTIE QUE TU DOIS REPRODUIRE :
+
+# 📅 Réunion du [date inconnue ou date exacte si mentionnée] u2014 [Titre de la réunion ou sujet principal]
+
+- 👥 **Participants** : [Liste des participants]
+- ✏️ **Animateur/trice** : [Nom de l'animateur si identifiable]
+- 🕒 **Durée estimée** : [Durée si mentionnée]
+
+---
+
+## 🧠 Résumé express
+Un paragraphe de 3-4 lignes résumant l'essentiel de la réunion.
+
+---
+
+## 🗂️ Ordre du jour *(reconstruit)*
+1. 📡 [Premier point]
+2. 💰 [Deuxième point]
+3. 👤 [Troisième point]
+4. ⏱️ [Quatrième point]
+
+---
+
+## ✅ Décisions prises
+- 🔒 [Décision 1] *([Nom de la personne])*
+- 💰 [Décision 2] *([Nom de la personne])*
+- 👥 [Décision 3] *([Nom de la personne])*
+
+---
+
+## 🔜 Tâches & actions à suivre
+
+| 📌 Tâche | 👤 Responsable | ⏳ Échéance | 🔗 Liée à |
+|------------------|----------------|----------------|-----------|
+| [Description tâche 1] | [Responsable] | [Échéance] | [Lien] |
+| [Description tâche 2] | [Responsable] | [Échéance] | [Lien] |
+
+---
+
+## ⚠️ Points de vigilance
+- ⚠️ [Point de vigilance 1]
+- 🔄 [Point de vigilance 2]
+
+---
+
+## 🧵 Sujets abordés
+
+| 💬 Sujet | 🗣️ Intervenants |
+|-------------|------------------------|
+| [Sujet 1] | [Liste des intervenants] |
+| [Sujet 2] | [Liste des intervenants] |
+| [Sujet 3] | [Liste des intervenants] |
+| [Sujet 4] | [Liste des intervenants] |
+
+---
+
+## 📚 Ressources mentionnées
+- [Ressource 1]
+- [Ressource 2]
+- [Ressource 3]
+
+---
+
+## 🗓️ Prochaine réunion
+📍 [Date et heure de la prochaine réunion si mentionnée]
+
+UTILISE EXACTEMENT CE FORMAT, avec les mêmes emojis et la même mise en page, mais REMPLACE TOUS LES PLACEHOLDERS ENTRE CROCHETS par les informations réelles extraites de la transcription. Ne laisse AUCUN texte du type '[Premier point]' ou '[Sujet 1]' dans ta réponse. Si tu n'as pas l'information pour une section, indique-le clairement (ex: "Non mentionné" ou "Aucun point identifié"), mais NE CONSERVE PAS les placeholders entre crochets.
+
+Voici la transcription d'une réunion{title_part} :
+
+{transcript_text}
+"""
+
+# Templates intégrés, découpés au chargement du module
+BUILTIN_TEMPLATES: Dict[str, SummaryTemplate] = {
+    "default": SummaryTemplate("default", _DEFAULT_TEMPLATE, ("title_part", "transcript_text")),
+    "formation": SummaryTemplate("formation", _FORMATION_TEMPLATE, ("title_heading", "transcript_text")),
+}
+
+# (client_id, user_id) -> (expiration, template ou None si le client n'en a pas)
+_client_templates: Dict[Tuple[str, str], Tuple[float, Optional[SummaryTemplate]]] = {}
+_client_templates_lock = threading.Lock()
+
+
+def _load_client_template(client_id: str, user_id: str) -> Optional[SummaryTemplate]:
+    # Importer ici pour éviter les imports circulaires
+    from ..db.postgres_clients import get_client
+
+    client = get_client(client_id, user_id)
+    if client and client.get("summary_template"):
+        logger.info(f"Template de résumé trouvé pour le client {client_id}")
+        return SummaryTemplate(f"client:{client_id}", client["summary_template"], ("transcript_text", "meeting_title"))
+    logger.info(f"Aucun template de résumé trouvé pour le client {client_id}")
+    return None
+
+
+def get_client_summary_template(client_id: Optional[str], user_id: Optional[str]) -> Optional[SummaryTemplate]:
+    """Template pré-découpé d'un client (None si le client n'a pas de template personnalisé)."""
+    if not client_id or not user_id:
+        return None
+
+    key = (str(client_id), str(user_id))
+    now = time.monotonic()
+    with _client_templates_lock:
+        entry = _client_templates.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    template = _load_client_template(*key)
+    with _client_templates_lock:
+        _client_templates[key] = (now + settings.CLIENT_TEMPLATE_CACHE_TTL, template)
+    return template
+
+
+def invalidate_client_template(client_id: str) -> None:
+    """Retire du cache le template d'un client modifié ou supprimé."""
+    with _client_templates_lock:
+        for key in [k for k in _client_templates if k[0] == str(client_id)]:
+            del _client_templates[key]
+
+
+def resolve_summary_template(
+    client_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+) -> SummaryTemplate:
+    """Template à utiliser: celui du client s'il existe, sinon le template intégré demandé ou par défaut."""
+    template = get_client_summary_template(client_id, user_id)
+    if template is not None:
+        return template
+    if template_type and template_type.lower() == "formation":
+        return BUILTIN_TEMPLATES["formation"]
+    return BUILTIN_TEMPLATES["default"]
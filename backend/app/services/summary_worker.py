@@ -0,0 +1,168 @@
+"""
+Pool de workers pour la file durable des comptes rendus (table `summary_jobs`).
+
+Chaque processus uvicorn démarre SUMMARY_WORKERS workers; le nombre total de
+générations simultanées reste plafonné par SUMMARY_MAX_RUNNING_JOBS, tous processus
+confondus. Les tâches en attente survivent aux redémarrages et les tâches d'un
+worker arrêté sont reprises à l'expiration de leur bail.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from ..core.config import settings
+from ..db.postgres_meetings import default_lease_owner
+from ..db.postgres_summary_jobs import (
+    claim_summary_jobs_async,
+    enqueue_summary_job_async,
+    extend_summary_job_lease_async,
+    fail_summary_job_async,
+    finish_summary_job_async,
+)
+
+logger = logging.getLogger("meeting-transcriber")
+
+
+# Statuts de compte rendu pour lesquels une consultation de la réunion déclenche la génération
+AUTO_SUMMARY_STATUSES = ("not_generated", "error")
+
+
+async def keep_summary_job_lease(job_id: int, owner: str, lease_seconds: int):
+    """Prolonge le bail d'une tâche tant qu'elle s'exécute (à annuler en fin de génération)."""
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await extend_summary_job_lease_async(job_id, owner, lease_seconds):
+            logger.warning(f"Bail perdu pour la tâche de compte rendu {job_id}")
+            return
+
+
+class SummaryWorkerPool:
+    """Workers asynchrones consommant la file des comptes rendus."""
+
+    def __init__(self, workers: int, poll_interval: float, lease_seconds: int):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.owner = default_lease_owner("summary-worker")
+        self.tasks: List[asyncio.Task] = []
+        self.wakeup: Optional[asyncio.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.tasks)
+
+    async def start(self):
+        if self.tasks:
+            logger.info("Le pool de génération des comptes rendus est déjà démarré")
+            return
+        self.wakeup = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        logger.info(f"Démarrage de {self.workers} worker(s) de génération des comptes rendus")
+        self.tasks = [asyncio.create_task(self._run_worker(i)) for i in range(self.workers)]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        for task in self.tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self.tasks = []
+
+    def notify(self):
+        """Réveille les workers locaux (nouvelle tâche ajoutée par ce processus, éventuellement depuis un thread)."""
+        if self.wakeup is None or self.loop is None or self.loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self.wakeup.set()
+        else:
+            self.loop.call_soon_threadsafe(self.wakeup.set)
+
+    async def _run_worker(self, index: int):
+        while True:
+            try:
+                jobs = await claim_summary_jobs_async(
+                    self.owner, 1, settings.SUMMARY_MAX_RUNNING_JOBS, self.lease_seconds
+                )
+                if jobs:
+                    await self._run_job(jobs[0])
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker de comptes rendus {index}: {e}")
+
+            # File vide (ou plafond atteint): attendre un réveil local ou l'intervalle de scrutation
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+
+    async def _run_job(self, job: Dict[str, Any]):
+        from .mistral_summary import process_meeting_summary_async
+
+        job_id = job["id"]
+        logger.info(
+            f"Génération du compte rendu pour la réunion {job['meeting_id']} "
+            f"(tâche {job_id}, tentative {job['attempts']}/{job['max_attempts']})"
+        )
+        heartbeat = asyncio.create_task(keep_summary_job_lease(job_id, self.owner, self.lease_seconds))
+        try:
+            success = await process_meeting_summary_async(
+                job["meeting_id"], job["user_id"], job.get("client_id"), job.get("template_type")
+            )
+        except Exception as e:
+            success = False
+            logger.error(f"Erreur lors de la tâche de compte rendu {job_id}: {e}")
+        finally:
+            heartbeat.cancel()
+
+        if success:
+            await finish_summary_job_async(job_id, self.owner)
+        else:
+            status = await fail_summary_job_async(
+                job_id, self.owner, "Échec de la génération du compte rendu", settings.SUMMARY_JOB_BACKOFF_SECONDS
+            )
+            logger.warning(f"Tâche de compte rendu {job_id} en échec, nouveau statut: {status}")
+
+
+# Instance singleton du pool
+summary_worker_pool = SummaryWorkerPool(
+    settings.SUMMARY_WORKERS, settings.SUMMARY_POLL_INTERVAL, settings.SUMMARY_JOB_LEASE_SECONDS
+)
+
+
+async def enqueue_summary(
+    meeting_id: str,
+    user_id: str,
+    client_id: Optional[str] = None,
+    template_type: Optional[str] = None,
+    only_if_statuses: Optional[Sequence[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Ajoute une génération à la file durable (dédupliquée par réunion) et réveille les workers.
+    Voir enqueue_summary_job_async pour `only_if_statuses` (None si la réunion n'a pas été prise).
+    """
+    job = await enqueue_summary_job_async(
+        meeting_id, user_id, client_id, template_type, only_if_statuses=only_if_statuses
+    )
+    if job and job["created"]:
+        summary_worker_pool.notify()
+    return job
+
+
+async def start_summary_workers():
+    await summary_worker_pool.start()
+
+
+async def stop_summary_workers():
+    await summary_worker_pool.stop()
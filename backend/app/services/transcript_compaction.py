@@ -0,0 +1,188 @@
+"""
+Compaction des transcriptions avant l'appel au modèle de résumé.
+
+Les transcriptions diarisées contiennent beaucoup de texte facturé sans valeur pour
+le compte rendu: hésitations ("euh", "hum"), marqueurs de discours isolés ("voilà",
+"du coup"), relances d'une syllabe ("oui", "mmh") qui coupent les tours de parole, et
+un libellé de locuteur répété à chaque ligne. La compaction:
+
+1. supprime le lexique de remplissage français;
+2. retire les relances courtes (un acquiescement qui répond à un autre locuteur est
+   conservé: il porte un accord);
+3. fusionne les interventions consécutives d'un même locuteur, jamais par-dessus
+   l'intervention retirée d'un autre locuteur;
+4. remplace les libellés longs par des alias courts, avec une légende en tête.
+
+Les textes sont traités en un seul bloc (une passe d'expression régulière par règle
+sur l'ensemble des utterances) et les filtres/fusions sont des masques NumPy.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from .summary_chunking import estimate_tokens
+from .utterances import parse_transcript_text, resolve_speaker_name
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Séparateur des utterances dans le bloc de texte (caractère privé, ni espace ni ponctuation)
+_SEP = "\ue000"
+
+# Hésitations: supprimées où qu'elles apparaissent
+_HESITATIONS = re.compile(
+    r"\b(?:euh+|heu+|euhm+|hum+|hm+|mm+h*|bah|beh)\b[,.…]*\s*",
+    re.IGNORECASE,
+)
+
+# Marqueurs de discours: supprimés seulement lorsqu'ils forment une incise isolée
+# (début d'utterance ou après une ponctuation, et suivis d'une ponctuation)
+_MARKERS = re.compile(
+    r"(?:^|(?<=\ue000)|(?<=[,.;!?…] ))(?:bon ben|bon|ben|voilà|du coup|en fait|enfin|quoi)\s*[,.…]+\s*",
+    re.IGNORECASE,
+)
+_TRAILING_MARKERS = re.compile(r",\s*(?:quoi|voilà|tu vois|vous voyez)(?=[.!?…]|\ue000|$)", re.IGNORECASE)
+
+# Nettoyage après suppression
+_SPACES = re.compile(r"[ \t]{2,}")
+_SPACE_BEFORE_COMMA = re.compile(r" +(?=[,.])")
+_LEADING_PUNCT = re.compile(r"(?:^|(?<=\ue000))[\s,.…]+")
+
+# Relances sans contenu informatif
+_BACKCHANNELS = frozenset({
+    "ah", "oh", "ah oui", "ah ok", "mmh", "mh", "hm", "hum", "voilà", "je vois", "merci", "",
+})
+# Acquiescements: une relance tant que le locuteur précédent est le même (ou absent),
+# un accord à conserver lorsqu'ils répondent à l'intervention d'un autre locuteur.
+# Les négations ("non", "non non") ne sont jamais retirées.
+_ASSENTS = frozenset({
+    "oui", "ouais", "ok", "okay", "d'accord", "ah d'accord", "exactement", "tout à fait",
+    "bien sûr", "super", "parfait", "très bien", "ok d'accord", "oui oui",
+})
+_NORMALIZE = re.compile(r"[^\w' ]+")
+
+
+def _strip_fillers(texts: List[str]) -> List[str]:
+    """Applique le lexique de remplissage à toutes les utterances en une passe par règle."""
+    blob = _SEP.join(t.replace(_SEP, " ") for t in texts)
+    blob = _HESITATIONS.sub("", blob)
+    blob = _TRAILING_MARKERS.sub("", blob)
+    blob = _MARKERS.sub("", blob)
+    blob = _SPACES.sub(" ", blob)
+    blob = _SPACE_BEFORE_COMMA.sub("", blob)
+    blob = _LEADING_PUNCT.sub("", blob)
+    return [t.strip() for t in blob.split(_SEP)]
+
+
+def _shorten_labels(labels: np.ndarray) -> Tuple[List[str], str]:
+    """
+    Remplace les libellés par des alias "L1", "L2"... si le gain dépasse le coût de la légende.
+    Retourne les libellés à afficher et la légende (vide si les libellés sont conservés).
+    """
+    unique, first_index, codes = np.unique(labels, return_index=True, return_inverse=True)
+    # Alias attribués dans l'ordre d'apparition
+    order = np.argsort(first_index, kind="stable")
+    alias_of = np.empty(len(unique), dtype=object)
+    alias_of[order] = [f"L{i + 1}" for i in range(len(unique))]
+
+    label_lengths = np.fromiter((len(label) for label in unique), dtype=np.int64, count=len(unique))
+    alias_lengths = np.fromiter((len(alias) for alias in alias_of), dtype=np.int64, count=len(unique))
+    legend = "Intervenants : " + " ; ".join(f"{alias_of[i]} = {unique[i]}" for i in order)
+    saved = int(np.sum((label_lengths - alias_lengths)[codes]))
+    if saved <= len(legend):
+        return list(labels), ""
+    return list(alias_of[codes]), legend
+
+
+def compact_transcript(transcript_text: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Compacte une transcription formatée ("Locuteur: texte" par ligne).
+
+    Returns:
+        (texte compacté, rapport {utterances_before, utterances_after, tokens_before,
+        tokens_after, reduction_pct})
+    """
+    tokens_before = estimate_tokens(transcript_text)
+    utterances = parse_transcript_text(transcript_text)
+    report: Dict[str, Any] = {
+        "utterances_before": len(utterances),
+        "utterances_after": len(utterances),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_before,
+        "reduction_pct": 0.0,
+    }
+    if not utterances:
+        return transcript_text, report
+
+    labels = np.array(
+        [resolve_speaker_name(u.get("speaker") or "Unknown") for u in utterances], dtype=object
+    )
+    texts = np.array(_strip_fillers([u.get("text") or "" for u in utterances]), dtype=object)
+
+    # Relances courtes: retirées sauf si elles répondent à une question d'un autre locuteur;
+    # un acquiescement qui répond à un autre locuteur est conservé
+    normalized = [_NORMALIZE.sub("", t.lower()).strip() for t in texts]
+    words = np.fromiter((len(n.split()) for n in normalized), dtype=np.int64, count=len(texts))
+    backchannel = np.fromiter((n in _BACKCHANNELS for n in normalized), dtype=bool, count=len(texts))
+    assent = np.fromiter((n in _ASSENTS for n in normalized), dtype=bool, count=len(texts))
+    asks = np.fromiter((t.rstrip().endswith("?") for t in texts), dtype=bool, count=len(texts))
+    replies = np.zeros(len(texts), dtype=bool)
+    replies[1:] = labels[1:] != labels[:-1]
+    answers_question = np.zeros(len(texts), dtype=bool)
+    answers_question[1:] = asks[:-1] & replies[1:]
+    lexical = backchannel | (assent & ~replies)
+    drop = (words == 0) | (lexical & (words <= settings.SUMMARY_BACKCHANNEL_MAX_WORDS) & ~answers_question)
+    if drop.all():
+        return transcript_text, report
+
+    # Tours de parole de la transcription d'origine: deux interventions d'un même locuteur
+    # séparées par celle (même retirée) d'un autre locuteur ne sont pas fusionnées
+    turns = np.cumsum(np.r_[False, labels[1:] != labels[:-1]])
+    labels, texts, turns = labels[~drop], texts[~drop], turns[~drop]
+
+    # Fusion des interventions consécutives d'un même tour
+    starts = np.flatnonzero(np.r_[True, turns[1:] != turns[:-1]])
+    merged = np.add.reduceat(texts + " ", starts)
+    texts = np.array([t.rstrip() for t in merged], dtype=object)
+    labels = labels[starts]
+
+    legend = ""
+    display = list(labels)
+    if settings.SUMMARY_SHORTEN_LABELS:
+        display, legend = _shorten_labels(labels)
+
+    lines = [f"{label}: {text}" for label, text in zip(display, texts)]
+    compacted = "\n".join(([legend, ""] if legend else []) + lines)
+
+    tokens_after = estimate_tokens(compacted)
+    report.update({
+        "utterances_after": len(lines),
+        "tokens_after": tokens_after,
+        "reduction_pct": round(100.0 * (tokens_before - tokens_after) / tokens_before, 1) if tokens_before else 0.0,
+    })
+    return compacted, report
+
+
+def compact_for_summary(transcript_text: str, meeting_id: Optional[str] = None) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Compaction configurable avant le prompt de résumé, avec journalisation du gain en tokens.
+
+    Returns:
+        (texte à résumer, rapport de compact_transcript ou None si la compaction n'a pas eu lieu)
+    """
+    if not settings.SUMMARY_COMPACTION_ENABLED or not transcript_text:
+        return transcript_text, None
+    label = f"la transcription de la réunion {meeting_id}" if meeting_id else "la transcription"
+    try:
+        compacted, report = compact_transcript(transcript_text)
+    except Exception as e:
+        logger.error(f"Erreur lors de la compaction de {label}: {e}")
+        return transcript_text, None
+    logger.info(
+        f"Compaction de {label}: {report['tokens_before']} -> {report['tokens_after']} tokens "
+        f"(-{report['reduction_pct']}%), {report['utterances_before']} -> {report['utterances_after']} interventions"
+    )
+    return compacted, report
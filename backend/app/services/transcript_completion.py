@@ -0,0 +1,180 @@
+"""
+Étape unique de finalisation d'une transcription AssemblyAI.
+
+Tous les chemins qui détectent la fin d'une transcription (vérification périodique,
+reprise au démarrage, consultation d'une réunion, relance manuelle) passent par
+`complete_transcript_async`. L'appelant prend d'abord le bail de la réunion (voir
+claim_meetings_async) tant que son statut est pending/processing : un seul appelant
+récupère le JSON du fournisseur, hors transaction et sans connexion du pool. Le résultat
+(métadonnées dans meetings, texte dans meeting_content) et la génération du résumé sont
+ensuite écrits dans une transaction courte qui vérifie à nouveau le statut. Les appels
+concurrents ou ultérieurs sont sans effet.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, Optional
+
+from ..db.postgres_database import get_db_connection
+from ..core.config import settings
+from ..db.postgres_meetings import _run, default_lease_owner, replace_meeting_utterances_async, store_meeting_content_async
+from ..db.postgres_summary_jobs import enqueue_summary_job_async
+from .utterances import extract_utterances, render_transcript
+
+logger = logging.getLogger("meeting-transcriber")
+
+# Statuts de résumé pour lesquels la fin de transcription déclenche une génération
+_SUMMARY_CLAIMABLE_STATUSES = (None, "not_generated", "error")
+
+
+async def _claim_for_check_async(meeting_id: str, user_id: str, owner: str) -> Optional[Dict[str, Any]]:
+    """
+    Prend le bail d'une réunion en attente (libre, expiré ou déjà détenu par `owner`),
+    validé avant l'appel au fournisseur. None si la réunion est finalisée ou sous le bail
+    d'un autre appelant.
+    """
+    async with get_db_connection() as conn:
+        row = await conn.fetchrow(
+            """
+            UPDATE meetings
+            SET lease_owner = $3, lease_expires_at = NOW() + make_interval(secs => $4)
+            WHERE id = $1 AND user_id = $2 AND transcript_status IN ('pending', 'processing')
+              AND (lease_expires_at IS NULL OR lease_expires_at < NOW() OR lease_owner = $3)
+            RETURNING transcript_id
+            """,
+            uuid.UUID(meeting_id), uuid.UUID(user_id), owner, float(settings.TRANSCRIPT_POLL_LEASE_SECONDS),
+        )
+    return dict(row) if row else None
+
+
+async def complete_transcript_async(
+    meeting_id: str,
+    user_id: str,
+    transcript_id: Optional[str] = None,
+    transcript_data: Optional[Dict[str, Any]] = None,
+    lease_owner: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Finalise une transcription si elle est encore en attente.
+
+    Args:
+        meeting_id: ID de la réunion
+        user_id: ID du propriétaire de la réunion
+        transcript_id: ID AssemblyAI (par défaut celui enregistré sur la réunion)
+        transcript_data: Réponse AssemblyAI déjà récupérée par l'appelant (évite un second appel)
+        lease_owner: Détenteur du bail déjà pris par l'appelant (worker de vérification);
+            sans bail, un bail propre à cet appel est pris avant d'interroger le fournisseur
+
+    Returns:
+        None si la réunion est déjà finalisée ou vérifiée par un autre appelant, sinon
+        {"status": statut AssemblyAI, "summary_claimed": bool}
+    """
+    from .transcription_checker import get_assemblyai_transcript_details
+
+    if transcript_data is None:
+        owner = lease_owner or f"{default_lease_owner('transcript-completion')}:{uuid.uuid4().hex[:8]}"
+        claimed = await _claim_for_check_async(meeting_id, user_id, owner)
+        if not claimed:
+            return None
+        transcript_id = transcript_id or claimed["transcript_id"]
+        if not transcript_id:
+            return {"status": "pending", "summary_claimed": False}
+        # Appel au fournisseur sans transaction ni connexion ouverte; le bail évite
+        # les vérifications concurrentes de la même réunion
+        transcript_data = await asyncio.to_thread(get_assemblyai_transcript_details, transcript_id)
+        if not transcript_data:
+            return {"status": "unknown", "summary_claimed": False}
+
+    status = transcript_data.get("status")
+    if status not in ("completed", "error"):
+        logger.info(f"Transcription {transcript_id} toujours en cours ({status})")
+        return {"status": status, "summary_claimed": False}
+
+    # Préparé hors transaction: seule l'écriture garde la ligne verrouillée
+    utterances = extract_utterances(transcript_data) if status == "completed" else []
+
+    summary_claimed = False
+    async with get_db_connection() as conn:
+        async with conn.transaction():
+            row = await conn.fetchrow(
+                """
+                SELECT transcript_id, summary_status
+                FROM meetings
+                WHERE id = $1 AND user_id = $2 AND transcript_status IN ('pending', 'processing')
+                FOR UPDATE
+                """,
+                uuid.UUID(meeting_id), uuid.UUID(user_id),
+            )
+            if not row:
+                # Finalisée entre-temps par un autre appelant
+                return None
+            transcript_id = transcript_id or row["transcript_id"]
+
+            if status == "error":
+                error_message = transcript_data.get("error", "Unknown error")
+                logger.error(f"Erreur de transcription pour {meeting_id}: {error_message}")
+                await conn.execute(
+                    """
+                    UPDATE meetings
+                    SET transcript_status = 'error', transcript_id = COALESCE(transcript_id, $2),
+                        lease_owner = NULL, lease_expires_at = NULL
+                    WHERE id = $1
+                    """,
+                    uuid.UUID(meeting_id), transcript_id,
+                )
+                await store_meeting_content_async(
+                    meeting_id, user_id, {"transcript_text": f"Erreur lors de la transcription: {error_message}"}, conn=conn
+                )
+                return {"status": status, "summary_claimed": False}
+
+            speaker_rows = await conn.fetch(
+                "SELECT speaker_id, custom_name FROM meeting_speakers WHERE meeting_id = $1",
+                uuid.UUID(meeting_id),
+            )
+            speaker_names = {r["speaker_id"]: r["custom_name"] for r in speaker_rows if r["custom_name"]}
+
+            speakers_count = len({u["speaker"] for u in utterances}) or 1
+            summary_claimed = row["summary_status"] in _SUMMARY_CLAIMABLE_STATUSES
+
+            await replace_meeting_utterances_async(meeting_id, utterances, conn=conn, bump_version=False)
+            await conn.execute(
+                """
+                UPDATE meetings
+                SET transcript_status = 'completed',
+                    duration_seconds = $2,
+                    speakers_count = $3,
+                    transcript_id = COALESCE(transcript_id, $4),
+                    transcript_version = transcript_version + 1,
+                    transcript_stale = FALSE,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE id = $1
+                """,
+                uuid.UUID(meeting_id),
+                int(transcript_data.get("audio_duration") or 0),
+                speakers_count,
+                transcript_id,
+            )
+            await store_meeting_content_async(
+                meeting_id, user_id, {"transcript_text": render_transcript(utterances, speaker_names)}, conn=conn
+            )
+            if summary_claimed:
+                await enqueue_summary_job_async(meeting_id, user_id, conn=conn)
+            logger.info(f"Transcription {transcript_id} finalisée pour la réunion {meeting_id} ({len(utterances)} utterances)")
+
+    if summary_claimed:
+        from .summary_worker import summary_worker_pool
+        summary_worker_pool.notify()
+    return {"status": "completed", "summary_claimed": summary_claimed}
+
+
+def complete_transcript(
+    meeting_id: str,
+    user_id: str,
+    transcript_id: Optional[str] = None,
+    transcript_data: Optional[Dict[str, Any]] = None,
+    lease_owner: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Version synchrone pour les threads de traitement et les scripts."""
+    return _run(complete_transcript_async(meeting_id, user_id, transcript_id, transcript_data, lease_owner))
@@ -30,83 +30,13 @@ def check_and_update_transcription(meeting: Dict[str, Any]) -> Dict[str, Any]:
     
     logger.info(f"Vérification de la transcription {transcript_id} pour la réunion {meeting.get('id')}")
     
-    # Vérifier le statut auprès d'AssemblyAI
-    transcript_data = get_assemblyai_transcript_details(transcript_id)
-    if not transcript_data:
-        return meeting
-    
-    status = transcript_data.get('status')
-    logger.info(f"Statut de la transcription {transcript_id}: {status}")
-    
-    # Si la transcription est terminée, mettre à jour les données de la réunion
-    if status == 'completed':
-        logger.info(f"Transcription {transcript_id} terminée, mise à jour des données de la réunion")
-        
-        # Extraire le texte de la transcription
-        transcript_text = transcript_data.get('text', '')
-        
-        # Formater avec les locuteurs si disponibles
-        if 'utterances' in transcript_data and transcript_data['utterances']:
-            try:
-                # Récupérer les noms personnalisés des locuteurs s'ils existent
-                speaker_names = {}
-                meeting_id = meeting.get('id')
-                user_id = meeting.get('user_id')
-                
-                # Import ici pour éviter les imports circulaires
-                from ..db.postgres_meetings import get_meeting_speakers
-                speakers_data = get_meeting_speakers(meeting_id, user_id)
-                
-                if speakers_data:
-                    for speaker in speakers_data:
-                        speaker_names[speaker['speaker_id']] = speaker['custom_name']
-                
-                # Formater le texte avec les noms personnalisés si disponibles
-                transcript_text = format_transcript_text(transcript_data, speaker_names)
-                
-                # Calculer le nombre de locuteurs
-                speakers_set = set()
-                for utterance in transcript_data.get('utterances', []):
-                    speakers_set.add(utterance.get('speaker', 'Unknown'))
-                
-                speakers_count = len(speakers_set) if speakers_set else 1
-            except Exception as e:
-                logger.error(f"Erreur lors du formatage du texte: {str(e)}")
-                transcript_text = format_transcript_text(transcript_data)  # Fallback au format standard
-                speakers_count = 1
-        else:
-            speakers_count = 1
-        
-        # Mettre à jour les données de la réunion
-        meeting['transcript_status'] = 'completed'
-        meeting['transcript_text'] = transcript_text
-        meeting['duration_seconds'] = int(transcript_data.get('audio_duration', 0))
-        meeting['speakers_count'] = speakers_count
-        
-        # Mettre à jour la base de données
-        from ..db.postgres_meetings import update_meeting
-        update_meeting(meeting['id'], meeting['user_id'], {
-            "transcript_status": "completed",
-            "transcript_text": transcript_text,
-            "duration_seconds": int(transcript_data.get('audio_duration', 0)),
-            "speakers_count": speakers_count
-        })
-    
-    # Si la transcription est en erreur, mettre à jour le statut
-    elif status == 'error':
-        logger.error(f"Erreur de transcription pour {transcript_id}: {transcript_data.get('error')}")
-        
-        error_message = transcript_data.get('error', 'Unknown error')
-        meeting['transcript_status'] = 'error'
-        meeting['transcript_text'] = f"Erreur lors de la transcription: {error_message}"
-        
-        # Mettre à jour la base de données
-        from ..db.postgres_meetings import update_meeting
-        update_meeting(meeting['id'], meeting['user_id'], {
-            "transcript_status": "error",
-            "transcript_text": f"Erreur lors de la transcription: {error_message}"
-        })
+    # Import ici pour éviter les imports circulaires
+    from .transcript_completion import complete_transcript
+    from ..db.postgres_meetings import get_meeting
     
+    result = complete_transcript(str(meeting['id']), str(meeting['user_id']), transcript_id)
+    if result and result['status'] in ('completed', 'error'):
+        return get_meeting(str(meeting['id']), str(meeting['user_id'])) or meeting
     return meeting
 
 def get_assemblyai_transcript_details(transcript_id: str) -> Optional[Dict[str, Any]]:
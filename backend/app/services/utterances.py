@@ -0,0 +1,124 @@
+"""
+Représentation structurée des transcriptions (liste d'utterances).
+
+Les utterances sont stockées ligne par ligne dans la table `meeting_utterances`
+afin de pouvoir paginer, streamer et éditer une transcription sans manipuler
+l'intégralité du texte formaté.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+# Ligne formatée du type "Speaker A: Bonjour" ou "Jean Dupont: Bonjour"
+_LINE_PATTERN = re.compile(r'^([^:\n]{1,255}): ?(.*)$')
+
+# Identifiants de locuteurs attribués par AssemblyAI ("A", "B", ..., "AA")
+_PROVIDER_SPEAKER_ID = re.compile(r'^(?:[A-Z]{1,2}|Unknown)$')
+
+
+def is_provider_speaker_id(speaker: str) -> bool:
+    """Indique si le locuteur est un identifiant AssemblyAI (et non un libellé libre)."""
+    return bool(_PROVIDER_SPEAKER_ID.match(speaker or ""))
+
+
+def extract_utterances(transcript_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Extrait la liste des utterances d'une réponse AssemblyAI.
+
+    Args:
+        transcript_data: Réponse JSON complète d'AssemblyAI
+
+    Returns:
+        Liste de dictionnaires {speaker, text, start, end} (timestamps en millisecondes)
+    """
+    utterances = transcript_data.get('utterances') or []
+    if not utterances:
+        text = transcript_data.get('text') or ''
+        if not text:
+            return []
+        return [{
+            "speaker": "A",
+            "text": text,
+            "start": 0,
+            "end": int((transcript_data.get('audio_duration') or 0) * 1000) or None,
+        }]
+
+    result = []
+    for utterance in utterances:
+        result.append({
+            "speaker": utterance.get('speaker') or 'Unknown',
+            "text": utterance.get('text') or '',
+            "start": utterance.get('start'),
+            "end": utterance.get('end'),
+        })
+    return result
+
+
+def parse_transcript_text(transcript_text: Optional[str], speaker_names: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Reconstruit une liste d'utterances à partir d'un texte déjà formaté.
+
+    Utilisé pour les réunions antérieures au stockage structuré : les timestamps
+    ne sont pas disponibles. Les noms personnalisés connus sont ramenés à leur
+    identifiant de locuteur; sinon le libellé affiché sert d'identifiant.
+    """
+    if not transcript_text:
+        return []
+
+    reverse_names = {}
+    for speaker_id, custom_name in (speaker_names or {}).items():
+        if custom_name:
+            reverse_names[custom_name] = speaker_id[len("Speaker "):] if speaker_id.startswith("Speaker ") else speaker_id
+
+    result: List[Dict[str, Any]] = []
+    for line in transcript_text.split("\n"):
+        if not line.strip():
+            continue
+        match = _LINE_PATTERN.match(line)
+        if match:
+            label, text = match.group(1).strip(), match.group(2)
+            if label in reverse_names:
+                speaker = reverse_names[label]
+            else:
+                speaker = label[len("Speaker "):] if label.startswith("Speaker ") else label
+            result.append({"speaker": speaker, "text": text, "start": None, "end": None})
+        elif result:
+            # Ligne de continuation: la rattacher à l'utterance précédente
+            result[-1]["text"] = f"{result[-1]['text']}\n{line}"
+        else:
+            result.append({"speaker": "A", "text": line, "start": None, "end": None})
+    return result
+
+
+def resolve_speaker_name(speaker_id: str, speaker_names: Optional[Dict[str, str]] = None) -> str:
+    """
+    Retourne le libellé affiché pour un locuteur, en appliquant les noms personnalisés
+    (clé simple "A" ou clé complète "Speaker A"), comme format_transcript_text.
+    """
+    speaker_names = speaker_names or {}
+    if speaker_id in speaker_names:
+        return speaker_names[speaker_id]
+    full_speaker_id = f"Speaker {speaker_id}"
+    if full_speaker_id in speaker_names:
+        return speaker_names[full_speaker_id]
+    return full_speaker_id if is_provider_speaker_id(speaker_id) else speaker_id
+
+
+def render_transcript(utterances: List[Dict[str, Any]], speaker_names: Optional[Dict[str, str]] = None) -> str:
+    """Produit le texte formaté "Locuteur: texte" à partir des utterances."""
+    return "\n".join(
+        f"{resolve_speaker_name(u.get('speaker') or 'Unknown', speaker_names)}: {u.get('text') or ''}"
+        for u in utterances
+    )
+
+
+def serialize_utterance(index: int, utterance: Dict[str, Any], speaker_names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Représentation JSON d'une utterance pour l'API."""
+    return {
+        "index": index,
+        "speaker": utterance.get("speaker"),
+        "speaker_name": resolve_speaker_name(utterance.get("speaker") or "Unknown", speaker_names),
+        "text": utterance.get("text") or "",
+        "start": utterance.get("start"),
+        "end": utterance.get("end"),
+    }
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Banc d'essai de la génération des comptes rendus.
+
+Crée N réunions synthétiques (transcription terminée) pour un utilisateur de test, les fait
+passer par process_meeting_summary_async avec une concurrence donnée, puis affiche le
+débit, les latences p50/p95 et la concurrence observée côté fournisseur. Les réunions
+sont supprimées à la fin.
+
+À utiliser avec le serveur de substitution (aucun crédit Mistral consommé):
+    python llm_standin_server.py &
+    python benchmark_summaries.py --meetings 50 --concurrency 8 --standin
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+import urllib.request
+import uuid
+
+BENCH_EMAIL = "benchmark@example.local"
+
+_PHRASES = [
+    "euh on reprend le point sur le budget du trimestre",
+    "du coup, il faut valider la livraison avant vendredi",
+    "oui",
+    "je propose qu'on décale la revue client à la semaine prochaine",
+    "mmh",
+    "voilà, le document est partagé dans le dossier projet",
+    "qui prend l'action sur le suivi des risques ?",
+    "je m'en occupe, échéance fin du mois",
+    "d'accord",
+    "en fait le planning dépend de la validation du contrat",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Banc d'essai de la génération des comptes rendus")
+    parser.add_argument("--meetings", type=int, default=20, help="Nombre de réunions synthétiques")
+    parser.add_argument("--concurrency", type=int, default=4, help="Générations simultanées côté application")
+    parser.add_argument("--utterances", type=int, default=300, help="Interventions par transcription")
+    parser.add_argument("--standin", action="store_true", help="Utiliser le serveur de substitution local")
+    parser.add_argument("--api-url", default=None, help="URL de l'API de chat (remplace MISTRAL_API_URL)")
+    parser.add_argument("--reuse-cache", action="store_true", help="Transcriptions identiques d'un lancement à l'autre (cache)")
+    parser.add_argument("--json", action="store_true", help="Afficher le rapport en JSON")
+    return parser.parse_args()
+
+
+def synthetic_transcript(rng: random.Random, utterances: int) -> str:
+    speakers = ["A", "B", "C", "D"]
+    return "\n".join(
+        f"Speaker {rng.choice(speakers)}: {rng.choice(_PHRASES)}" for _ in range(utterances)
+    )
+
+
+def provider_stats(api_url: str, reset: bool = False):
+    """Compteurs du serveur de substitution (None pour un autre fournisseur)."""
+    if not api_url.endswith("/v1/chat/completions"):
+        return None
+    url = api_url[:-len("/v1/chat/completions")] + ("/stats/reset" if reset else "/stats")
+    try:
+        request = urllib.request.Request(url, method="POST" if reset else "GET")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+
+async def run(args):
+    import numpy as np
+    from app.core.config import settings
+    from app.db.postgres_database import get_db_connection, close_connections
+    from app.services.llm_client import close_llm_client
+    from app.services.mistral_summary import process_meeting_summary_async
+
+    async with get_db_connection() as conn:
+        user_id = await conn.fetchval("SELECT id FROM users WHERE email = $1", BENCH_EMAIL)
+        if user_id is None:
+            user_id = await conn.fetchval(
+                "INSERT INTO users (id, email, hashed_password, full_name) VALUES ($1, $2, '', 'Benchmark') RETURNING id",
+                uuid.uuid4(), BENCH_EMAIL,
+            )
+        rng = random.Random(0 if args.reuse_cache else time.time_ns())
+        meeting_ids = []
+        for i in range(args.meetings):
+            meeting_ids.append(await conn.fetchval(
+                """
+                WITH meeting AS (
+                    INSERT INTO meetings (user_id, title, file_url, transcript_status, summary_status)
+                    VALUES ($1, $2, 'benchmark://synthetic', 'completed', 'not_generated')
+                    RETURNING id, user_id, created_at
+                )
+                INSERT INTO meeting_content (meeting_id, meeting_created_at, user_id, transcript_text)
+                SELECT id, created_at, user_id, $3 FROM meeting
+                RETURNING meeting_id
+                """,
+                user_id, f"Benchmark {i + 1}", synthetic_transcript(rng, args.utterances),
+            ))
+
+    provider_stats(settings.MISTRAL_API_URL, reset=True)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, failures = [], 0
+
+    async def _one(meeting_id):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            ok = await process_meeting_summary_async(str(meeting_id), str(user_id))
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                failures += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(_one(m) for m in meeting_ids))
+        elapsed = time.perf_counter() - started
+    finally:
+        async with get_db_connection() as conn:
+            await conn.execute("DELETE FROM meetings WHERE id = ANY($1::uuid[])", meeting_ids)
+
+    values = np.array(latencies) if latencies else np.zeros(1)
+    report = {
+        "api_url": settings.MISTRAL_API_URL,
+        "meetings": args.meetings,
+        "concurrency": args.concurrency,
+        "succeeded": len(latencies),
+        "failed": failures,
+        "elapsed_seconds": round(elapsed, 2),
+        "throughput_per_minute": round(60 * len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_seconds": round(float(np.percentile(values, 50)), 3),
+        "latency_p95_seconds": round(float(np.percentile(values, 95)), 3),
+        "latency_max_seconds": round(float(values.max()), 3),
+        "provider": provider_stats(settings.MISTRAL_API_URL),
+    }
+    await close_llm_client()
+    await close_connections()
+    return report
+
+
+def main():
+    args = parse_args()
+    # Les settings sont lus à l'import: configurer l'URL du fournisseur avant d'importer l'application
+    if args.api_url or args.standin:
+        port = os.getenv("LLM_STANDIN_PORT", "8090")
+        os.environ["MISTRAL_API_URL"] = args.api_url or f"http://127.0.0.1:{port}/v1/chat/completions"
+        os.environ.setdefault("MISTRAL_API_KEY", "standin")
+    logging.basicConfig(level=logging.WARNING)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    print(f"Fournisseur           : {report['api_url']}")
+    print(f"Réunions              : {report['succeeded']}/{report['meetings']} réussies ({report['failed']} échecs)")
+    print(f"Concurrence (app)     : {report['concurrency']}")
+    print(f"Durée totale          : {report['elapsed_seconds']} s")
+    print(f"Débit                 : {report['throughput_per_minute']} comptes rendus/min")
+    print(f"Latence p50 / p95     : {report['latency_p50_seconds']} s / {report['latency_p95_seconds']} s")
+    if report["provider"]:
+        provider = report["provider"]
+        print(f"Concurrence fournisseur (max) : {provider['peak_in_flight']}")
+        print(f"Requêtes fournisseur  : {provider['requests']} (429: {provider['rate_limited']}, erreurs injectées: {provider['injected_errors']})")
+        print(f"Tokens prompt / sortie: {provider['prompt_tokens']} / {provider['completion_tokens']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Construction incrémentale des index de recherche sémantique (voir app/services/semantic_index.py).
+
+Vectorise les passages des transcriptions terminées qui ne sont pas encore indexées,
+retire les réunions supprimées ou retranscrites et compacte les index si nécessaire.
+À lancer périodiquement (cron) hors du processus de l'API; un utilisateur dont l'index
+est déjà en construction est ignoré.
+
+    python build_semantic_index.py
+    python build_semantic_index.py --user-id 5f0c...
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("semantic-index")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Met à jour les index de recherche sémantique")
+    parser.add_argument("--user-id", action="append", default=None, help="Limiter à cet utilisateur (répétable)")
+    return parser.parse_args()
+
+
+async def run(args):
+    from app.db.postgres_database import close_connections, get_db_connection
+    from app.services.semantic_index import sync_user_index_async
+
+    if args.user_id:
+        user_ids = args.user_id
+    else:
+        async with get_db_connection() as conn:
+            user_ids = [str(r["id"]) for r in await conn.fetch("SELECT id FROM users ORDER BY created_at")]
+
+    failures = 0
+    for user_id in user_ids:
+        try:
+            stats = await sync_user_index_async(user_id)
+        except Exception as e:
+            failures += 1
+            logger.error(f"Utilisateur {user_id}: {e}")
+            continue
+        if stats["busy"]:
+            logger.info(f"Utilisateur {user_id}: construction déjà en cours, ignoré")
+        elif stats["added"] or stats["removed"]:
+            logger.info(
+                f"Utilisateur {user_id}: {stats['added']} réunion(s) indexée(s) ({stats['passages']} passages), "
+                f"{stats['removed']} retirée(s)" + (", index compacté" if stats["compacted"] else "")
+            )
+    await close_connections()
+    logger.info(f"{len(user_ids)} utilisateur(s) traité(s), {failures} échec(s)")
+    return failures
+
+
+def main():
+    args = parse_args()
+    failures = asyncio.run(run(args))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
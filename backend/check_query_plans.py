@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Vérification des plans d'exécution des requêtes fréquentes (CI).
+
+Lance EXPLAIN sur chaque requête chaude de l'application et échoue (code 1) si l'un
+des plans contient un parcours séquentiel. Les parcours séquentiels sont désactivés
+pour la session (enable_seqscan = off): le planificateur ne les choisit alors que si
+aucun index ne peut servir la requête, ce qui rend le contrôle fiable même sur une
+base vide.
+
+    alembic upgrade head
+    python check_query_plans.py
+"""
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vérifie que les requêtes fréquentes utilisent un index")
+    parser.add_argument("--database-url", default=None, help="URL PostgreSQL (remplace DATABASE_URL)")
+    parser.add_argument("--verbose", action="store_true", help="Afficher le plan de chaque requête")
+    return parser.parse_args()
+
+
+def hot_queries():
+    """(nom, requête, paramètres d'exemple) des requêtes dont le plan est vérifié."""
+    from app.db.postgres_meetings import MEETING_CARDS_SQL, MEETING_SEARCH_SQL, meeting_select
+
+    user_id = uuid.uuid4()
+    meeting_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    return [
+        (
+            "réunions d'un utilisateur",
+            f"{meeting_select()} WHERE m.user_id = $1 ORDER BY m.created_at DESC",
+            [user_id],
+        ),
+        (
+            "réunions d'un utilisateur avec leurs textes",
+            f"{meeting_select(include_content=True)} WHERE m.user_id = $1 ORDER BY m.created_at DESC",
+            [user_id],
+        ),
+        (
+            "cartes de réunions (première page)",
+            MEETING_CARDS_SQL,
+            [user_id, None, None, None, None, 51, 200],
+        ),
+        (
+            "cartes de réunions (page suivante)",
+            MEETING_CARDS_SQL,
+            [user_id, "completed", None, now, meeting_id, 51, 200],
+        ),
+        (
+            "recherche dans les réunions (première page)",
+            MEETING_SEARCH_SQL,
+            [user_id, "budget", None, None, None, 21, 50000, ""],
+        ),
+        (
+            "recherche dans les réunions d'un client (page suivante)",
+            MEETING_SEARCH_SQL,
+            [user_id, "budget", uuid.uuid4(), 0.5, meeting_id, 21, 50000, ""],
+        ),
+        (
+            "réunion d'un utilisateur",
+            f"{meeting_select(include_content=True)} WHERE m.id = $1 AND m.user_id = $2",
+            [meeting_id, user_id],
+        ),
+        (
+            "transcriptions en attente",
+            f"{meeting_select()} WHERE m.transcript_status = 'pending' AND m.created_at > $1",
+            [now - timedelta(hours=24)],
+        ),
+        (
+            "réunions en cours de transcription",
+            f"""
+            {meeting_select()}
+            WHERE m.transcript_status = $1 AND m.created_at > $2
+            ORDER BY m.created_at DESC
+            """,
+            ["processing", now - timedelta(hours=72)],
+        ),
+        (
+            "prise de bail des transcriptions",
+            """
+            SELECT id FROM meetings
+            WHERE transcript_status = ANY($1::text[])
+              AND created_at > $2
+              AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+            ORDER BY created_at
+            LIMIT $3
+            """,
+            [["processing"], now - timedelta(hours=72), 20],
+        ),
+        (
+            "comptes rendus bloqués en génération",
+            "SELECT id, user_id FROM meetings WHERE summary_status = 'processing' AND created_at < $1",
+            [now - timedelta(hours=1)],
+        ),
+        (
+            "locuteurs d'une réunion",
+            "SELECT * FROM meeting_speakers WHERE meeting_id = $1 ORDER BY speaker_id",
+            [meeting_id],
+        ),
+        (
+            "nom d'un locuteur",
+            "SELECT id FROM meeting_speakers WHERE meeting_id = $1 AND speaker_id = $2",
+            [meeting_id, "A"],
+        ),
+        (
+            "page d'utterances",
+            """
+            SELECT idx, speaker, text, start_ms, end_ms FROM meeting_utterances
+            WHERE meeting_id = $1 AND idx >= $2
+            ORDER BY idx
+            LIMIT $3
+            """,
+            [meeting_id, 0, 200],
+        ),
+        (
+            "clients d'un utilisateur",
+            "SELECT * FROM clients WHERE user_id = $1 ORDER BY name ASC",
+            [user_id],
+        ),
+        (
+            "tâches de compte rendu prêtes",
+            """
+            SELECT id FROM summary_jobs
+            WHERE status = 'queued' AND run_after <= NOW()
+            ORDER BY run_after, id
+            LIMIT $1
+            """,
+            [1],
+        ),
+    ]
+
+
+def sequential_scans(plan):
+    """Relations parcourues séquentiellement dans un plan EXPLAIN (FORMAT JSON)."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(sequential_scans(child))
+    return found
+
+
+async def run(args):
+    import asyncpg
+    from app.core.config import settings
+
+    conn = await asyncpg.connect(args.database_url or settings.DATABASE_URL)
+    failures = 0
+    try:
+        await conn.execute("SET enable_seqscan = off")
+        for name, sql, params in hot_queries():
+            raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *params)
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            scans = sequential_scans(plan)
+            if scans:
+                failures += 1
+                print(f"ÉCHEC  {name}: parcours séquentiel sur {', '.join(sorted(set(scans)))}")
+            else:
+                print(f"OK     {name}")
+            if args.verbose or scans:
+                print(json.dumps(plan, indent=2, ensure_ascii=False))
+    finally:
+        await conn.close()
+    return failures
+
+
+def main():
+    args = parse_args()
+    failures = asyncio.run(run(args))
+    if failures:
+        print(f"{failures} requête(s) sans index adapté")
+        return 1
+    print("Toutes les requêtes fréquentes utilisent un index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Lance le serveur de substitution de l'API de chat Mistral (app/services/llm_standin.py).
+
+Exemple:
+    LLM_STANDIN_TOKENS_PER_SECOND=200 LLM_STANDIN_RATE_LIMIT_RPM=120 python llm_standin_server.py
+    MISTRAL_API_URL=http://127.0.0.1:8090/v1/chat/completions MISTRAL_API_KEY=standin uvicorn app.main:app
+"""
+import argparse
+
+import uvicorn
+
+from app.core.config import settings
+from app.services.llm_standin import create_standin_app
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur local compatible /v1/chat/completions")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=settings.LLM_STANDIN_PORT)
+    args = parser.parse_args()
+
+    uvicorn.run(create_standin_app(), host=args.host, port=args.port, log_level="warning")
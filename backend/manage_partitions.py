@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Maintenance des partitions mensuelles et des durées de conservation des réunions
+(voir app/db/postgres_partitions.py et app/services/retention.py).
+
+Sans option: crée les partitions des mois à venir (base partitionnée uniquement) puis
+retire les réunions expirées, en les archivant si l'action de conservation le demande.
+À lancer périodiquement (cron), par exemple une fois par jour.
+
+    python manage_partitions.py --dry-run
+    python manage_partitions.py
+    python manage_partitions.py --set-policy 5f0c... 24 --action delete
+    python manage_partitions.py --clear-policy 5f0c...
+    python manage_partitions.py --list-policies
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("meeting-partitions")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Partitions mensuelles et conservation des réunions")
+    parser.add_argument("--dry-run", action="store_true", help="Afficher les mois expirés sans rien supprimer")
+    parser.add_argument("--batch-size", type=int, default=500, help="Réunions supprimées par lot hors partitions")
+    parser.add_argument("--set-policy", nargs=2, metavar=("USER_ID", "MONTHS"), help="Durée de conservation d'un utilisateur (0: illimitée)")
+    parser.add_argument("--action", choices=("archive", "delete"), default="archive", help="Action à expiration (avec --set-policy)")
+    parser.add_argument("--clear-policy", metavar="USER_ID", help="Rétablir la durée par défaut d'un utilisateur")
+    parser.add_argument("--list-policies", action="store_true", help="Lister les durées de conservation personnalisées")
+    return parser.parse_args()
+
+
+async def run(args):
+    from app.core.config import settings
+    from app.db.postgres_database import close_connections
+    from app.db.postgres_partitions import (
+        delete_retention_policy_async,
+        ensure_partitions_async,
+        get_retention_policies_async,
+        is_partitioned_async,
+        set_retention_policy_async,
+    )
+    from app.services.retention import apply_retention_async
+
+    try:
+        if args.set_policy:
+            user_id, months = args.set_policy
+            policy = await set_retention_policy_async(user_id, int(months), args.action)
+            logger.info(f"Utilisateur {user_id}: conservation {policy['retention_months']} mois ({policy['action']})")
+            return 0
+        if args.clear_policy:
+            if await delete_retention_policy_async(args.clear_policy):
+                logger.info(f"Utilisateur {args.clear_policy}: durée de conservation par défaut rétablie")
+            else:
+                logger.info(f"Utilisateur {args.clear_policy}: aucune durée personnalisée")
+            return 0
+        if args.list_policies:
+            logger.info(
+                f"Par défaut: {settings.MEETING_RETENTION_MONTHS} mois ({settings.MEETING_RETENTION_ACTION})"
+            )
+            for user_id, policy in (await get_retention_policies_async()).items():
+                logger.info(f"Utilisateur {user_id}: {policy['retention_months']} mois ({policy['action']})")
+            return 0
+
+        if await is_partitioned_async():
+            if not args.dry_run:
+                created = await ensure_partitions_async()
+                logger.info(f"{len(created)} partition(s) créée(s)")
+        else:
+            logger.info("Réunions non partitionnées: suppression des réunions expirées ligne à ligne")
+
+        plan = await apply_retention_async(dry_run=args.dry_run, batch_size=args.batch_size)
+        for entry in plan:
+            summary = (
+                f"{entry['month']:%Y-%m}: {entry['meetings']} réunion(s) expirée(s) de "
+                f"{len(entry['expired_users'])} utilisateur(s), {entry['kept_users']} conservé(s), "
+                f"mode {entry['mode']}"
+            )
+            if not args.dry_run:
+                summary += f", {entry['removed']} supprimée(s), {entry['audio_removed']} fichier(s) audio"
+            logger.info(summary)
+        if not plan:
+            logger.info("Aucune réunion expirée")
+    finally:
+        await close_connections()
+    return 0
+
+
+def main():
+    args = parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
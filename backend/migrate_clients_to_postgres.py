@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Migration ponctuelle des clients de l'ancienne base SQLite (app.db) vers PostgreSQL.
+
+Chaque client est rattaché à l'utilisateur PostgreSQL de même email et conserve son
+identifiant (les réunions qui le référencent restent liées). Les clients déjà présents
+sont ignorés: le script peut être relancé sans risque.
+
+    python migrate_clients_to_postgres.py --dry-run
+    python migrate_clients_to_postgres.py --sqlite-path /data/app.db
+"""
+import argparse
+import asyncio
+import logging
+import sqlite3
+import sys
+import uuid
+from datetime import datetime, timezone
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("clients-migration")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Migre les clients SQLite vers PostgreSQL")
+    parser.add_argument("--sqlite-path", default=None, help="Chemin de app.db (défaut: celui de l'application)")
+    parser.add_argument("--dry-run", action="store_true", help="Afficher ce qui serait migré sans écrire")
+    return parser.parse_args()
+
+
+def read_sqlite_clients(path: str):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(
+            """
+            SELECT c.id, c.name, c.summary_template, c.created_at, u.email
+            FROM clients c LEFT JOIN users u ON u.id = c.user_id
+            """
+        )]
+    finally:
+        conn.close()
+
+
+def parse_created_at(value):
+    if not value:
+        return datetime.now(timezone.utc)
+    created_at = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return created_at if created_at.tzinfo else created_at.replace(tzinfo=timezone.utc)
+
+
+async def run(args):
+    from app.db.postgres_database import close_connections, get_db_connection
+
+    if args.sqlite_path is None:
+        from app.db.database import DB_PATH
+        args.sqlite_path = str(DB_PATH)
+    clients = read_sqlite_clients(args.sqlite_path)
+    logger.info(f"{len(clients)} client(s) trouvé(s) dans {args.sqlite_path}")
+
+    migrated = skipped = orphaned = 0
+    async with get_db_connection() as conn:
+        for client in clients:
+            user_id = await conn.fetchval(
+                "SELECT id FROM users WHERE lower(email) = lower($1)", client["email"]
+            ) if client["email"] else None
+            if user_id is None:
+                orphaned += 1
+                logger.warning(f"Client {client['id']} ({client['name']}): aucun utilisateur PostgreSQL pour {client['email']}")
+                continue
+            try:
+                client_id = uuid.UUID(str(client["id"]))
+            except ValueError:
+                client_id = uuid.uuid4()
+                logger.warning(f"Client {client['id']}: identifiant non UUID, nouvel identifiant {client_id}")
+            if args.dry_run:
+                logger.info(f"[dry-run] {client['name']} -> utilisateur {user_id}")
+                migrated += 1
+                continue
+            status = await conn.execute(
+                """
+                INSERT INTO clients (id, user_id, name, summary_template, created_at)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (id) DO NOTHING
+                """,
+                client_id, user_id, client["name"], client["summary_template"],
+                parse_created_at(client["created_at"]),
+            )
+            if status == "INSERT 0 1":
+                migrated += 1
+            else:
+                skipped += 1
+    await close_connections()
+    logger.info(f"Migrés: {migrated}, déjà présents: {skipped}, sans utilisateur: {orphaned}")
+    return orphaned
+
+
+def main():
+    args = parse_args()
+    orphaned = asyncio.run(run(args))
+    return 1 if orphaned else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
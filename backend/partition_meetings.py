@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Conversion en ligne des réunions en tables partitionnées par mois (optionnelle).
+
+Convertit meetings (clé created_at) et ses tables liées meeting_content, meeting_speakers,
+meeting_utterances et meeting_speaker_stats (clé meeting_created_at) pendant que
+l'application tourne:
+
+1. crée les tables partitionnées <table>_partitioned: une partition par mois depuis la
+   plus ancienne réunion jusqu'à MEETING_PARTITION_PREMAKE_MONTHS mois à venir, une
+   partition par défaut, les index de la table d'origine et des contraintes d'unicité
+   complétées par la clé de partition;
+2. installe sur chaque table d'origine un déclencheur qui reporte chaque écriture dans la
+   nouvelle table, puis y recopie les lignes existantes par lots (réunions d'abord, pour
+   que les clés étrangères des tables liées soient satisfaites). Les lignes d'un lot sont
+   verrouillées en lecture le temps de la copie: une ligne supprimée entre-temps n'est
+   pas réintroduite;
+3. bascule les noms dans une transaction courte (verrou exclusif réessayé tant que
+   l'attente dépasse --lock-timeout). La clé étrangère summary_jobs -> meetings est
+   supprimée: les générations sont effacées avec leur réunion par l'application.
+
+Les tables d'origine restent sous le nom <table>_unpartitioned jusqu'à --drop-old. Le
+script reprend là où il s'est arrêté s'il est relancé. Ensuite, manage_partitions.py
+(cron) crée les partitions à venir et applique les durées de conservation.
+
+    alembic upgrade head
+    python partition_meetings.py --batch-size 2000
+    python partition_meetings.py --drop-old
+"""
+import argparse
+import asyncio
+import logging
+import re
+import sys
+from datetime import datetime, timezone
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("partition-meetings")
+
+NEW_SUFFIX = "_partitioned"
+OLD_SUFFIX = "_unpartitioned"
+
+# Clé de parcours (clé primaire d'origine) et contraintes de chaque table partitionnée.
+# Les noms se terminent par _new et prennent leur nom définitif à la bascule; les upserts
+# de l'application visent meeting_content_pkey et meeting_speakers_meeting_id_speaker_id_key.
+_MEETING_FK = "FOREIGN KEY (meeting_id, meeting_created_at) REFERENCES meetings_partitioned (id, created_at) ON DELETE CASCADE"
+TABLE_SPECS = {
+    "meetings": {
+        "keys": ["id"],
+        "constraints": [
+            "CONSTRAINT meetings_pkey_new PRIMARY KEY (id, created_at)",
+            "FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE",
+            "FOREIGN KEY (client_id) REFERENCES clients(id) ON DELETE SET NULL",
+        ],
+    },
+    "meeting_content": {
+        "keys": ["meeting_id"],
+        "constraints": [
+            "CONSTRAINT meeting_content_pkey_new PRIMARY KEY (meeting_id, meeting_created_at)",
+            _MEETING_FK,
+        ],
+    },
+    "meeting_speakers": {
+        "keys": ["id"],
+        "constraints": [
+            "CONSTRAINT meeting_speakers_pkey_new PRIMARY KEY (id, meeting_created_at)",
+            "CONSTRAINT meeting_speakers_meeting_id_speaker_id_key_new UNIQUE (meeting_id, speaker_id, meeting_created_at)",
+            _MEETING_FK,
+        ],
+    },
+    "meeting_utterances": {
+        "keys": ["meeting_id", "idx"],
+        "constraints": [
+            "CONSTRAINT meeting_utterances_pkey_new PRIMARY KEY (meeting_id, idx, meeting_created_at)",
+            _MEETING_FK,
+        ],
+    },
+    "meeting_speaker_stats": {
+        "keys": ["meeting_id", "speaker"],
+        "constraints": [
+            "CONSTRAINT meeting_speaker_stats_pkey_new PRIMARY KEY (meeting_id, speaker, meeting_created_at)",
+            _MEETING_FK,
+        ],
+    },
+}
+
+_INDEX_DEF = re.compile(r"^CREATE INDEX (\S+) ON (\S+) (USING .*)$")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Partitionne les réunions par mois, sans interruption")
+    parser.add_argument("--database-url", default=None, help="URL PostgreSQL (remplace DATABASE_URL)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Lignes recopiées par transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="Pause entre deux lots (secondes)")
+    parser.add_argument("--lock-timeout", type=float, default=2.0, help="Attente maximale du verrou de bascule (secondes)")
+    parser.add_argument("--swap-attempts", type=int, default=30, help="Tentatives de bascule")
+    parser.add_argument("--drop-old", action="store_true", help="Supprimer les tables d'origine après la bascule")
+    return parser.parse_args()
+
+
+async def relation_exists(conn, name):
+    return await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", name)
+
+
+async def insertable_columns(conn, table):
+    """Colonnes de la table, sans les colonnes générées (calculées par la base)."""
+    rows = await conn.fetch(
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = $1 AND is_generated = 'NEVER'
+        ORDER BY ordinal_position
+        """,
+        table,
+    )
+    return [r["column_name"] for r in rows]
+
+
+async def create_partitioned_tables(conn, tables):
+    from app.core.config import settings
+    from app.db.postgres_partitions import add_months, create_month_partitions_async, month_start
+
+    oldest = await conn.fetchval("SELECT min(created_at) FROM meetings")
+    now = datetime.now(timezone.utc)
+    first = month_start(oldest or now)
+    last = add_months(month_start(now), settings.MEETING_PARTITION_PREMAKE_MONTHS)
+
+    async with conn.transaction():
+        for table, key in tables:
+            new = f"{table}{NEW_SUFFIX}"
+            await conn.execute(
+                f"""
+                CREATE TABLE {new} (
+                    LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE INCLUDING COMPRESSION,
+                    {", ".join(TABLE_SPECS[table]["constraints"])}
+                ) PARTITION BY RANGE ({key})
+                """
+            )
+            # Index de la table d'origine (hors contraintes), sous un nom provisoire
+            definitions = await conn.fetch(
+                """
+                SELECT pg_get_indexdef(i.indexrelid) AS definition FROM pg_index i
+                WHERE i.indrelid = to_regclass($1)
+                  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+                """,
+                table,
+            )
+            for d in definitions:
+                match = _INDEX_DEF.match(d["definition"])
+                if not match:
+                    raise RuntimeError(f"Index non reproductible sur {table}: {d['definition']}")
+                await conn.execute(f"CREATE INDEX {match.group(1)}_new ON {new} {match.group(3)}")
+            await conn.execute(f"CREATE TABLE {table}_default PARTITION OF {new} DEFAULT")
+
+        month = first
+        while month <= last:
+            await create_month_partitions_async(conn, month, parent_suffix=NEW_SUFFIX)
+            month = add_months(month, 1)
+    logger.info(f"Tables partitionnées créées ({first:%Y-%m} à {last:%Y-%m})")
+
+
+def _created_expression(table, source):
+    """Date de création de la réunion d'une ligne (`source`: alias ou NEW)."""
+    if table == "meetings":
+        return f"{source}.created_at"
+    return (
+        f"COALESCE({source}.meeting_created_at, "
+        f"(SELECT m.created_at FROM meetings m WHERE m.id = {source}.meeting_id))"
+    )
+
+
+def _values(table, columns, source):
+    key = "created_at" if table == "meetings" else "meeting_created_at"
+    return [_created_expression(table, source) if c == key else f"{source}.{c}" for c in columns]
+
+
+async def install_mirror_trigger(conn, table, columns):
+    """Reporte chaque écriture sur `table` dans sa version partitionnée."""
+    new = f"{table}{NEW_SUFFIX}"
+    keys = TABLE_SPECS[table]["keys"]
+    match_old = " AND ".join(f"{k} = OLD.{k}" for k in keys)
+    assignments = ", ".join(f"{c} = {v}" for c, v in zip(columns, _values(table, columns, "NEW")))
+    await conn.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION partition_mirror_{table}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                DELETE FROM {new} WHERE {match_old};
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'UPDATE' THEN
+                UPDATE {new} SET {assignments} WHERE {match_old};
+                IF FOUND THEN
+                    RETURN NULL;
+                END IF;
+            END IF;
+            INSERT INTO {new} ({", ".join(columns)})
+            VALUES ({", ".join(_values(table, columns, "NEW"))})
+            ON CONFLICT DO NOTHING;
+            RETURN NULL;
+        END $$;
+        DROP TRIGGER IF EXISTS partition_mirror ON {table};
+        CREATE TRIGGER partition_mirror AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION partition_mirror_{table}();
+        """
+    )
+
+
+async def copy_rows(conn, table, columns, batch_size, pause):
+    """Recopie les lignes existantes par lots, dans l'ordre de la clé primaire d'origine."""
+    import asyncpg
+
+    new = f"{table}{NEW_SUFFIX}"
+    keys = TABLE_SPECS[table]["keys"]
+    key_list = ", ".join(keys)
+    after = f"WHERE ({key_list}) > ({', '.join(f'${i}' for i in range(2, len(keys) + 2))})"
+
+    def batch_sql(condition):
+        return f"""
+            WITH batch AS (
+                SELECT {", ".join(f"{v} AS {c}" for c, v in zip(columns, _values(table, columns, "t")))}
+                FROM {table} t
+                {condition}
+                ORDER BY {key_list}
+                LIMIT $1
+                FOR SHARE
+            ), copied AS (
+                INSERT INTO {new} ({", ".join(columns)})
+                SELECT {", ".join(columns)} FROM batch
+                ON CONFLICT DO NOTHING
+            )
+            SELECT {key_list}, count(*) OVER () AS batch_rows FROM batch
+            ORDER BY {", ".join(f"{k} DESC" for k in keys)}
+            LIMIT 1
+        """
+
+    first_sql, next_sql = batch_sql(""), batch_sql(after)
+    last_key, copied = None, 0
+    while True:
+        for attempt in range(5):
+            try:
+                if last_key is None:
+                    row = await conn.fetchrow(first_sql, batch_size)
+                else:
+                    row = await conn.fetchrow(next_sql, batch_size, *last_key)
+                break
+            except (asyncpg.ForeignKeyViolationError, asyncpg.DeadlockDetectedError) as e:
+                # Réunion supprimée pendant la copie du lot: le lot suivant ne la verra plus
+                logger.warning(f"{table}: lot rejoué ({e.__class__.__name__})")
+                await asyncio.sleep(pause * (attempt + 1))
+        else:
+            raise RuntimeError(f"{table}: copie interrompue après plusieurs conflits")
+        if row is None:
+            break
+        last_key = [row[k] for k in keys]
+        copied += row["batch_rows"]
+        if copied % (batch_size * 50) < batch_size:
+            logger.info(f"{table}: {copied} ligne(s) recopiée(s)")
+        if row["batch_rows"] < batch_size:
+            break
+        await asyncio.sleep(pause)
+    logger.info(f"{table}: copie terminée ({copied} ligne(s))")
+
+
+async def index_names(conn, table):
+    rows = await conn.fetch(
+        "SELECT indexrelid::regclass::text AS name FROM pg_index WHERE indrelid = to_regclass($1)", table
+    )
+    return [r["name"] for r in rows]
+
+
+async def swap(conn, tables, lock_timeout, attempts):
+    """Remplace les tables d'origine par leurs versions partitionnées (transaction courte)."""
+    import asyncpg
+
+    names = [table for table, _ in tables]
+    for attempt in range(1, attempts + 1):
+        try:
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL lock_timeout = '{int(lock_timeout * 1000)}ms'")
+                await conn.execute(f"LOCK TABLE {', '.join(names)} IN ACCESS EXCLUSIVE MODE")
+                # Clés étrangères d'autres tables vers meetings (summary_jobs)
+                foreign = await conn.fetch(
+                    """
+                    SELECT conrelid::regclass::text AS source, conname FROM pg_constraint
+                    WHERE contype = 'f' AND confrelid = to_regclass('meetings')
+                      AND NOT conrelid = ANY(SELECT to_regclass(t) FROM unnest($1::text[]) AS t)
+                    """,
+                    names,
+                )
+                for fk in foreign:
+                    await conn.execute(f"ALTER TABLE {fk['source']} DROP CONSTRAINT {fk['conname']}")
+                    logger.info(f"Clé étrangère {fk['source']}.{fk['conname']} supprimée")
+                for table in names:
+                    await conn.execute(f"DROP TRIGGER IF EXISTS partition_mirror ON {table}")
+                    await conn.execute(f"DROP FUNCTION IF EXISTS partition_mirror_{table}()")
+                    for index in await index_names(conn, table):
+                        await conn.execute(f"ALTER INDEX {index} RENAME TO {index[:59]}_old")
+                    await conn.execute(f"ALTER TABLE {table} RENAME TO {table}{OLD_SUFFIX}")
+                for table in names:
+                    for index in await index_names(conn, f"{table}{NEW_SUFFIX}"):
+                        if index.endswith("_new"):
+                            await conn.execute(f"ALTER INDEX {index} RENAME TO {index[:-4]}")
+                    await conn.execute(f"ALTER TABLE {table}{NEW_SUFFIX} RENAME TO {table}")
+            logger.info("Bascule effectuée: les réunions sont partitionnées par mois")
+            return
+        except asyncpg.LockNotAvailableError:
+            logger.info(f"Verrou de bascule indisponible (tentative {attempt}/{attempts})")
+            await asyncio.sleep(min(attempt, 10))
+    raise RuntimeError("Bascule impossible: verrou indisponible")
+
+
+async def drop_old(conn, tables):
+    for table, _ in reversed(tables):
+        old = f"{table}{OLD_SUFFIX}"
+        if await relation_exists(conn, old):
+            await conn.execute(f"DROP TABLE {old}")
+            logger.info(f"Table {old} supprimée")
+
+
+async def run(args):
+    import asyncpg
+    from app.core.config import settings
+    from app.db.postgres_partitions import PARTITIONED_TABLES, is_partitioned_async
+
+    conn = await asyncpg.connect(args.database_url or settings.DATABASE_URL)
+    try:
+        if await is_partitioned_async(conn):
+            logger.info("Les réunions sont déjà partitionnées")
+            if args.drop_old:
+                await drop_old(conn, PARTITIONED_TABLES)
+            return 0
+
+        # La clé de partition ne peut pas être nulle
+        fixed = await conn.execute("UPDATE meetings SET created_at = NOW() WHERE created_at IS NULL")
+        if not fixed.endswith(" 0"):
+            logger.info(f"Date de création renseignée: {fixed}")
+
+        if not await relation_exists(conn, f"meetings{NEW_SUFFIX}"):
+            await create_partitioned_tables(conn, PARTITIONED_TABLES)
+        else:
+            logger.info("Tables partitionnées existantes: reprise de la copie")
+
+        # Réunions d'abord: les lignes liées reportées ou recopiées trouvent leur réunion
+        for table, _ in PARTITIONED_TABLES:
+            columns = await insertable_columns(conn, table)
+            await install_mirror_trigger(conn, table, columns)
+            await copy_rows(conn, table, columns, args.batch_size, args.pause)
+
+        for table, _ in PARTITIONED_TABLES:
+            await conn.execute(f"ANALYZE {table}{NEW_SUFFIX}")
+        await swap(conn, PARTITIONED_TABLES, args.lock_timeout, args.swap_attempts)
+        if args.drop_old:
+            await drop_old(conn, PARTITIONED_TABLES)
+        else:
+            logger.info(f"Tables d'origine conservées (*{OLD_SUFFIX}); --drop-old pour les supprimer")
+    finally:
+        await conn.close()
+    return 0
+
+
+def main():
+    args = parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
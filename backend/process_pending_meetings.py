@@ -3,12 +3,14 @@
 Script pour vérifier et traiter automatiquement les réunions en statut 'processing'.
 Ce script s'exécute en continu à un intervalle régulier.
 """
-import sqlite3
 import time
 import sys
 import os
 import logging
-from app.services.assemblyai import _process_transcription
+from app.core.config import settings
+from app.db.postgres_meetings import claim_meetings, default_lease_owner, release_meeting
+from app.services.assemblyai import process_transcription
+from app.services.transcript_completion import complete_transcript
 import traceback
 import argparse
 
@@ -23,47 +25,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger('meeting-processor')
 
+LEASE_OWNER = default_lease_owner("meeting-processor")
+
 def get_processing_meetings():
-    """Récupère toutes les réunions en statut 'processing' ou 'pending'"""
+    """Prend un bail sur les réunions en statut 'processing' ou 'pending' libres"""
     try:
-        # Connexion à la base de données
-        conn = sqlite3.connect('app.db')
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Récupération des réunions en processing ou pending
-        cursor.execute("""
-            SELECT id, user_id, file_url, title, created_at
-            FROM meetings
-            WHERE transcript_status IN ('processing', 'pending')
-            ORDER BY created_at DESC
-        """)
-        
-        meetings = cursor.fetchall()
-        conn.close()
-        
-        return [dict(meeting) for meeting in meetings]
+        # Les réunions déjà sous bail (worker de l'application, autre script) sont ignorées
+        return claim_meetings(
+            LEASE_OWNER,
+            ("processing", "pending"),
+            settings.TRANSCRIPTION_LEASE_SECONDS,
+            limit=50,
+        )
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des réunions: {str(e)}")
         return []
 
 def process_meeting(meeting):
     """Traite une réunion spécifique"""
-    meeting_id = meeting['id']
+    meeting_id = str(meeting['id'])
     file_url = meeting['file_url']
-    user_id = meeting['user_id']
+    user_id = str(meeting['user_id'])
     
     logger.info(f"Traitement de la réunion: {meeting_id} - {meeting['title']}")
     
     try:
-        # Appel direct de la fonction de traitement
-        _process_transcription(meeting_id, file_url, user_id)
+        if meeting.get('transcript_id'):
+            # Transcription déjà lancée: vérifier son statut plutôt que la relancer
+            result = complete_transcript(meeting_id, user_id, meeting['transcript_id'], lease_owner=LEASE_OWNER)
+            logger.info(f"Statut de la transcription pour {meeting_id}: {result['status'] if result else 'déjà finalisée'}")
+        else:
+            process_transcription(meeting_id, file_url, user_id)
         logger.info(f"Réunion {meeting_id} traitée avec succès")
         return True
     except Exception as e:
         logger.error(f"Erreur lors du traitement de la réunion {meeting_id}: {str(e)}")
         logger.error(traceback.format_exc())
         return False
+    finally:
+        release_meeting(meeting_id, LEASE_OWNER)
 
 def run_continuous(interval=60):
     """Exécute le processus en continu avec un intervalle spécifié"""
@@ -13,8 +13,8 @@ import logging
 import time
 from datetime import datetime, timedelta
 from app.core.config import settings
-from app.services.assemblyai import _process_transcription
-from app.db.queries import get_meeting, update_meeting
+from app.services.assemblyai import process_transcription
+from app.db.postgres_meetings import get_meeting, update_meeting, claim_meeting, release_meeting, default_lease_owner
 
 # Configuration du logging
 logging.basicConfig(
@@ -23,6 +23,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger('queue-processor')
 
+LEASE_OWNER = default_lease_owner("queue-script")
+
 def process_queue():
     """Traite tous les fichiers dans le répertoire de queue"""
     queue_dir = os.path.join(settings.UPLOADS_DIR.parent, "queue")
@@ -74,18 +76,26 @@ def process_queue():
                 os.remove(queue_file_path)
                 continue
             
-            logger.info(f"Traitement de la transcription pour la réunion {meeting_id} (statut actuel: {status})")
-            
-            # Mettre à jour le statut en "processing" si nécessaire
-            if status == 'pending':
-                update_meeting(meeting_id, user_id, {"transcript_status": "processing"})
+            # Ne pas traiter une réunion déjà prise en charge par un worker de l'application
+            if not claim_meeting(meeting_id, LEASE_OWNER, settings.TRANSCRIPTION_LEASE_SECONDS):
+                logger.info(f"La réunion {meeting_id} est déjà prise en charge par un autre processus")
+                continue
             
-            # Traiter la transcription
-            _process_transcription(meeting_id, file_url, user_id)
+            logger.info(f"Traitement de la transcription pour la réunion {meeting_id} (statut actuel: {status})")
             
-            # Supprimer le fichier de queue
-            os.remove(queue_file_path)
-            logger.info(f"Transcription terminée pour {meeting_id}, fichier de queue supprimé")
+            try:
+                # Mettre à jour le statut en "processing" si nécessaire
+                if status == 'pending':
+                    update_meeting(meeting_id, user_id, {"transcript_status": "processing"})
+                
+                # Traiter la transcription
+                process_transcription(meeting_id, file_url, user_id)
+                
+                # Supprimer le fichier de queue
+                os.remove(queue_file_path)
+                logger.info(f"Transcription terminée pour {meeting_id}, fichier de queue supprimé")
+            finally:
+                release_meeting(meeting_id, LEASE_OWNER)
             
         except Exception as e:
             logger.error(f"Erreur lors du traitement du fichier {queue_file}: {str(e)}")
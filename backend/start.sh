@@ -18,5 +18,8 @@ asyncio.run(init_database())
 print("✅ Base de données PostgreSQL initialisée")
 PY
 
+echo "🔄 Migrations du schéma..."
+alembic upgrade head
+
 echo "🚀 Démarrage de l'API..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 1 --log-level info --access-log --use-colors
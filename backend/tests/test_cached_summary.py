@@ -0,0 +1,53 @@
+"""Tests unitaires de l'application d'un compte rendu en cache (app/services/mistral_summary.py)."""
+
+import asyncio
+
+import pytest
+
+from app.db import postgres_summary_jobs
+from app.services import mistral_summary
+
+MEETING_ID = "5f0c1e2a-3b4d-4c5e-8f70-112233445566"
+USER_ID = "0a1b2c3d-4e5f-4a6b-9c7d-8e9fa0b1c2d3"
+
+
+@pytest.fixture
+def summary_calls(monkeypatch):
+    calls = []
+
+    async def prepare(meeting_id, user_id, client_id=None, template_type=None):
+        return {"cached": "Compte rendu en cache", "speaker_labels": {}}
+
+    async def store(meeting_id, user_id, summary_text, request):
+        calls.append(("store", summary_text))
+
+    async def finish(job_id, owner):
+        calls.append(("finish", job_id))
+
+    async def fail(job_id, owner, error, backoff):
+        calls.append(("fail", job_id))
+
+    monkeypatch.setattr(mistral_summary, "_prepare_summary_request_async", prepare)
+    monkeypatch.setattr(mistral_summary, "_store_summary_async", store)
+    monkeypatch.setattr(postgres_summary_jobs, "finish_summary_job_async", finish)
+    monkeypatch.setattr(postgres_summary_jobs, "fail_summary_job_async", fail)
+    return calls
+
+
+def _claim_returning(monkeypatch, job):
+    async def claim(*args, **kwargs):
+        return job
+
+    monkeypatch.setattr(postgres_summary_jobs, "claim_summary_job_inline_async", claim)
+
+
+def test_cached_summary_is_stored_under_the_meeting_job(monkeypatch, summary_calls):
+    _claim_returning(monkeypatch, {"id": 7})
+    assert asyncio.run(mistral_summary.apply_cached_summary_async(MEETING_ID, USER_ID)) is True
+    assert summary_calls == [("store", "Compte rendu en cache"), ("finish", 7)]
+
+
+def test_cached_summary_does_not_overwrite_a_running_generation(monkeypatch, summary_calls):
+    _claim_returning(monkeypatch, None)
+    assert asyncio.run(mistral_summary.apply_cached_summary_async(MEETING_ID, USER_ID)) is False
+    assert summary_calls == []
@@ -0,0 +1,51 @@
+"""Tests unitaires des curseurs de pagination (app/db/postgres_meetings.py)."""
+
+import base64
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.postgres_meetings import (
+    decode_meeting_cursor,
+    decode_search_cursor,
+    encode_meeting_cursor,
+    encode_search_cursor,
+)
+
+MEETING_ID = uuid.UUID("5f0c1e2a-3b4d-4c5e-8f70-112233445566")
+
+
+def test_meeting_cursor_round_trip():
+    created_at = datetime(2024, 3, 5, 14, 7, 31, 123456, tzinfo=timezone.utc)
+    cursor = encode_meeting_cursor(created_at, MEETING_ID)
+    # Opaque et utilisable tel quel dans une URL
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_meeting_cursor(cursor) == (created_at, MEETING_ID)
+
+
+def _raw_cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "pas-un-curseur",
+    _raw_cursor("2024-03-05T14:07:31+00:00"),
+    _raw_cursor(f"hier|{MEETING_ID}"),
+    _raw_cursor("2024-03-05T14:07:31+00:00|pas-un-uuid"),
+])
+def test_invalid_meeting_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_meeting_cursor(cursor)
+
+
+def test_search_cursor_round_trip_keeps_exact_rank():
+    rank = 0.1 + 0.2
+    assert decode_search_cursor(encode_search_cursor(rank, MEETING_ID)) == (rank, MEETING_ID)
+
+
+@pytest.mark.parametrize("cursor", ["", _raw_cursor(f"haut|{MEETING_ID}"), _raw_cursor("0.5|pas-un-uuid")])
+def test_invalid_search_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_search_cursor(cursor)
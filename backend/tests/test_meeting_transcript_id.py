@@ -0,0 +1,79 @@
+"""Tests unitaires de l'identifiant de transcription AssemblyAI des réunions (app/db/postgres_meetings.py)."""
+
+import asyncio
+import re
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from app.db import postgres_meetings
+
+MEETING_ID = uuid.UUID("5f0c1e2a-3b4d-4c5e-8f70-112233445566")
+USER_ID = uuid.UUID("0a1b2c3d-4e5f-4a6b-9c7d-8e9fa0b1c2d3")
+
+
+class _FakeConnection:
+    """Connexion de test: une seule réunion en mémoire, projetée sur les colonnes demandées."""
+
+    def __init__(self, meeting):
+        self.meeting = meeting
+        self.statements = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetch(self, sql, *args):
+        self.statements.append(sql)
+        columns = re.search(r"RETURNING\s+(.+?)\s*\)", sql, re.S).group(1)
+        return [{column.strip(): self.meeting.get(column.strip()) for column in columns.split(",")}]
+
+    async def execute(self, sql, *args):
+        self.statements.append(sql)
+        assignments = re.search(r"UPDATE meetings SET (.+?) WHERE", sql).group(1)
+        for assignment in assignments.split(", "):
+            column, placeholder = assignment.split(" = $")
+            self.meeting[column] = args[int(placeholder) - 1]
+        return "UPDATE 1"
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    conn = _FakeConnection({
+        "id": MEETING_ID,
+        "user_id": USER_ID,
+        "title": "Point hebdomadaire",
+        "file_url": "/uploads/point.mp3",
+        "transcript_id": "aai-123",
+        "transcript_status": "processing",
+        "created_at": datetime(2024, 3, 5, 14, 7),
+    })
+
+    @asynccontextmanager
+    async def fake_db_connection():
+        yield conn
+
+    monkeypatch.setattr(postgres_meetings, "get_db_connection", fake_db_connection)
+    return conn
+
+
+def test_claimed_meeting_keeps_its_transcript_id(connection):
+    claimed = asyncio.run(postgres_meetings.claim_meetings_async("worker-1"))
+    assert claimed[0]["transcript_id"] == "aai-123"
+    assert claimed[0]["transcript_status"] == "processing"
+
+
+def test_meeting_select_reads_transcript_id():
+    assert "m.transcript_id" in postgres_meetings.meeting_select()
+    assert "m.transcript_id" in postgres_meetings.meeting_select(include_content=True)
+
+
+def test_update_meeting_writes_transcript_id(connection, caplog):
+    updated = asyncio.run(postgres_meetings.update_meeting_async(
+        str(MEETING_ID), str(USER_ID), {"transcript_id": "aai-456", "transcript_status": "processing"}
+    ))
+    assert updated is True
+    assert connection.meeting["transcript_id"] == "aai-456"
+    assert "Colonnes ignorées" not in caplog.text
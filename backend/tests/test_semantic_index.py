@@ -0,0 +1,35 @@
+"""Tests unitaires du découpage des transcriptions en passages (app/services/semantic_index.py)."""
+
+from app.services.semantic_index import chunk_utterances
+
+
+def _utterances(count, start=0):
+    return [(start + i, {"speaker": "A", "text": f"phrase {start + i}"}) for i in range(count)]
+
+
+def test_windows_overlap_and_cover_the_transcript():
+    chunks = chunk_utterances(_utterances(10), size=4, overlap=2)
+    assert [(first, last) for first, last, _ in chunks] == [(0, 3), (2, 5), (4, 7), (6, 9)]
+    assert chunks[1][2] == "phrase 2 phrase 3 phrase 4 phrase 5"
+
+
+def test_last_window_is_not_duplicated():
+    # La fenêtre qui atteint la fin arrête le découpage, même incomplète
+    assert [(f, l) for f, l, _ in chunk_utterances(_utterances(5), size=4, overlap=1)] == [(0, 3), (3, 4)]
+    assert [(f, l) for f, l, _ in chunk_utterances(_utterances(3), size=6, overlap=2)] == [(0, 2)]
+
+
+def test_passages_keep_stored_utterance_indexes():
+    chunks = chunk_utterances(_utterances(4, start=10), size=2, overlap=0)
+    assert [(first, last) for first, last, _ in chunks] == [(10, 11), (12, 13)]
+
+
+def test_overlap_not_smaller_than_size_still_advances():
+    chunks = chunk_utterances(_utterances(3), size=2, overlap=5)
+    assert [(first, last) for first, last, _ in chunks] == [(0, 1), (1, 2)]
+
+
+def test_empty_windows_are_skipped():
+    utterances = [(0, {"text": "  "}), (1, {"text": None}), (2, {"text": "suite"})]
+    assert chunk_utterances(utterances, size=2, overlap=0) == [(2, 2, "suite")]
+    assert chunk_utterances([], size=6, overlap=2) == []
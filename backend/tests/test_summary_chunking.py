@@ -0,0 +1,72 @@
+"""Tests unitaires du résumé en plusieurs passes (app/services/summary_chunking.py)."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import summary_chunking
+from app.services.summary_chunking import estimate_tokens, reduce_transcript_async, split_transcript
+
+
+class _FakeClient:
+    """Client LLM de test: renvoie une note courte par appel et garde les prompts reçus."""
+
+    def __init__(self):
+        self.prompts = []
+
+    async def complete(self, payload):
+        prompt = payload["messages"][0]["content"]
+        self.prompts.append(prompt)
+        return f"note {len(self.prompts)}"
+
+
+@pytest.fixture
+def small_budget(monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_SINGLE_PASS_TOKENS", 20)
+    monkeypatch.setattr(settings, "SUMMARY_CHUNK_TOKENS", 20)
+    monkeypatch.setattr(settings, "SUMMARY_NOTES_MAX_TOKENS", 50)
+    monkeypatch.setattr(settings, "SUMMARY_MAP_CONCURRENCY", 2)
+
+
+def _transcript(count):
+    return "\n".join(f"Speaker {'AB'[i % 2]}: intervention numéro {i}" for i in range(count))
+
+
+def test_split_keeps_utterances_whole_and_in_order():
+    transcript = _transcript(12)
+    chunks = split_transcript(transcript, 20)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 20 * summary_chunking._CHARS_PER_TOKEN for chunk in chunks)
+    # Aucune utterance coupée ni perdue, ordre conservé
+    assert "\n".join(chunks).split("\n") == transcript.split("\n")
+
+
+def test_split_cuts_an_utterance_longer_than_the_budget():
+    line = "Speaker A: " + "x" * 200
+    chunks = split_transcript(line + "\n\nSpeaker B: fin", 10)
+    assert "".join(chunks[:-1]) + chunks[-1].split("\n")[0] == line
+    assert chunks[-1].endswith("Speaker B: fin")
+    assert all(len(chunk) <= 35 for chunk in chunks)
+
+
+def test_short_transcript_is_not_reduced(small_budget):
+    client = _FakeClient()
+    assert asyncio.run(reduce_transcript_async("Speaker A: bonjour", client=client)) == "Speaker A: bonjour"
+    assert client.prompts == []
+
+
+def test_long_transcript_is_mapped_then_merged(small_budget):
+    transcript = _transcript(30)
+    chunks = split_transcript(transcript, settings.SUMMARY_CHUNK_TOKENS)
+    client = _FakeClient()
+    reduced = asyncio.run(reduce_transcript_async(transcript, "formation", client))
+
+    map_prompts = client.prompts[:len(chunks)]
+    assert [f"partie {i + 1}/{len(chunks)}" in p for i, p in enumerate(map_prompts)] == [True] * len(chunks)
+    assert all("session de formation" in p for p in map_prompts)
+    # Les notes dépassent le budget d'une passe: au moins un niveau de fusion
+    assert len(client.prompts) > len(chunks)
+    assert "Fusionne-les" in client.prompts[-1]
+    assert reduced.startswith(f"Notes structurées extraites de l'intégralité de la transcription (découpée en {len(chunks)} parties")
+    assert estimate_tokens(reduced.split(":\n\n", 1)[1]) <= settings.SUMMARY_CHUNK_TOKENS
@@ -0,0 +1,44 @@
+"""Tests unitaires du report des renommages dans les comptes rendus (app/services/summary_speakers.py)."""
+
+from app.services.summary_speakers import (
+    current_speaker_labels,
+    rewrite_summary_speakers,
+    speaker_labels_for_transcript,
+)
+
+
+def test_labels_recorded_from_transcript():
+    transcript = "Alice: bonjour\nSpeaker B: salut\nAlice: on commence"
+    assert speaker_labels_for_transcript(transcript, {"A": "Alice"}) == {"A": "Alice", "B": "Speaker B"}
+    assert current_speaker_labels({"A": "Alice", "B": "Speaker B"}, {"B": "Bruno"}) == {"A": "Speaker A", "B": "Bruno"}
+
+
+def test_rename_replaces_whole_words_only():
+    summary = "Speaker A propose le budget. Speaker AB n'existe pas. Speaker A valide."
+    rewritten = rewrite_summary_speakers(summary, {"A": "Speaker A"}, {"A": "Alice"})
+    assert rewritten == "Alice propose le budget. Speaker AB n'existe pas. Alice valide."
+
+
+def test_swapped_names_are_rewritten_in_one_pass():
+    summary = "Alice présente, Bruno conclut."
+    rewritten = rewrite_summary_speakers(
+        summary, {"A": "Alice", "B": "Bruno"}, {"A": "Bruno", "B": "Alice"}
+    )
+    assert rewritten == "Bruno présente, Alice conclut."
+
+
+def test_unchanged_labels_keep_the_text():
+    summary = "Alice présente."
+    assert rewrite_summary_speakers(summary, {"A": "Alice"}, {"A": "Alice"}) is summary
+    assert rewrite_summary_speakers(summary, {"A": "Alice"}, {}) is summary
+
+
+def test_ambiguous_renames_are_refused():
+    summary = "Jean et Jean Dupont."
+    # Libellé contenu dans celui d'un autre locuteur
+    assert rewrite_summary_speakers(summary, {"A": "Jean", "B": "Jean Dupont"}, {"A": "Jeanne"}) is None
+    # Libellé trop court
+    assert rewrite_summary_speakers("X parle.", {"A": "X"}, {"A": "Xavier"}) is None
+    # Même libellé pour deux locuteurs
+    assert rewrite_summary_speakers(summary, {"A": "Jean", "B": "Jean"}, {"A": "Jeanne"}) is None
+    assert rewrite_summary_speakers(summary, {"A": "Jean", "B": "Jean"}, {"A": "Jeanne", "B": "Jules"}) is None
@@ -0,0 +1,83 @@
+"""Tests unitaires de la compaction des transcriptions (app/services/transcript_compaction.py)."""
+
+import pytest
+
+from app.core.config import settings
+from app.services.transcript_compaction import compact_for_summary, compact_transcript
+
+
+@pytest.fixture(autouse=True)
+def _full_labels(monkeypatch):
+    # Libellés conservés tels quels pour lire les attributions dans les assertions
+    monkeypatch.setattr(settings, "SUMMARY_SHORTEN_LABELS", False)
+    monkeypatch.setattr(settings, "SUMMARY_BACKCHANNEL_MAX_WORDS", 2)
+
+
+def _lines(text):
+    return text.split("\n")
+
+
+def test_agreement_and_objection_are_kept():
+    transcript = "\n".join([
+        "Speaker A: on valide le budget du second trimestre.",
+        "Speaker B: Oui.",
+        "Speaker A: on passe au point suivant, le recrutement.",
+        "Speaker B: Non non.",
+    ])
+    compacted, report = compact_transcript(transcript)
+    assert _lines(compacted) == [
+        "Speaker A: on valide le budget du second trimestre.",
+        "Speaker B: Oui.",
+        "Speaker A: on passe au point suivant, le recrutement.",
+        "Speaker B: Non non.",
+    ]
+    assert report["utterances_after"] == 4
+
+
+def test_turns_are_not_merged_across_a_removed_backchannel():
+    transcript = "\n".join([
+        "Speaker A: on valide le budget du second trimestre.",
+        "Speaker B: Mmh.",
+        "Speaker A: on passe au point suivant.",
+    ])
+    compacted, _ = compact_transcript(transcript)
+    assert _lines(compacted) == [
+        "Speaker A: on valide le budget du second trimestre.",
+        "Speaker A: on passe au point suivant.",
+    ]
+
+
+def test_assent_within_own_turn_and_fillers_are_removed():
+    transcript = "\n".join([
+        "Speaker A: euh on commence par le budget.",
+        "Speaker A: D'accord.",
+        "Speaker A: bon, le montant est validé.",
+        "Speaker B: Exactement.",
+    ])
+    compacted, report = compact_transcript(transcript)
+    assert _lines(compacted) == [
+        "Speaker A: on commence par le budget. le montant est validé.",
+        "Speaker B: Exactement.",
+    ]
+    assert report["tokens_after"] <= report["tokens_before"]
+
+
+def test_backchannel_answering_a_question_is_kept():
+    transcript = "\n".join([
+        "Speaker A: tout le monde a reçu le document ?",
+        "Speaker B: Ah oui.",
+    ])
+    compacted, _ = compact_transcript(transcript)
+    assert _lines(compacted)[-1] == "Speaker B: Ah oui."
+
+
+def test_summary_compaction_returns_its_report(monkeypatch):
+    transcript = "Speaker A: euh bon, on commence.\nSpeaker B: Mmh.\nSpeaker A: le budget est validé."
+    monkeypatch.setattr(settings, "SUMMARY_COMPACTION_ENABLED", True)
+    compacted, report = compact_for_summary(transcript, "5f0c1e2a")
+    assert _lines(compacted) == ["Speaker A: on commence.", "Speaker A: le budget est validé."]
+    assert report["tokens_after"] < report["tokens_before"]
+    assert report["utterances_before"] == 3 and report["utterances_after"] == 2
+
+    monkeypatch.setattr(settings, "SUMMARY_COMPACTION_ENABLED", False)
+    assert compact_for_summary(transcript) == (transcript, None)
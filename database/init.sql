@@ -4,6 +4,7 @@
 -- Extensions utiles
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pg_stat_statements";
+CREATE EXTENSION IF NOT EXISTS btree_gin;
 
 -- Création des tables
 -- Table users
@@ -32,7 +33,7 @@ CREATE TABLE IF NOT EXISTS clients (
 );
 
 -- Index pour les clients
-CREATE INDEX IF NOT EXISTS idx_client_user ON clients(user_id);
+CREATE INDEX IF NOT EXISTS idx_client_user_name ON clients(user_id, name);
 
 -- Table meetings
 CREATE TABLE IF NOT EXISTS meetings (
@@ -41,19 +42,53 @@ CREATE TABLE IF NOT EXISTS meetings (
     client_id UUID REFERENCES clients(id) ON DELETE SET NULL,
     title VARCHAR(255) NOT NULL,
     file_url TEXT NOT NULL,
-    transcript_text TEXT,
     transcript_status VARCHAR(50) DEFAULT 'pending',
-    summary_text TEXT,
     summary_status VARCHAR(50) DEFAULT NULL,
+    -- Identifiant de la transcription chez le fournisseur (AssemblyAI)
+    transcript_id VARCHAR(255),
     duration_seconds INTEGER,
     speakers_count INTEGER,
+    transcript_version INTEGER NOT NULL DEFAULT 0,
+    -- transcript_text (meeting_content) à régénérer depuis les utterances après une édition
+    transcript_stale BOOLEAN NOT NULL DEFAULT FALSE,
+    summary_speaker_labels JSONB,
+    summary_revision INTEGER NOT NULL DEFAULT 0,
+    lease_owner VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 -- Index pour les meetings
-CREATE INDEX IF NOT EXISTS idx_meeting_user ON meetings(user_id);
 CREATE INDEX IF NOT EXISTS idx_meeting_client ON meetings(client_id);
 CREATE INDEX IF NOT EXISTS idx_meeting_status ON meetings(transcript_status);
+CREATE INDEX IF NOT EXISTS idx_meeting_status_lease ON meetings(transcript_status, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_meeting_user_created ON meetings(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_meeting_transcript_active ON meetings(transcript_status, created_at)
+    WHERE transcript_status IN ('pending', 'processing');
+CREATE INDEX IF NOT EXISTS idx_meeting_summary_processing ON meetings(created_at)
+    WHERE summary_status = 'processing';
+CREATE INDEX IF NOT EXISTS idx_meeting_title_search ON meetings USING gin (user_id, to_tsvector('french', title));
+
+-- Table meeting_content: textes volumineux des réunions, hors de la ligne meetings
+CREATE TABLE IF NOT EXISTS meeting_content (
+    meeting_id UUID PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    -- Copie de meetings.user_id: limite la recherche plein texte à l'utilisateur dans l'index
+    user_id UUID NOT NULL,
+    transcript_text TEXT COMPRESSION lz4,
+    summary_text TEXT COMPRESSION lz4,
+    transcript_hash TEXT GENERATED ALWAYS AS (md5(transcript_text)) STORED,
+    summary_hash TEXT GENERATED ALWAYS AS (md5(summary_text)) STORED,
+    -- Recherche plein texte: compte rendu (B), transcription tronquée (C); titre (A) sur meetings
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(summary_text, '')), 'B') ||
+        setweight(to_tsvector('french', left(coalesce(transcript_text, ''), 300000)), 'C')
+    ) STORED,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Date de création de la réunion: clé de partition si les réunions sont partitionnées
+    meeting_created_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_meeting_content_search ON meeting_content USING gin (user_id, search_vector);
 
 -- Table meeting_speakers pour les noms personnalisés des locuteurs
 CREATE TABLE IF NOT EXISTS meeting_speakers (
@@ -62,11 +97,98 @@ CREATE TABLE IF NOT EXISTS meeting_speakers (
     speaker_id VARCHAR(50) NOT NULL,
     custom_name VARCHAR(255) NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    meeting_created_at TIMESTAMP WITH TIME ZONE,
     UNIQUE(meeting_id, speaker_id)
 );
 
--- Index pour les speakers
-CREATE INDEX IF NOT EXISTS idx_speaker_meeting ON meeting_speakers(meeting_id);
+-- Table meeting_utterances: transcription structurée (une ligne par intervention)
+CREATE TABLE IF NOT EXISTS meeting_utterances (
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    speaker VARCHAR(50) NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    start_ms INTEGER,
+    end_ms INTEGER,
+    meeting_created_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (meeting_id, idx)
+);
+
+-- Table meeting_speaker_stats: statistiques de parole calculées à la fin de la transcription
+CREATE TABLE IF NOT EXISTS meeting_speaker_stats (
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    speaker VARCHAR(255) NOT NULL,
+    talk_time_ms BIGINT NOT NULL DEFAULT 0,
+    talk_share REAL NOT NULL DEFAULT 0,
+    turns INTEGER NOT NULL DEFAULT 0,
+    avg_turn_ms REAL NOT NULL DEFAULT 0,
+    interruptions INTEGER NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    words_per_minute REAL NOT NULL DEFAULT 0,
+    meeting_created_at TIMESTAMP WITH TIME ZONE,
+    PRIMARY KEY (meeting_id, speaker)
+);
+
+-- Table summary_cache: comptes rendus indexés par l'empreinte de la requête LLM
+CREATE TABLE IF NOT EXISTS summary_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    summary_text TEXT NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_hit_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Table summary_jobs: file d'attente durable des générations de comptes rendus
+CREATE TABLE IF NOT EXISTS summary_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    client_id UUID,
+    template_type VARCHAR(50),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    lease_owner VARCHAR(255),
+    lease_expires_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    -- Rapport de compaction de la transcription envoyée au modèle (tokens avant/après)
+    compaction JSONB,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+-- Une seule génération active par réunion
+CREATE UNIQUE INDEX IF NOT EXISTS idx_summary_jobs_active_meeting ON summary_jobs(meeting_id) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_ready ON summary_jobs(status, run_after);
+
+-- Table summary_batches: régénérations de comptes rendus en masse
+CREATE TABLE IF NOT EXISTS summary_batches (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    filters JSONB NOT NULL DEFAULT '{}'::jsonb,
+    max_concurrency INTEGER NOT NULL DEFAULT 2,
+    rate_per_minute INTEGER,
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    total INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+CREATE INDEX IF NOT EXISTS idx_summary_batches_user ON summary_batches(user_id, created_at DESC);
+ALTER TABLE summary_jobs ADD COLUMN IF NOT EXISTS batch_id UUID REFERENCES summary_batches(id) ON DELETE SET NULL;
+CREATE INDEX IF NOT EXISTS idx_summary_jobs_batch ON summary_jobs(batch_id, status) WHERE batch_id IS NOT NULL;
+
+-- Table meeting_retention_policies: durée de conservation des réunions par utilisateur
+-- (sinon MEETING_RETENTION_MONTHS), appliquée par backend/manage_partitions.py
+CREATE TABLE IF NOT EXISTS meeting_retention_policies (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    -- Mois complets conservés; 0: conservation illimitée
+    retention_months INTEGER NOT NULL CHECK (retention_months >= 0),
+    -- 'archive': export CSV compressé avant suppression; 'delete': suppression seule
+    action VARCHAR(20) NOT NULL DEFAULT 'archive' CHECK (action IN ('archive', 'delete')),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
 
 -- Utilisateur test par défaut (mot de passe: test123)
 -- Hash bcrypt pour 'test123': $2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBPj6ukD4i4IVe
@@ -0,0 +1,10 @@
+-- Transcription structurée: une ligne par utterance pour la pagination et le streaming
+CREATE TABLE IF NOT EXISTS meeting_utterances (
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    speaker VARCHAR(50) NOT NULL,
+    text TEXT NOT NULL DEFAULT '',
+    start_ms INTEGER,
+    end_ms INTEGER,
+    PRIMARY KEY (meeting_id, idx)
+);
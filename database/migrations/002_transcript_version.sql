@@ -0,0 +1,2 @@
+-- Version de la transcription pour l'édition concurrente par utterances (PATCH /meetings/{id}/transcript)
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_version INTEGER NOT NULL DEFAULT 0;
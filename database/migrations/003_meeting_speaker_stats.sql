@@ -0,0 +1,13 @@
+-- Statistiques de parole par locuteur, calculées une fois à la fin de la transcription
+CREATE TABLE IF NOT EXISTS meeting_speaker_stats (
+    meeting_id UUID NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    speaker VARCHAR(255) NOT NULL,
+    talk_time_ms BIGINT NOT NULL DEFAULT 0,
+    talk_share REAL NOT NULL DEFAULT 0,
+    turns INTEGER NOT NULL DEFAULT 0,
+    avg_turn_ms REAL NOT NULL DEFAULT 0,
+    interruptions INTEGER NOT NULL DEFAULT 0,
+    words INTEGER NOT NULL DEFAULT 0,
+    words_per_minute REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (meeting_id, speaker)
+);
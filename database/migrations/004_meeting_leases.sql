@@ -0,0 +1,4 @@
+-- Bail (lease) sur les réunions en cours de traitement: un seul worker/script à la fois
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(255);
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+CREATE INDEX IF NOT EXISTS idx_meeting_status_lease ON meetings(transcript_status, lease_expires_at);
@@ -0,0 +1,9 @@
+-- Cache des comptes rendus: empreinte SHA-256 de (prompt résolu avec la transcription, modèle, température)
+CREATE TABLE IF NOT EXISTS summary_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    summary_text TEXT NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_hit_at TIMESTAMP WITH TIME ZONE
+);
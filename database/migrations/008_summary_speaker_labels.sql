@@ -0,0 +1,5 @@
+-- Libellés des locuteurs vus par le modèle lors de la génération du compte rendu
+-- ({identifiant: libellé}) et révision du texte stocké: un renommage est reporté
+-- dans summary_text sans régénération
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS summary_speaker_labels JSONB;
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS summary_revision INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,2 @@
+-- Liste paginée des cartes de réunions: pagination par clé (created_at, id) par utilisateur
+CREATE INDEX IF NOT EXISTS idx_meeting_user_created ON meetings(user_id, created_at DESC, id DESC);
@@ -0,0 +1,31 @@
+-- Index des requêtes fréquentes (vérifiés par backend/check_query_plans.py)
+-- Pollers de transcription: réunions en attente ou en cours, par ancienneté
+CREATE INDEX IF NOT EXISTS idx_meeting_transcript_active ON meetings(transcript_status, created_at)
+    WHERE transcript_status IN ('pending', 'processing');
+-- Comptes rendus restés en génération
+CREATE INDEX IF NOT EXISTS idx_meeting_summary_processing ON meetings(created_at)
+    WHERE summary_status = 'processing';
+-- (user_id) est couvert par idx_meeting_user_created (user_id, created_at DESC, id DESC)
+DROP INDEX IF EXISTS idx_meeting_user;
+-- Unicité (meeting_id, speaker_id) des noms personnalisés, y compris sur les bases créées
+-- sans la contrainte: doublons retirés (le plus récent est conservé) puis index unique
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_index i
+        WHERE i.indrelid = 'meeting_speakers'::regclass
+          AND i.indisunique
+          AND i.indkey::smallint[] = ARRAY[
+              (SELECT attnum FROM pg_attribute WHERE attrelid = 'meeting_speakers'::regclass AND attname = 'meeting_id'),
+              (SELECT attnum FROM pg_attribute WHERE attrelid = 'meeting_speakers'::regclass AND attname = 'speaker_id')
+          ]::smallint[]
+    ) THEN
+        DELETE FROM meeting_speakers a USING meeting_speakers b
+        WHERE a.meeting_id = b.meeting_id
+          AND a.speaker_id = b.speaker_id
+          AND (COALESCE(a.created_at, '-infinity'), a.id) < (COALESCE(b.created_at, '-infinity'), b.id);
+        CREATE UNIQUE INDEX idx_meeting_speakers_meeting_speaker ON meeting_speakers(meeting_id, speaker_id);
+    END IF;
+END $$;
+-- (meeting_id) est couvert par l'index unique (meeting_id, speaker_id)
+DROP INDEX IF EXISTS idx_speaker_meeting;
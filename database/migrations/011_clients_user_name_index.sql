@@ -0,0 +1,3 @@
+-- Liste des clients d'un utilisateur triée par nom (GET /clients, servie par l'index)
+CREATE INDEX IF NOT EXISTS idx_client_user_name ON clients(user_id, name);
+DROP INDEX IF EXISTS idx_client_user;
@@ -0,0 +1,20 @@
+-- Recherche plein texte (français) sur le titre, le compte rendu et la transcription des réunions
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+-- Titre (poids A), compte rendu (B), transcription (C); la transcription est tronquée pour
+-- rester sous la taille maximale d'un tsvector (1 Mo). Sur une base créée par init.sql,
+-- les textes sont déjà dans meeting_content (013) qui porte son propre vecteur.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'meetings' AND column_name = 'transcript_text'
+    ) THEN
+        ALTER TABLE meetings ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('french', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('french', coalesce(summary_text, '')), 'B') ||
+            setweight(to_tsvector('french', left(coalesce(transcript_text, ''), 300000)), 'C')
+        ) STORED;
+        -- user_id en tête (btree_gin): la recherche reste limitée aux réunions de l'utilisateur
+        CREATE INDEX IF NOT EXISTS idx_meeting_search ON meetings USING gin (user_id, search_vector);
+    END IF;
+END $$;
@@ -0,0 +1,39 @@
+-- Textes volumineux des réunions (transcription, compte rendu) hors de la ligne meetings
+-- Les requêtes de métadonnées, les pollers et les mises à jour de statut ne lisent ni ne
+-- réécrivent plus ces valeurs TOAST. Compression lz4 (PostgreSQL 14+), empreinte md5 de
+-- chaque texte (écritures identiques ignorées) et vecteur de recherche calculés par la base.
+CREATE TABLE IF NOT EXISTS meeting_content (
+    meeting_id UUID PRIMARY KEY REFERENCES meetings(id) ON DELETE CASCADE,
+    -- Copie de meetings.user_id: limite la recherche plein texte à l'utilisateur dans l'index
+    user_id UUID NOT NULL,
+    transcript_text TEXT COMPRESSION lz4,
+    summary_text TEXT COMPRESSION lz4,
+    transcript_hash TEXT GENERATED ALWAYS AS (md5(transcript_text)) STORED,
+    summary_hash TEXT GENERATED ALWAYS AS (md5(summary_text)) STORED,
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('french', coalesce(summary_text, '')), 'B') ||
+        setweight(to_tsvector('french', left(coalesce(transcript_text, ''), 300000)), 'C')
+    ) STORED,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+-- Recopie des textes existants puis suppression des colonnes de meetings (et du vecteur de 012)
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'meetings' AND column_name = 'transcript_text'
+    ) THEN
+        INSERT INTO meeting_content (meeting_id, user_id, transcript_text, summary_text)
+        SELECT id, user_id, transcript_text, summary_text FROM meetings
+        WHERE transcript_text IS NOT NULL OR summary_text IS NOT NULL
+        ON CONFLICT (meeting_id) DO NOTHING;
+        DROP INDEX IF EXISTS idx_meeting_search;
+        ALTER TABLE meetings
+            DROP COLUMN IF EXISTS search_vector,
+            DROP COLUMN transcript_text,
+            DROP COLUMN summary_text;
+    END IF;
+END $$;
+-- Recherche: textes (meeting_content) et titres (meetings), limitée à l'utilisateur (btree_gin)
+CREATE INDEX IF NOT EXISTS idx_meeting_content_search ON meeting_content USING gin (user_id, search_vector);
+CREATE INDEX IF NOT EXISTS idx_meeting_title_search ON meetings USING gin (user_id, to_tsvector('french', title));
@@ -0,0 +1,18 @@
+-- Préparation du partitionnement mensuel des réunions et durées de conservation par utilisateur
+-- Les tables liées à une réunion portent sa date de création, clé de partition une fois les
+-- réunions partitionnées par mois (backend/partition_meetings.py). Colonnes ajoutées sans
+-- valeur par défaut ni réécriture; l'application les renseigne et le script de conversion
+-- complète les lignes existantes par lots.
+ALTER TABLE meeting_content ADD COLUMN IF NOT EXISTS meeting_created_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE meeting_speakers ADD COLUMN IF NOT EXISTS meeting_created_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE meeting_utterances ADD COLUMN IF NOT EXISTS meeting_created_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE meeting_speaker_stats ADD COLUMN IF NOT EXISTS meeting_created_at TIMESTAMP WITH TIME ZONE;
+-- Durée de conservation des réunions d'un utilisateur (sinon MEETING_RETENTION_MONTHS)
+CREATE TABLE IF NOT EXISTS meeting_retention_policies (
+    user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    -- Mois complets conservés; 0: conservation illimitée
+    retention_months INTEGER NOT NULL CHECK (retention_months >= 0),
+    -- 'archive': export CSV compressé avant suppression; 'delete': suppression seule
+    action VARCHAR(20) NOT NULL DEFAULT 'archive' CHECK (action IN ('archive', 'delete')),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
@@ -0,0 +1,5 @@
+-- Texte de transcription régénéré à la lecture après une édition par utterances
+-- Une édition (PATCH /meetings/{id}/transcript) ne modifie que les utterances éditées et
+-- marque le texte stocké dans meeting_content comme périmé; il est reconstruit depuis les
+-- utterances à la lecture et réécrit à la prochaine lecture de la réunion.
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_stale BOOLEAN NOT NULL DEFAULT FALSE;
@@ -0,0 +1,5 @@
+-- Identifiant de la transcription chez le fournisseur (AssemblyAI)
+-- Enregistré au lancement de la transcription; les vérifications de fin de transcription
+-- (file d'attente, routes, vérificateur planifié) interrogent le fournisseur avec cet ID.
+-- Les bases créées avant son ajout au schéma l'ont peut-être déjà: ajout idempotent.
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS transcript_id VARCHAR(255);
@@ -0,0 +1,4 @@
+-- Rapport de compaction de la transcription enregistré avec chaque génération de compte rendu
+-- {utterances_before, utterances_after, tokens_before, tokens_after, reduction_pct}, écrit
+-- avec le compte rendu par la tâche qui le génère; agrégé par GET /admin/summary-queue.
+ALTER TABLE summary_jobs ADD COLUMN IF NOT EXISTS compaction JSONB;